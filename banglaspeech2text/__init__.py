@@ -14,6 +14,14 @@ if not logger.handlers:
     handler.setFormatter(formatter)
     logger.addHandler(handler)
 
-from banglaspeech2text.speech2text import Speech2Text
-
 __all__ = ["Speech2Text"]
+
+
+def __getattr__(name):
+    # faster-whisper and CTranslate2 are only imported once a model is needed,
+    # so `import banglaspeech2text` and `bnstt --list` stay fast.
+    if name == "Speech2Text":
+        from banglaspeech2text.speech2text import Speech2Text
+
+        return Speech2Text
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,146 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+import threading
+import time
+from typing import TYPE_CHECKING, Any, AsyncIterator, List, Optional, Union
+import logging
+
+if TYPE_CHECKING:
+    from faster_whisper.transcribe import Segment
+    from banglaspeech2text.speech2text import Speech2Text
+
+# Get a child logger that inherits from the main logger
+logger = logging.getLogger("BanglaSpeech2Text.aio")
+
+_DONE = object()
+
+
+class Overloaded(RuntimeError):
+    """Raised when too many requests are already waiting for a worker."""
+
+
+class AsyncRecognizer:
+    """
+    Run `Speech2Text` from asyncio code without blocking the event loop.
+
+    Decoding runs on a dedicated thread pool. At most `max_concurrency`
+    requests decode at once and the rest wait their turn; when
+    `max_pending` requests are already waiting, new ones fail fast with
+    `Overloaded`. Segments are handed to the event loop through a queue of
+    `max_buffered` segments, so a slow consumer pauses decoding instead of
+    letting results pile up. Cancelling the awaiting task, or leaving an
+    `async for` early, stops decoding at the next segment.
+    """
+
+    def __init__(
+        self,
+        stt: "Speech2Text",
+        max_concurrency: Optional[int] = None,
+        max_pending: Optional[int] = None,
+        max_buffered: int = 8,
+    ):
+        self.stt = stt
+        self.max_concurrency = max_concurrency or stt.num_workers
+        self.max_pending = max_pending
+        self.max_buffered = max_buffered
+        self.pending = 0
+        self.active = 0
+        self._executor = ThreadPoolExecutor(
+            self.max_concurrency, thread_name_prefix="bnstt-aio"
+        )
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    async def recognize(
+        self, audio: Any, return_segments: bool = False, **kw
+    ) -> Union[List["Segment"], str]:
+        """Async version of `Speech2Text.recognize`."""
+        segments = [segment async for segment in self.recognize_stream(audio, **kw)]
+        if return_segments:
+            return segments
+        return "".join(segment.text for segment in segments)
+
+    async def recognize_stream(self, audio: Any, **kw) -> AsyncIterator["Segment"]:
+        """Yield segments as they are decoded."""
+        loop = asyncio.get_running_loop()
+        semaphore = self._get_semaphore()
+        if self.max_pending is not None and self.pending >= self.max_pending:
+            raise Overloaded(f"{self.pending} requests are already waiting")
+
+        start = time.perf_counter()
+        self.pending += 1
+        try:
+            await semaphore.acquire()
+        finally:
+            self.pending -= 1
+        if self.stt.metrics is not None:
+            self.stt.metrics.observe("queue_wait_seconds", time.perf_counter() - start)
+
+        queue: asyncio.Queue = asyncio.Queue(self.max_buffered)
+        cancelled = threading.Event()
+        self.active += 1
+        try:
+            future = loop.run_in_executor(
+                self._executor, self._run, loop, queue, cancelled, audio, kw
+            )
+        except BaseException:
+            self.active -= 1
+            semaphore.release()
+            raise
+
+        def done(_):
+            # the slot is only freed once the worker thread has stopped
+            self.active -= 1
+            semaphore.release()
+
+        future.add_done_callback(done)
+
+        try:
+            while True:
+                item = await queue.get()
+                if item is _DONE:
+                    break
+                if isinstance(item, BaseException):
+                    raise item
+                yield item
+        finally:
+            cancelled.set()
+
+    def _run(self, loop, queue, cancelled, audio, kw) -> None:
+        try:
+            segments = self.stt.recognize(audio, return_segments=True, **kw)
+            for segment in segments:
+                if not self._put(loop, queue, cancelled, segment):
+                    if hasattr(segments, "close"):
+                        segments.close()
+                    return
+            self._put(loop, queue, cancelled, _DONE)
+        except Exception as e:
+            self._put(loop, queue, cancelled, e)
+
+    @staticmethod
+    def _put(loop, queue, cancelled, item) -> bool:
+        if cancelled.is_set():
+            return False
+        future = asyncio.run_coroutine_threadsafe(queue.put(item), loop)
+        while True:
+            try:
+                future.result(timeout=0.1)
+                return True
+            except FutureTimeoutError:
+                # the queue is full; stop waiting if the consumer went away
+                if cancelled.is_set() or loop.is_closed():
+                    future.cancel()
+                    return False
+
+    def close(self) -> None:
+        """Stop the worker threads once running requests finish."""
+        self._executor.shutdown(wait=False)
@@ -0,0 +1,234 @@
+from pathlib import Path
+import threading
+import time
+from typing import TYPE_CHECKING, Any, List, Optional, Tuple, Union
+import logging
+
+import numpy as np
+
+from banglaspeech2text.longform import plan_chunks
+from banglaspeech2text.utils.audio import SAMPLING_RATE, load_audio
+
+if TYPE_CHECKING:
+    from faster_whisper.transcribe import Segment
+
+# Get a child logger that inherits from the main logger
+logger = logging.getLogger("BanglaSpeech2Text.assisted")
+
+WINDOW_SECONDS = 30
+
+
+def _model_id(name: str) -> str:
+    if Path(name).is_dir():
+        return name
+    from banglaspeech2text.utils.models import ModelMetadata
+
+    return ModelMetadata(name).raw_name
+
+
+def check_compatible(model: Any, draft: Any, tokenizer: Any, draft_tokenizer: Any):
+    """
+    Raise ValueError unless `draft` can propose tokens for `model`.
+
+    Both models must read the same features (mel bins) and share the
+    vocabulary, otherwise the proposed token ids mean something else to the
+    large model.
+    """
+    if model.config.num_mel_bins != draft.config.num_mel_bins:
+        raise ValueError(
+            f"Draft model uses {draft.config.num_mel_bins} mel bins, "
+            f"the model uses {model.config.num_mel_bins}"
+        )
+    if model.config.vocab_size != draft.config.vocab_size or (
+        tokenizer.get_vocab() != draft_tokenizer.get_vocab()
+    ):
+        raise ValueError("Draft model has a different tokenizer")
+
+
+class AssistedSpeech2Text:
+    """
+    Greedy decoding of a large model, sped up by a small draft model.
+
+    The draft model proposes several tokens at a time and the large model
+    checks all of them in one decoder pass, keeping the ones it would have
+    chosen itself. The output is the same as greedy decoding with the large
+    model alone, but the large decoder runs far fewer times when the draft
+    model is usually right, as the small Bangla models are for the large one.
+
+    This runs on PyTorch with transformers: CTranslate2 does not let a
+    decoder continue from a checked prefix, so it cannot verify proposed
+    tokens without decoding them one by one again. Recordings longer than
+    30 seconds are cut at quiet points and decoded window by window.
+
+    Args:
+        model: Large model name, Hugging Face id or path
+        draft: Draft model name, Hugging Face id or path; must share the
+            tokenizer and mel bins of `model`
+        device: Torch device
+        torch_dtype: Torch dtype, e.g. `torch.float16` on GPU
+        num_assistant_tokens: Tokens proposed per step, adapted by
+            transformers when not set
+        processor: `WhisperProcessor` to use instead of the large model's
+    """
+
+    def __init__(
+        self,
+        model: Union[str, Any] = "large",
+        draft: Union[str, Any] = "small",
+        device: str = "cpu",
+        torch_dtype: Any = None,
+        num_assistant_tokens: Optional[int] = None,
+        processor: Any = None,
+    ):
+        from transformers import (  # type: ignore
+            WhisperForConditionalGeneration,
+            WhisperProcessor,
+        )
+
+        def load(name):
+            if not isinstance(name, str):
+                return name
+            logger.info(f"Loading {name} with transformers")
+            return WhisperForConditionalGeneration.from_pretrained(
+                _model_id(name), dtype=torch_dtype
+            )
+
+        self.model = load(model).to(device).eval()
+        self.draft = load(draft).to(device).eval()
+        self.device = device
+        if processor is None:
+            processor = WhisperProcessor.from_pretrained(_model_id(model))
+        self.processor = processor
+        if isinstance(draft, str):
+            draft_tokenizer = WhisperProcessor.from_pretrained(
+                _model_id(draft)
+            ).tokenizer
+        else:
+            draft_tokenizer = processor.tokenizer
+        check_compatible(self.model, self.draft, processor.tokenizer, draft_tokenizer)
+
+        if num_assistant_tokens is not None:
+            self.draft.generation_config.num_assistant_tokens = num_assistant_tokens
+            self.draft.generation_config.num_assistant_tokens_schedule = "constant"
+        # transformers generation is not thread-safe on one model
+        self._lock = threading.Lock()
+
+    def _windows(self, audio: np.ndarray) -> List[tuple]:
+        window = WINDOW_SECONDS * SAMPLING_RATE
+        if audio.shape[0] <= window:
+            return [(0, audio.shape[0])]
+        return plan_chunks(audio, [(0, audio.shape[0])], window)
+
+    def generate(
+        self, audio: np.ndarray, assisted: bool = True, **kw
+    ) -> List[List[int]]:
+        """
+        Token ids of every 30 second window of `audio`.
+
+        Args:
+            audio: 16 kHz mono float32 waveform
+            assisted: Use the draft model; False decodes with the large
+                model alone, for comparison
+            **kw: `generate` options, e.g. `language`, `max_new_tokens`
+        """
+        windows = self._windows(audio)
+        return [ids for ids, _ in self._generate(audio, windows, assisted, **kw)]
+
+    def _generate(
+        self, audio: np.ndarray, windows: List[tuple], assisted: bool, **kw
+    ) -> List[Tuple[List[int], float]]:
+        """Token ids and average token log probability of every window."""
+        import torch  # type: ignore
+
+        kw = dict(
+            kw,
+            do_sample=False,
+            num_beams=1,
+            output_scores=True,
+            return_dict_in_generate=True,
+        )
+        if assisted:
+            kw["assistant_model"] = self.draft
+        results = []
+        for start, end in windows:
+            features = self.processor.feature_extractor(
+                audio[start:end], sampling_rate=SAMPLING_RATE, return_tensors="pt"
+            ).input_features.to(self.device, self.model.dtype)
+            with self._lock, torch.inference_mode():
+                output = self.model.generate(features, **kw)
+            ids = output.sequences[0]
+            # one score per generated token, after the forced prompt tokens
+            generated = ids[ids.shape[0] - len(output.scores) :]
+            logprobs = [
+                torch.log_softmax(scores[0].float(), dim=-1)[token].item()
+                for scores, token in zip(output.scores, generated)
+            ]
+            avg_logprob = sum(logprobs) / len(logprobs) if logprobs else 0.0
+            results.append((ids.tolist(), avg_logprob))
+        return results
+
+    def recognize(
+        self,
+        audio: Any,
+        return_segments: bool = False,
+        language: str = "bn",
+        task: str = "transcribe",
+        assisted: bool = True,
+        **kw,
+    ) -> Union[List["Segment"], str]:
+        """
+        Recognize audio with assisted greedy decoding.
+
+        Args:
+            audio: File path, bytes, numpy array or anything `Speech2Text`
+                accepts
+            return_segments: Return one segment per window instead of text
+            language: Language code
+            task: "transcribe" or "translate"
+            assisted: Use the draft model
+            **kw: transformers `generate` options
+
+        Returns:
+            str or list: Text, or segments if `return_segments` is True.
+                Segments carry the average token log probability and the
+                compression ratio of their text; `no_speech_prob` is NaN
+                because transformers does not report it.
+        """
+        from faster_whisper.audio import decode_audio
+        from faster_whisper.transcribe import Segment, get_compression_ratio
+
+        audio = load_audio(audio)
+        if not isinstance(audio, np.ndarray):
+            audio = decode_audio(audio, sampling_rate=SAMPLING_RATE)
+
+        start = time.perf_counter()
+        windows = self._windows(audio)
+        results = self._generate(
+            audio, windows, assisted, language=language, task=task, **kw
+        )
+        logger.debug(
+            f"Decoded {len(windows)} windows in {time.perf_counter() - start:.2f}s"
+        )
+
+        tokenizer = self.processor.tokenizer
+        segments = []
+        for i, ((lo, hi), (tokens, avg_logprob)) in enumerate(zip(windows, results)):
+            text = tokenizer.decode(tokens, skip_special_tokens=True)
+            segments.append(
+                Segment(
+                    id=i + 1,
+                    seek=lo // 160,
+                    start=lo / SAMPLING_RATE,
+                    end=hi / SAMPLING_RATE,
+                    text=text,
+                    tokens=tokens,
+                    avg_logprob=avg_logprob,
+                    compression_ratio=get_compression_ratio(text),
+                    no_speech_prob=float("nan"),
+                    words=None,
+                    temperature=0.0,
+                )
+            )
+        if return_segments:
+            return segments
+        return "".join(segment.text for segment in segments)
@@ -0,0 +1,250 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+from collections import deque
+from dataclasses import dataclass
+import csv
+import glob
+import json
+import os
+import time
+from mimetypes import guess_type
+from typing import TYPE_CHECKING, Deque, Iterable, Iterator, List, Set, Tuple
+import logging
+
+if TYPE_CHECKING:
+    from banglaspeech2text.speech2text import Speech2Text
+
+# Get a child logger that inherits from the main logger
+logger = logging.getLogger("BanglaSpeech2Text.batch")
+
+PATH_KEYS = ("path", "audio", "file", "filename")
+
+
+def is_audio_file(filename: str) -> bool:
+    gt = guess_type(filename)
+    if gt[0] is None:
+        return False
+    return gt[0].startswith("audio")
+
+
+def _manifest_path(base: str, path: str) -> str:
+    if not os.path.isabs(path) and not os.path.exists(path):
+        return os.path.join(base, path)
+    return path
+
+
+def read_manifest(filename: str) -> List[str]:
+    """
+    Read audio paths from a manifest file.
+
+    `.jsonl` manifests use the first of the keys "path", "audio", "file" or
+    "filename" found in each record. `.csv` manifests use a column with one of
+    those names, or the first column. Any other file is read as one path per
+    line. Relative paths are resolved against the manifest's directory.
+
+    Raises:
+        ValueError: If a `.jsonl` record has none of the path keys
+    """
+    base = os.path.dirname(os.path.abspath(filename))
+    paths = []
+    with open(filename, "r", encoding="utf-8") as f:
+        if filename.endswith(".jsonl"):
+            for number, line in enumerate(f, start=1):
+                if line.strip():
+                    record = json.loads(line)
+                    key = next((k for k in PATH_KEYS if k in record), None)
+                    if key is None:
+                        raise ValueError(
+                            f"{filename}:{number}: record has none of the keys "
+                            f"{', '.join(PATH_KEYS)}"
+                        )
+                    paths.append(record[key])
+        elif filename.endswith(".csv"):
+            rows = list(csv.reader(f))
+            column = 0
+            if rows and any(k in rows[0] for k in PATH_KEYS):
+                column = next(rows[0].index(k) for k in PATH_KEYS if k in rows[0])
+                rows = rows[1:]
+            paths.extend(row[column] for row in rows if row)
+        else:
+            paths.extend(line.strip() for line in f if line.strip())
+    return [_manifest_path(base, p) for p in paths]
+
+
+def _expand(inputs: Iterable[str]) -> Iterator[str]:
+    for item in inputs:
+        if os.path.isdir(item):
+            for root, _, files in os.walk(item):
+                for name in sorted(files):
+                    if is_audio_file(name):
+                        yield os.path.join(root, name)
+        elif glob.has_magic(item):
+            for path in sorted(glob.glob(item, recursive=True)):
+                if is_audio_file(path):
+                    yield path
+        elif is_audio_file(item):
+            yield item
+        else:
+            yield from read_manifest(item)
+
+
+def iter_audio_files(inputs: Iterable[str]) -> Iterator[str]:
+    """Expand directories, glob patterns, manifests and audio paths to audio files."""
+    seen = set()
+    for path in _expand(inputs):
+        if path not in seen:
+            seen.add(path)
+            yield path
+
+
+def read_done(output: str) -> Set[str]:
+    """Paths that already have a successful record in a JSONL output file."""
+    done = set()
+    if not os.path.exists(output):
+        return done
+    with open(output, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # partially written last line
+            if isinstance(record, dict) and "error" not in record:
+                path = record.get("path")
+                if path is not None:
+                    done.add(path)
+    return done
+
+
+def drop_partial_line(output: str) -> None:
+    """Cut a partially written last line off a JSONL file before appending."""
+    if not os.path.exists(output):
+        return
+    with open(output, "rb+") as f:
+        end = f.seek(0, os.SEEK_END)
+        pos = end
+        while pos > 0:
+            step = min(4096, pos)
+            f.seek(pos - step)
+            newline = f.read(step).rfind(b"\n")
+            if newline >= 0:
+                pos = pos - step + newline + 1
+                break
+            pos -= step
+        if pos < end:
+            logger.warning(f"Dropping a partially written line from {output}")
+            f.truncate(pos)
+
+
+@dataclass
+class BatchStats:
+    files: int = 0
+    skipped: int = 0
+    failed: int = 0
+    audio_seconds: float = 0.0
+    wall_seconds: float = 0.0
+
+    @property
+    def throughput(self) -> float:
+        """Audio seconds transcribed per wall-clock second."""
+        return self.audio_seconds / self.wall_seconds if self.wall_seconds else 0.0
+
+    def __str__(self):
+        return (
+            f"{self.files} files ({self.skipped} skipped, {self.failed} failed), "
+            f"{self.audio_seconds:.1f}s audio in {self.wall_seconds:.1f}s "
+            f"({self.throughput:.2f} audio-s/s)"
+        )
+
+
+class BatchTranscriber:
+    """
+    Transcribe many files to a JSONL file.
+
+    Audio is decoded by a pool of `workers` threads, up to `prefetch` files
+    ahead of the model, so decoding overlaps with inference. One record is
+    written and flushed per file as soon as it is transcribed.
+    """
+
+    def __init__(self, stt: "Speech2Text", workers: int = 4, prefetch: int = 16, **kw):
+        self.stt = stt
+        self.workers = workers
+        self.prefetch = max(prefetch, workers)
+        self.kw = kw
+
+    def _decode(self, path: str):
+        from faster_whisper.audio import decode_audio
+
+        return decode_audio(
+            path, sampling_rate=self.stt.feature_extractor.sampling_rate
+        )
+
+    def run(self, files: Iterable[str], output: str, resume: bool = True) -> BatchStats:
+        """
+        Transcribe `files` and append one JSONL record per file to `output`.
+
+        Args:
+            files: Audio file paths
+            output: JSONL output file
+            resume: Skip files that already have a record in `output`
+
+        Returns:
+            BatchStats: Counts and throughput for this run
+        """
+        stats = BatchStats()
+        done = set()
+        if resume:
+            # the next record must not be glued onto a line cut off by a crash
+            drop_partial_line(output)
+            done = read_done(output)
+        sampling_rate = self.stt.feature_extractor.sampling_rate
+        start = time.perf_counter()
+
+        pending: Deque[Tuple[str, Future]] = deque()
+        files = iter(files)
+        with ThreadPoolExecutor(self.workers) as pool, open(
+            output, "a" if resume else "w", encoding="utf-8"
+        ) as out:
+
+            def fill():
+                while len(pending) < self.prefetch:
+                    path = next(files, None)
+                    if path is None:
+                        return
+                    if path in done:
+                        stats.skipped += 1
+                        continue
+                    pending.append((path, pool.submit(self._decode, path)))
+
+            fill()
+            while pending:
+                path, future = pending.popleft()
+                fill()
+                stats.files += 1
+                try:
+                    audio = future.result()
+                    segments = self.stt.recognize(
+                        audio, return_segments=True, **self.kw
+                    )
+                    segments = [
+                        {"start": s.start, "end": s.end, "text": s.text}
+                        for s in segments
+                    ]
+                    duration = audio.shape[0] / sampling_rate
+                    record = {
+                        "path": path,
+                        "duration": duration,
+                        "text": "".join(s["text"] for s in segments),
+                        "segments": segments,
+                    }
+                    stats.audio_seconds += duration
+                except Exception as e:
+                    logger.error(f"Failed to transcribe {path}: {e}")
+                    record = {"path": path, "error": str(e)}
+                    stats.failed += 1
+
+                out.write(json.dumps(record, ensure_ascii=False) + "\n")
+                out.flush()
+                stats.wall_seconds = time.perf_counter() - start
+                logger.debug(f"{path}: {stats}")
+
+        stats.wall_seconds = time.perf_counter() - start
+        return stats
@@ -0,0 +1,261 @@
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import asdict, dataclass, replace
+import itertools
+import json
+import multiprocessing
+import os
+import platform
+import sys
+import time
+from typing import Any, Dict, List, Optional, Sequence
+import logging
+
+import numpy as np
+
+from banglaspeech2text.utils.audio import SAMPLING_RATE
+
+# Get a child logger that inherits from the main logger
+logger = logging.getLogger("BanglaSpeech2Text.bench")
+
+
+@dataclass
+class BenchConfig:
+    model: str
+    compute_type: str = "default"
+    cpu_threads: int = 0
+    num_workers: int = 1
+    beam_size: int = 5
+
+
+@dataclass
+class BenchResult:
+    config: BenchConfig
+    load_seconds: float
+    first_segment_seconds: float
+    audio_seconds: float
+    wall_seconds: float
+    clips: int
+    peak_rss_mb: float
+
+    @property
+    def rtf(self) -> float:
+        """Real-time factor: wall-clock seconds per second of audio."""
+        return self.wall_seconds / self.audio_seconds if self.audio_seconds else 0.0
+
+    @property
+    def clips_per_second(self) -> float:
+        return self.clips / self.wall_seconds if self.wall_seconds else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data.update(asdict(self.config))
+        del data["config"]
+        data["rtf"] = self.rtf
+        data["clips_per_second"] = self.clips_per_second
+        return data
+
+    def __str__(self):
+        c = self.config
+        return (
+            f"{c.compute_type:>8} threads={c.cpu_threads:<2} workers={c.num_workers:<2} "
+            f"beam={c.beam_size:<2} load={self.load_seconds:.2f}s "
+            f"first={self.first_segment_seconds:.2f}s rtf={self.rtf:.3f} "
+            f"clips/s={self.clips_per_second:.2f} rss={self.peak_rss_mb:.0f}MB"
+        )
+
+
+def synthetic_audio(
+    seconds: float, sampling_rate: int = SAMPLING_RATE, seed: int = 0
+) -> np.ndarray:
+    """
+    Speech-like test signal: voiced syllables separated by short pauses.
+
+    Each syllable is a few harmonics of a gliding pitch under a smooth
+    envelope, with a little noise, so VAD and the decoder see something
+    closer to speech than a pure tone.
+    """
+    rng = np.random.RandomState(seed)
+    n = int(seconds * sampling_rate)
+    audio = np.zeros(n, dtype=np.float32)
+    pos = 0
+    while pos < n:
+        length = int(rng.uniform(0.15, 0.4) * sampling_rate)
+        t = np.arange(min(length, n - pos)) / sampling_rate
+        pitch = rng.uniform(100, 220) * (1 + 0.2 * t / max(t[-1], 1e-3))
+        phase = 2 * np.pi * np.cumsum(pitch) / sampling_rate
+        voice = sum(np.sin(k * phase) / k for k in range(1, 6))
+        envelope = np.sin(np.pi * np.arange(t.shape[0]) / max(t.shape[0], 1)) ** 2
+        audio[pos : pos + t.shape[0]] = 0.3 * envelope * voice
+        pos += t.shape[0] + int(rng.uniform(0.05, 0.3) * sampling_rate)
+    audio += 0.005 * rng.randn(n).astype(np.float32)
+    return audio
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process in MB."""
+    try:
+        import resource
+    except ImportError:  # Windows
+        return 0.0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return peak / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+def memory_usage(pid: Optional[int] = None) -> Dict[str, float]:
+    """
+    Current memory of a process in MB, from /proc/<pid>/smaps_rollup.
+
+    `uss` (unique set size) is the memory that would be freed if the process
+    exited, and `pss` splits each shared page between the processes using
+    it, so summing `pss` over workers gives their real total. Off Linux only
+    `rss` is reported, for this process.
+
+    Args:
+        pid: Process to inspect, defaults to this one
+
+    Returns:
+        dict: `rss`, `pss`, `uss` and `shared` in MB
+    """
+    path = f"/proc/{pid or 'self'}/smaps_rollup"
+    if not os.path.exists(path):
+        rss = peak_rss_mb() if pid in (None, os.getpid()) else 0.0
+        return {"rss": rss, "pss": rss, "uss": rss, "shared": 0.0}
+
+    kb: Dict[str, int] = {}
+    with open(path) as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == "kB":
+                kb[parts[0].rstrip(":")] = int(parts[1])
+    uss = kb.get("Private_Clean", 0) + kb.get("Private_Dirty", 0)
+    shared = kb.get("Shared_Clean", 0) + kb.get("Shared_Dirty", 0)
+    return {
+        "rss": kb.get("Rss", 0) / 1024,
+        "pss": kb.get("Pss", 0) / 1024,
+        "uss": uss / 1024,
+        "shared": shared / 1024,
+    }
+
+
+def sweep(
+    model: str,
+    compute_types: Sequence[str] = ("default",),
+    cpu_threads: Sequence[int] = (0,),
+    num_workers: Sequence[int] = (1,),
+    beam_sizes: Sequence[int] = (5,),
+) -> List[BenchConfig]:
+    """Every combination of the given constructor and decoding options."""
+    return [
+        BenchConfig(model, *values)
+        for values in itertools.product(
+            compute_types, cpu_threads, num_workers, beam_sizes
+        )
+    ]
+
+
+def run_config(config: BenchConfig, clips: List[np.ndarray], **kwargs) -> BenchResult:
+    """
+    Benchmark one configuration in the current process.
+
+    Args:
+        config: Model and options to measure
+        clips: Audio clips to transcribe
+        **kwargs: Extra `Speech2Text` arguments (e.g. skip_conversion)
+
+    Returns:
+        BenchResult: Timings and peak memory
+    """
+    from banglaspeech2text.speech2text import Speech2Text
+
+    start = time.perf_counter()
+    stt = Speech2Text(
+        config.model,
+        compute_type=config.compute_type,
+        cpu_threads=config.cpu_threads,
+        num_workers=config.num_workers,
+        **kwargs,
+    )
+    load_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    segments = stt.recognize(clips[0], return_segments=True, beam_size=config.beam_size)
+    next(iter(segments), None)
+    first_segment_seconds = time.perf_counter() - start
+
+    def decode(audio: np.ndarray) -> str:
+        return stt.recognize(audio, beam_size=config.beam_size)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(config.num_workers) as pool:
+        list(pool.map(decode, clips))
+    wall_seconds = time.perf_counter() - start
+
+    return BenchResult(
+        config=replace(config, compute_type=stt.compute_type),
+        load_seconds=load_seconds,
+        first_segment_seconds=first_segment_seconds,
+        audio_seconds=sum(clip.shape[0] for clip in clips) / SAMPLING_RATE,
+        wall_seconds=wall_seconds,
+        clips=len(clips),
+        peak_rss_mb=peak_rss_mb(),
+    )
+
+
+def run_benchmark(
+    configs: List[BenchConfig],
+    clips: List[np.ndarray],
+    isolate: bool = True,
+    **kwargs,
+) -> List[BenchResult]:
+    """
+    Benchmark each configuration.
+
+    With `isolate`, every configuration runs in a fresh process so load time
+    and peak RSS are not skewed by models loaded before it.
+    """
+    results = []
+    for config in configs:
+        logger.info(f"Benchmarking {config}")
+        if isolate:
+            context = multiprocessing.get_context("spawn")
+            with ProcessPoolExecutor(1, mp_context=context) as pool:
+                result = pool.submit(run_config, config, clips, **kwargs).result()
+        else:
+            result = run_config(config, clips, **kwargs)
+        logger.debug(str(result))
+        results.append(result)
+    return results
+
+
+def environment() -> Dict[str, Any]:
+    """Versions and hardware the benchmark ran on."""
+    from importlib.metadata import PackageNotFoundError, version
+
+    versions = {}
+    for package in ("BanglaSpeech2Text", "faster-whisper", "ctranslate2"):
+        try:
+            versions[package] = version(package)
+        except PackageNotFoundError:
+            versions[package] = None
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+        "versions": versions,
+    }
+
+
+def write_results(
+    results: List[BenchResult], path: str, extra: Optional[dict] = None
+) -> None:
+    """Write results and the environment to a JSON file."""
+    data = {
+        "timestamp": time.time(),
+        "environment": environment(),
+        **(extra or {}),
+        "results": [result.to_dict() for result in results],
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
@@ -0,0 +1,241 @@
+from dataclasses import dataclass, field, replace
+import threading
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Sequence, Union
+import logging
+
+import numpy as np
+
+from banglaspeech2text.longform import _shift
+from banglaspeech2text.metrics import Metrics
+from banglaspeech2text.utils.audio import SAMPLING_RATE
+
+if TYPE_CHECKING:
+    from faster_whisper.transcribe import Segment
+    from banglaspeech2text.speech2text import Speech2Text
+
+# Get a child logger that inherits from the main logger
+logger = logging.getLogger("BanglaSpeech2Text.cascade")
+
+
+@dataclass
+class Thresholds:
+    """
+    Confidence a segment needs to be kept without escalating.
+
+    The defaults are the ones faster-whisper uses to retry a window at a
+    higher temperature.
+
+    Args:
+        min_avg_logprob: Lowest average token log probability
+        max_no_speech_prob: Highest probability that the segment is silence
+        max_compression_ratio: Highest gzip compression ratio of the text;
+            repetitive (hallucinated) text compresses well
+    """
+
+    min_avg_logprob: float = -1.0
+    max_no_speech_prob: float = 0.6
+    max_compression_ratio: float = 2.4
+
+    def passes(self, segment: "Segment") -> bool:
+        return (
+            segment.avg_logprob >= self.min_avg_logprob
+            and segment.no_speech_prob <= self.max_no_speech_prob
+            and segment.compression_ratio <= self.max_compression_ratio
+        )
+
+
+@dataclass
+class CascadeStats:
+    """
+    Escalation counts of a `CascadeRecognizer`.
+
+    `audio_seconds` is the audio each model decoded, which is what the
+    cascade costs; `escalated_segments` and `escalated_requests` count the
+    segments and inputs that had to go to a larger model.
+    """
+
+    requests: int = 0
+    segments: int = 0
+    escalated_requests: int = 0
+    escalated_segments: int = 0
+    audio_seconds: Dict[str, float] = field(default_factory=dict)
+
+    @property
+    def escalation_rate(self) -> float:
+        """Share of inputs that needed a larger model."""
+        return self.escalated_requests / self.requests if self.requests else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "segments": self.segments,
+            "escalated_requests": self.escalated_requests,
+            "escalated_segments": self.escalated_segments,
+            "escalation_rate": self.escalation_rate,
+            "audio_seconds": dict(self.audio_seconds),
+        }
+
+
+def _resolve(name: str) -> str:
+    # "tiny", "large", ... are catalogue types: use the best model of the type
+    from banglaspeech2text.utils.models import catalog, get_best_model, model_id
+
+    if name in catalog.types:
+        return model_id(get_best_model(name))
+    return name
+
+
+class CascadeRecognizer:
+    """
+    Recognize with the cheapest model first and escalate what it gets wrong.
+
+    Every input is decoded by the first model. Segments that fail
+    `thresholds` are cut out of the audio (with `padding_s` on each side)
+    and decoded again by the next model, and so on up the cascade; segments
+    that pass are kept as they are. With `per_segment=False` the whole input
+    is decoded again instead, which is better for short commands where one
+    weak segment usually means the whole utterance is wrong. An input for
+    which the model finds no speech at all is escalated whole.
+
+    Larger models are loaded the first time they are needed.
+
+    Args:
+        models: Model names or loaded `Speech2Text` instances, cheapest
+            first. Catalogue types ("tiny", "large") use the best model of
+            that type
+        thresholds: Confidence a segment needs to be kept
+        per_segment: Escalate failing segments rather than whole inputs
+        padding_s: Audio kept around an escalated segment
+        metrics: Counts escalations per model in `cascade_escalations`
+        factory: Callable creating a model from a name, `Speech2Text` by
+            default
+        **kwargs: Arguments for models created by name
+    """
+
+    def __init__(
+        self,
+        models: Sequence[Union[str, "Speech2Text"]] = ("tiny", "large"),
+        thresholds: Optional[Thresholds] = None,
+        per_segment: bool = True,
+        padding_s: float = 0.2,
+        metrics: Optional[Metrics] = None,
+        factory: Optional[Callable[..., Any]] = None,
+        **kwargs,
+    ):
+        if not models:
+            raise ValueError("a cascade needs at least one model")
+        self.thresholds = thresholds or Thresholds()
+        self.per_segment = per_segment
+        self.padding = int(padding_s * SAMPLING_RATE)
+        self.metrics = metrics
+        self.stats = CascadeStats()
+        self._factory = factory
+        self._kwargs = kwargs
+        self._names = [m if isinstance(m, str) else str(m.model_path) for m in models]
+        self._models: List[Any] = [None if isinstance(m, str) else m for m in models]
+        self._lock = threading.Lock()
+        self._load_lock = threading.Lock()
+
+    def model(self, level: int) -> "Speech2Text":
+        """The model at `level` of the cascade, loading it if needed."""
+        if self._models[level] is None:
+            with self._load_lock:
+                if self._models[level] is None:
+                    factory = self._factory
+                    if factory is None:
+                        from banglaspeech2text.speech2text import Speech2Text
+
+                        factory = Speech2Text
+                    name = _resolve(self._names[level])
+                    logger.info(f"Loading cascade level {level}: {name}")
+                    self._models[level] = factory(name, **self._kwargs)
+        return self._models[level]
+
+    def recognize(
+        self, audio: Any, return_segments: bool = False, **kw
+    ) -> Union[List["Segment"], str]:
+        """
+        Recognize audio, escalating low-confidence segments.
+
+        Args:
+            audio: Anything `Speech2Text.recognize` accepts
+            return_segments: Return segments instead of text
+            **kw: Decoding options, used for every model
+
+        Returns:
+            str or list: Text, or segments if `return_segments` is True
+        """
+        first = self.model(0)
+        audio = first._load_array(audio)
+        duration = audio.shape[0] / SAMPLING_RATE
+
+        segments = self._decode(0, audio, 0, **kw)
+        escalated = 0
+        for level in range(1, len(self._names)):
+            failing = [
+                i for i, s in enumerate(segments) if not self.thresholds.passes(s)
+            ]
+            if segments and not failing:
+                break
+            if not self.per_segment or not segments:
+                escalated = max(escalated, len(segments) or 1)
+                segments = self._decode(level, audio, 0, **kw)
+                continue
+            escalated += len(failing)
+            segments = self._escalate(level, audio, segments, failing, **kw)
+        segments = [replace(s, id=i) for i, s in enumerate(segments, start=1)]
+
+        with self._lock:
+            self.stats.requests += 1
+            self.stats.segments += len(segments)
+            self.stats.escalated_segments += escalated
+            self.stats.escalated_requests += bool(escalated)
+        logger.debug(f"Cascade: {escalated} segment(s) of {duration:.1f}s escalated")
+
+        if return_segments:
+            return segments
+        return "".join(segment.text for segment in segments)
+
+    def _decode(
+        self, level: int, audio: np.ndarray, offset: int, **kw
+    ) -> List["Segment"]:
+        segments = list(self.model(level).recognize(audio, return_segments=True, **kw))
+        seconds = audio.shape[0] / SAMPLING_RATE
+        name = self._names[level]
+        with self._lock:
+            self.stats.audio_seconds[name] = (
+                self.stats.audio_seconds.get(name, 0.0) + seconds
+            )
+        if level and self.metrics is not None:
+            self.metrics.inc("cascade_escalations", model=name)
+        if offset:
+            segments = [_shift(s, offset / SAMPLING_RATE) for s in segments]
+        return segments
+
+    def _escalate(
+        self,
+        level: int,
+        audio: np.ndarray,
+        segments: List["Segment"],
+        failing: List[int],
+        **kw,
+    ) -> List["Segment"]:
+        result: List["Segment"] = []
+        failing_set = set(failing)
+        for i, segment in enumerate(segments):
+            if i not in failing_set:
+                result.append(segment)
+                continue
+            # stay between the neighbouring segments so no speech is decoded twice
+            lo = int(segment.start * SAMPLING_RATE) - self.padding
+            hi = int(segment.end * SAMPLING_RATE) + self.padding
+            if i > 0:
+                lo = max(lo, int(segments[i - 1].end * SAMPLING_RATE))
+            if i + 1 < len(segments):
+                hi = min(hi, int(segments[i + 1].start * SAMPLING_RATE))
+            lo, hi = max(lo, 0), min(hi, audio.shape[0])
+            if hi <= lo:
+                result.append(segment)
+                continue
+            result.extend(self._decode(level, audio[lo:hi], lo, **kw))
+        return result
@@ -1,17 +1,11 @@
 import argparse
-from mimetypes import guess_type
+import sys
 
+from banglaspeech2text.batch import is_audio_file
 from banglaspeech2text.utils.models import nice_model_list
 from banglaspeech2text.utils.loading import LoadingIndicator
 
 
-def is_audio_file(filename):
-    gt = guess_type(filename)
-    if gt[0] is None:
-        return False
-    return gt[0].startswith("audio")
-
-
 def use_mic(stt):
     import speech_recognition as sr  # type: ignore
 
@@ -33,8 +27,203 @@ def use_mic(stt):
             continue
 
 
-def main():
-    parser = argparse.ArgumentParser(description="Bangla Speech to Text")
+def use_mic_stream(stt):
+    import speech_recognition as sr  # type: ignore
+
+    session = stt.stream()
+    with sr.Microphone(sample_rate=16000) as source:
+        print("Say something!")
+        try:
+            while True:
+                chunk = source.stream.read(source.CHUNK)
+                for segment in session.feed(chunk):
+                    if segment.is_final:
+                        print("\r" + segment.text.strip())
+                    else:
+                        print("\r" + segment.text.strip(), end="", flush=True)
+        except KeyboardInterrupt:
+            for segment in session.flush():
+                print("\r" + segment.text.strip())
+            print("Exiting...")
+
+
+def batch_main(argv):
+    parser = argparse.ArgumentParser(
+        prog="bnstt batch",
+        description="Transcribe directories, globs or manifests (CSV/JSONL) to JSONL",
+    )
+    parser.add_argument(
+        "input",
+        metavar="INPUT",
+        type=str,
+        nargs="+",
+        help="audio files, directories, glob patterns or manifest files",
+    )
+    parser.add_argument(
+        "-o", "--output", type=str, help="output JSONL file", required=True
+    )
+    parser.add_argument("-m", "--model", type=str, help="model name", default="base")
+    parser.add_argument(
+        "-w", "--workers", type=int, help="audio decoding threads", default=4
+    )
+    parser.add_argument(
+        "--prefetch", type=int, help="files decoded ahead of the model", default=16
+    )
+    parser.add_argument(
+        "--no-resume",
+        action="store_true",
+        help="overwrite the output instead of skipping files already in it",
+    )
+    args = parser.parse_args(argv)
+
+    from banglaspeech2text.batch import BatchTranscriber, iter_audio_files
+    from banglaspeech2text.speech2text import Speech2Text
+
+    stt = Speech2Text(args.model)
+    transcriber = BatchTranscriber(stt, workers=args.workers, prefetch=args.prefetch)
+    with LoadingIndicator("Transcribing"):
+        stats = transcriber.run(
+            iter_audio_files(args.input), args.output, resume=not args.no_resume
+        )
+    print(stats)
+
+
+def bench_main(argv):
+    parser = argparse.ArgumentParser(
+        prog="bnstt bench",
+        description="Measure load time, latency, real-time factor and memory",
+    )
+    parser.add_argument("-m", "--model", type=str, help="model name", default="base")
+    parser.add_argument(
+        "-o", "--output", type=str, help="output JSON file", default=None
+    )
+    parser.add_argument(
+        "--audio",
+        type=str,
+        nargs="+",
+        help="audio files to use instead of synthetic audio",
+    )
+    parser.add_argument(
+        "--clips", type=int, help="number of synthetic clips", default=8
+    )
+    parser.add_argument(
+        "--clip-seconds",
+        type=float,
+        help="length of each synthetic clip",
+        default=10.0,
+    )
+    parser.add_argument("--compute-type", type=str, nargs="+", default=["default"])
+    parser.add_argument("--cpu-threads", type=int, nargs="+", default=[0])
+    parser.add_argument("--num-workers", type=int, nargs="+", default=[1])
+    parser.add_argument("--beam-size", type=int, nargs="+", default=[5])
+    parser.add_argument(
+        "--skip-conversion",
+        action="store_true",
+        help="MODEL is an already converted CTranslate2 model directory",
+    )
+    parser.add_argument(
+        "--no-isolate",
+        action="store_true",
+        help="run every configuration in this process",
+    )
+    args = parser.parse_args(argv)
+
+    from banglaspeech2text import bench
+
+    if args.audio:
+        from faster_whisper.audio import decode_audio
+
+        clips = [decode_audio(path) for path in args.audio]
+    else:
+        clips = [
+            bench.synthetic_audio(args.clip_seconds, seed=i) for i in range(args.clips)
+        ]
+
+    configs = bench.sweep(
+        args.model,
+        args.compute_type,
+        args.cpu_threads,
+        args.num_workers,
+        args.beam_size,
+    )
+    results = bench.run_benchmark(
+        configs,
+        clips,
+        isolate=not args.no_isolate,
+        skip_conversion=args.skip_conversion,
+    )
+    for result in results:
+        print(result)
+    if args.output:
+        bench.write_results(results, args.output, {"audio": args.audio or "synthetic"})
+
+
+def serve_main(argv):
+    parser = argparse.ArgumentParser(
+        prog="bnstt serve",
+        description="Serve one loaded model over HTTP and WebSocket",
+    )
+    parser.add_argument("-m", "--model", type=str, help="model name", default="base")
+    parser.add_argument("--host", type=str, default="127.0.0.1")
+    parser.add_argument("-p", "--port", type=int, default=8000)
+    parser.add_argument(
+        "--num-workers", type=int, help="parallel model workers", default=1
+    )
+    parser.add_argument("--cpu-threads", type=int, help="threads per worker", default=0)
+    parser.add_argument("--compute-type", type=str, default="default")
+    parser.add_argument(
+        "--batch-window-ms",
+        type=float,
+        help="time to wait for more requests to batch together",
+        default=10.0,
+    )
+    parser.add_argument(
+        "--max-batch", type=int, help="maximum requests per batch", default=8
+    )
+    args = parser.parse_args(argv)
+
+    try:
+        import aiohttp  # type: ignore # noqa: F401
+    except ImportError:
+        print("The server needs aiohttp: pip install BanglaSpeech2Text[server]")
+        sys.exit(1)
+
+    from banglaspeech2text.metrics import Metrics
+    from banglaspeech2text.server import serve
+    from banglaspeech2text.speech2text import Speech2Text
+
+    stt = Speech2Text(
+        args.model,
+        compute_type=args.compute_type,
+        cpu_threads=args.cpu_threads,
+        num_workers=args.num_workers,
+        metrics=Metrics(),
+    )
+    serve(
+        stt,
+        host=args.host,
+        port=args.port,
+        batch_window_ms=args.batch_window_ms,
+        max_batch=args.max_batch,
+    )
+
+
+SUBCOMMANDS = {
+    "batch": batch_main,
+    "bench": bench_main,
+    "serve": serve_main,
+}
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] in SUBCOMMANDS:
+        return SUBCOMMANDS[argv[0]](argv[1:])
+
+    parser = argparse.ArgumentParser(
+        description="Bangla Speech to Text",
+        epilog=f"subcommands: {', '.join(SUBCOMMANDS)} (see bnstt <subcommand> -h)",
+    )
     parser.add_argument(
         "input",
         metavar="INPUT",
@@ -50,8 +239,27 @@ def main():
     parser.add_argument("--list", action="store_true", help="list of available models")
     parser.add_argument("--info", action="store_true", help="show model info")
     parser.add_argument("--mic", action="store_true", help="use microphone")
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="show partial results while speaking (with --mic)",
+    )
+    parser.add_argument(
+        "--vad",
+        nargs="?",
+        const="silero",
+        choices=["silero", "energy"],
+        help="skip non-speech audio before decoding",
+    )
+    parser.add_argument(
+        "-f",
+        "--format",
+        choices=["txt", "json", "srt", "vtt"],
+        default="txt",
+        help="output format",
+    )
 
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
 
     if args.list:
         print(
@@ -72,13 +280,18 @@ def main():
         parser.print_help()
         return
 
-    sst = Speech2Text(args.model)
+    from banglaspeech2text.utils.vad import VadFilter
+
+    sst = Speech2Text(args.model, vad=VadFilter(args.vad) if args.vad else None)
 
     if args.mic:
-        use_mic(sst)
+        if args.stream:
+            use_mic_stream(sst)
+        else:
+            use_mic(sst)
         return
 
-    output = ""
+    outputs = []
     audio_files = []
 
     for filename in args.input:
@@ -88,16 +301,17 @@ def main():
             with open(filename, "r") as f:
                 audio_files.extend([line.strip() for line in f])
 
-    n = len(audio_files)
     for filename in audio_files:
         print(f"Recognizing {filename}...")
         with LoadingIndicator(f"Recognizing {filename}"):
-            output += sst.recognize(
-                filename,
-            )
-        if n > 1:
-            output += "\n" + "=" * 50 + "\n"
-            n -= 1
+            if args.format == "txt":
+                outputs.append(sst.recognize(filename))
+            else:
+                result = sst.recognize_result(
+                    filename, word_timestamps=args.format == "json"
+                )
+                outputs.append(getattr(result, f"to_{args.format}")())
+    output = ("\n" + "=" * 50 + "\n").join(outputs)
 
     if args.output:
         with open(args.output, "w") as f:
@@ -0,0 +1,173 @@
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass
+import threading
+from typing import Any, Iterator, List, Optional
+import logging
+
+import numpy as np
+
+from banglaspeech2text.utils.cache import audio_hash
+
+# Get a child logger that inherits from the main logger
+logger = logging.getLogger("BanglaSpeech2Text.features")
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+DEFAULT_PADDING = 160  # faster-whisper's default padding of the waveform
+
+
+@dataclass(eq=False)
+class AudioFeatures:
+    """
+    Log-mel features of one input, returned by `Speech2Text.extract_features`.
+
+    Pass it to `recognize` to decode again without recomputing the
+    spectrogram, e.g. with other decoding options.
+
+    Attributes:
+        audio: Waveform the features were computed from; only the speech when
+            the model has a VAD stage
+        mel: Log-mel spectrogram of `audio`
+        key: Content hash of the decoded input
+        duration: Duration of the input in seconds, before VAD
+        chunks: Speech chunks kept by the VAD stage, None without VAD
+        chunk_length: `chunk_length` the features were computed for
+    """
+
+    audio: np.ndarray
+    mel: np.ndarray
+    key: str
+    duration: float
+    chunks: Optional[List[dict]] = None
+    chunk_length: Optional[int] = None
+
+    @property
+    def nbytes(self) -> int:
+        return self.audio.nbytes + self.mel.nbytes
+
+
+class FeatureCache:
+    """
+    In-memory LRU cache of log-mel spectrograms keyed by the audio hash.
+
+    Spectrograms are kept until they exceed `max_bytes`, then the least
+    recently used are dropped. One cache can be shared by several models:
+    the key includes the number of mel bins.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        """Cached spectrogram for `key`, or None on a miss."""
+        with self._lock:
+            mel = self._entries.get(key)
+            if mel is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return mel
+
+    def put(self, key: str, mel: np.ndarray) -> None:
+        """Store a spectrogram and evict old entries if needed."""
+        if mel.nbytes > self.max_bytes:
+            return
+        # shared between callers, so nobody may change it in place
+        mel.flags.writeable = False
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old.nbytes
+            self._entries[key] = mel
+            self._bytes += mel.nbytes
+            while self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted.nbytes
+
+    def stats(self) -> dict:
+        """Hit and miss counters and the current size of the cache."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+            }
+
+    def clear(self) -> None:
+        """Remove every cached spectrogram."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+
+class CachingFeatureExtractor:
+    """
+    Wraps a feature extractor to reuse spectrograms that were computed before.
+
+    Inside `use(features)` a call for exactly `features.audio` (the same
+    array object) returns `features.mel`. Other calls are looked up in
+    `cache` by content hash when a cache is set.
+    """
+
+    def __init__(self, feature_extractor: Any, cache: Optional[FeatureCache] = None):
+        self._feature_extractor = feature_extractor
+        self.cache = cache
+        self._local = threading.local()
+
+    @contextmanager
+    def use(self, features: AudioFeatures) -> Iterator[None]:
+        """Answer calls for `features.audio` with `features.mel`."""
+        previous = getattr(self._local, "features", None)
+        self._local.features = features
+        try:
+            yield
+        finally:
+            self._local.features = previous
+
+    def __call__(
+        self,
+        waveform: np.ndarray,
+        padding: int = DEFAULT_PADDING,
+        chunk_length: Optional[int] = None,
+    ) -> np.ndarray:
+        features = getattr(self._local, "features", None)
+        if (
+            features is not None
+            and waveform is features.audio
+            and padding == DEFAULT_PADDING
+            and chunk_length == features.chunk_length
+        ):
+            self._set_chunk_length(chunk_length)
+            return features.mel
+        if self.cache is None:
+            return self._feature_extractor(
+                waveform, padding=padding, chunk_length=chunk_length
+            )
+
+        extractor = self._feature_extractor
+        n_mels = extractor.mel_filters.shape[0]
+        key = f"{audio_hash(waveform)}:{n_mels}:{padding}:{chunk_length}"
+        mel = self.cache.get(key)
+        if mel is None:
+            mel = extractor(waveform, padding=padding, chunk_length=chunk_length)
+            self.cache.put(key, mel)
+        else:
+            self._set_chunk_length(chunk_length)
+        return mel
+
+    def _set_chunk_length(self, chunk_length: Optional[int]) -> None:
+        # the extractor keeps the last chunk_length, which decoding reads
+        if chunk_length is not None:
+            extractor = self._feature_extractor
+            extractor.n_samples = chunk_length * extractor.sampling_rate
+            extractor.nb_max_frames = extractor.n_samples // extractor.hop_length
+
+    def __getattr__(self, name):
+        return getattr(self._feature_extractor, name)
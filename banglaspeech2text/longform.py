@@ -0,0 +1,206 @@
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
+import time
+from typing import TYPE_CHECKING, Any, List, Optional, Tuple
+import logging
+
+import numpy as np
+
+from banglaspeech2text.utils.vad import speech_regions
+
+if TYPE_CHECKING:
+    from banglaspeech2text.speech2text import Speech2Text
+
+# Get a child logger that inherits from the main logger
+logger = logging.getLogger("BanglaSpeech2Text.longform")
+
+ENERGY_FRAME = 160  # samples per energy frame (10 ms at 16 kHz)
+
+
+def _quietest(audio: np.ndarray, lo: int, hi: int) -> int:
+    """Sample offset of the lowest-energy frame in audio[lo:hi]."""
+    n = (hi - lo) // ENERGY_FRAME
+    if n <= 0:
+        return hi
+    frames = audio[lo : lo + n * ENERGY_FRAME].reshape(n, ENERGY_FRAME)
+    energy = np.einsum("ij,ij->i", frames, frames)
+    return lo + int(np.argmin(energy)) * ENERGY_FRAME + ENERGY_FRAME // 2
+
+
+def plan_chunks(
+    audio: np.ndarray,
+    regions: List[Tuple[int, int]],
+    max_samples: int,
+    overlap_samples: int = 0,
+) -> List[Tuple[int, int]]:
+    """
+    Group speech regions into chunks of at most `max_samples`.
+
+    Consecutive regions are merged while they fit in one chunk, so chunks
+    start and end in silence and long pauses are skipped. A region that is
+    longer than `max_samples` on its own is cut at its quietest point, and
+    the two chunks on either side of the cut share `overlap_samples`.
+
+    Args:
+        audio: Mono waveform the regions refer to
+        regions: (start, end) sample offsets of speech, in order
+        max_samples: Maximum chunk length
+        overlap_samples: Overlap between chunks at forced cuts
+
+    Returns:
+        list: (start, end) sample offsets of each chunk
+    """
+    if not 0 <= overlap_samples < max_samples // 2:
+        raise ValueError("overlap must be less than half the chunk length")
+
+    half = overlap_samples // 2
+    chunks = []
+    current: Optional[List[int]] = None
+    for start, end in regions:
+        if current is not None and end - current[0] <= max_samples:
+            current[1] = end
+            continue
+        if current is not None:
+            chunks.append(tuple(current))
+
+        while end - start > max_samples:
+            cut = _quietest(audio, start + max_samples // 2, start + max_samples - half)
+            chunks.append((start, cut + half))
+            start = cut - half
+        current = [start, end]
+
+    if current is not None:
+        chunks.append(tuple(current))
+    return chunks
+
+
+def _shift(segment: Any, offset: float) -> Any:
+    words = segment.words
+    if words:
+        words = [
+            replace(
+                word,
+                start=round(word.start + offset, 3),
+                end=round(word.end + offset, 3),
+            )
+            for word in words
+        ]
+    return replace(
+        segment,
+        start=round(segment.start + offset, 3),
+        end=round(segment.end + offset, 3),
+        words=words,
+    )
+
+
+def _repeated_words(previous: str, text: str) -> int:
+    """Number of leading words of `text` that repeat the end of `previous`."""
+    a, b = previous.split(), text.split()
+    for k in range(min(len(a), len(b)), 0, -1):
+        if a[-k:] == b[:k]:
+            return k
+    return 0
+
+
+def stitch_segments(
+    chunks: List[Tuple[int, int]],
+    results: List[List[Any]],
+    sampling_rate: int,
+) -> List[Any]:
+    """
+    Join per-chunk segments into one list with global timestamps.
+
+    Where two chunks overlap, segments are split between them at the middle
+    of the overlap, and words the second chunk repeats at its start are
+    removed.
+
+    Args:
+        chunks: (start, end) sample offsets of each chunk
+        results: Segments decoded from each chunk, timed from the chunk start
+        sampling_rate: Sampling rate of the chunk offsets
+
+    Returns:
+        list: Segments in order with ids renumbered from 1
+    """
+    stitched: List[Any] = []
+    previous_end = None
+    for (start, end), segments in zip(chunks, results):
+        segments = [_shift(segment, start / sampling_rate) for segment in segments]
+
+        if previous_end is not None and start < previous_end:
+            boundary = (start + previous_end) / 2 / sampling_rate
+            while stitched and stitched[-1].start >= boundary:
+                stitched.pop()
+            segments = [segment for segment in segments if segment.end > boundary]
+
+            if stitched and segments:
+                k = _repeated_words(stitched[-1].text, segments[0].text)
+                if k:
+                    words = segments[0].text.split()[k:]
+                    if words:
+                        segments[0] = replace(
+                            segments[0],
+                            text=" " + " ".join(words),
+                            words=(
+                                segments[0].words[k:] if segments[0].words else None
+                            ),
+                        )
+                    else:
+                        segments.pop(0)
+
+        stitched.extend(segments)
+        previous_end = end
+
+    return [replace(segment, id=n) for n, segment in enumerate(stitched, start=1)]
+
+
+def transcribe_long(
+    stt: "Speech2Text",
+    audio: np.ndarray,
+    max_chunk_s: float = 30.0,
+    overlap_s: float = 1.0,
+    workers: Optional[int] = None,
+    vad_threshold: float = 0.5,
+    min_silence_ms: int = 300,
+    **kw,
+) -> List[Any]:
+    """
+    Transcribe a long recording by decoding VAD chunks concurrently.
+
+    Args:
+        stt: Model used for every chunk
+        audio: Mono float32 waveform at the model's sampling rate
+        max_chunk_s: Maximum chunk length in seconds
+        overlap_s: Overlap between chunks cut inside speech
+        workers: Chunks decoded at once, defaults to `stt.num_workers`
+        vad_threshold: Speech probability threshold for Silero VAD
+        min_silence_ms: Silence that separates speech regions
+        **kw: Decoding options passed to `recognize`
+
+    Returns:
+        list: Segments with timestamps relative to the start of `audio`
+    """
+    sampling_rate = stt.feature_extractor.sampling_rate
+    regions = speech_regions(
+        audio, sampling_rate, threshold=vad_threshold, min_silence_ms=min_silence_ms
+    )
+    chunks = plan_chunks(
+        audio,
+        regions,
+        int(max_chunk_s * sampling_rate),
+        int(overlap_s * sampling_rate),
+    )
+    workers = workers or stt.num_workers
+    logger.debug(f"Decoding {len(chunks)} chunks with {workers} workers")
+
+    submitted = time.perf_counter()
+
+    def decode(chunk: Tuple[int, int]) -> List[Any]:
+        if stt.metrics is not None:
+            stt.metrics.observe("queue_wait_seconds", time.perf_counter() - submitted)
+        start, end = chunk
+        return list(stt.recognize(audio[start:end], return_segments=True, **kw))
+
+    with ThreadPoolExecutor(max(1, workers)) as pool:
+        results = list(pool.map(decode, chunks))
+    return stitch_segments(chunks, results, sampling_rate)
@@ -0,0 +1,224 @@
+from bisect import bisect_left
+from contextlib import contextmanager
+import threading
+import time
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+import logging
+
+# Get a child logger that inherits from the main logger
+logger = logging.getLogger("BanglaSpeech2Text.metrics")
+
+DEFAULT_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+    300.0,
+)
+
+# Metrics recorded by Speech2Text and their help text
+HISTOGRAMS = {
+    "stage_seconds": "Time spent in each stage of a request",
+    "request_seconds": "Time to transcribe one input",
+    "audio_seconds": "Duration of transcribed audio",
+    "rtf": "Real-time factor (processing seconds per audio second)",
+    "queue_wait_seconds": "Time a request waited before it started",
+    "model_load_seconds": "Time to load a model",
+    "conversion_seconds": "Time to find or convert a CTranslate2 model",
+    "batch_size": "Requests decoded together by the server",
+    "http_request_seconds": "Time to answer a transcription request",
+    "vad_skipped_seconds": "Non-speech audio removed before decoding",
+}
+COUNTERS = {
+    "requests": "Transcribed inputs",
+    "tokens": "Decoded tokens",
+    "cascade_escalations": "Inputs or segments decoded again by a larger model",
+}
+
+Labels = Tuple[Tuple[str, str], ...]
+Callback = Callable[[str, float, Dict[str, str]], None]
+
+
+class Histogram:
+    """Cumulative histogram with fixed bucket bounds."""
+
+    def __init__(self, buckets: Iterable[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q: float) -> float:
+        """Estimate the q-quantile, interpolating inside a bucket."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            if seen + n >= rank and n:
+                if i == len(self.buckets):
+                    return self.buckets[-1]
+                low = self.buckets[i - 1] if i else 0.0
+                return low + (self.buckets[i] - low) * (rank - seen) / n
+            seen += n
+        return self.buckets[-1]
+
+
+def _format_labels(labels: Labels, extra: str = "") -> str:
+    parts = [f'{k}="{v}"' for k, v in labels]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class Metrics:
+    """
+    In-process metrics registry.
+
+    Holds histograms and counters keyed by name and labels, calls any
+    registered callbacks with every observation, and renders everything in
+    the OpenMetrics text format for a Prometheus scrape endpoint. Pass an
+    instance as `Speech2Text(metrics=...)` to record per-stage timings.
+    """
+
+    def __init__(
+        self,
+        prefix: str = "bnstt",
+        buckets: Iterable[float] = DEFAULT_BUCKETS,
+        callbacks: Optional[List[Callback]] = None,
+    ):
+        self.prefix = prefix
+        self.buckets = tuple(buckets)
+        self.callbacks: List[Callback] = list(callbacks or [])
+        self._histograms: Dict[str, Dict[Labels, Histogram]] = {}
+        self._counters: Dict[str, Dict[Labels, float]] = {}
+        self._lock = threading.Lock()
+
+    def add_callback(self, callback: Callback) -> None:
+        """Call `callback(name, value, labels)` for every observation."""
+        self.callbacks.append(callback)
+
+    def observe(self, name: str, value: float, **labels: str) -> None:
+        """Record a value in the histogram `name`."""
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            if key not in series:
+                series[key] = Histogram(self.buckets)
+            series[key].observe(value)
+        self._notify(name, value, labels)
+
+    def inc(self, name: str, value: float = 1.0, **labels: str) -> None:
+        """Add `value` to the counter `name`."""
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0.0) + value
+        self._notify(name, value, labels)
+
+    @contextmanager
+    def time(self, name: str, **labels: str) -> Iterator[None]:
+        """Observe the wall-clock time of the `with` block in `name`."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def _notify(self, name: str, value: float, labels: Dict[str, str]) -> None:
+        for callback in self.callbacks:
+            try:
+                callback(name, value, labels)
+            except Exception as e:
+                logger.error(f"Metrics callback failed: {e}")
+
+    def histogram(self, name: str, **labels: str) -> Optional[Histogram]:
+        return self._histograms.get(name, {}).get(tuple(sorted(labels.items())))
+
+    def counter(self, name: str, **labels: str) -> float:
+        return self._counters.get(name, {}).get(tuple(sorted(labels.items())), 0.0)
+
+    def snapshot(self) -> dict:
+        """Counts, sums and p50/p90/p99 of every series as plain data."""
+        with self._lock:
+            data = {}
+            for name, series in self._histograms.items():
+                data[name] = [
+                    {
+                        "labels": dict(key),
+                        "count": h.count,
+                        "sum": h.sum,
+                        "p50": h.quantile(0.5),
+                        "p90": h.quantile(0.9),
+                        "p99": h.quantile(0.99),
+                    }
+                    for key, h in series.items()
+                ]
+            for name, series in self._counters.items():
+                data[name] = [
+                    {"labels": dict(key), "value": value}
+                    for key, value in series.items()
+                ]
+        return data
+
+    def render(self) -> str:
+        """All metrics in the OpenMetrics text exposition format."""
+        lines = []
+        with self._lock:
+            for name, series in sorted(self._histograms.items()):
+                full = f"{self.prefix}_{name}"
+                if name in HISTOGRAMS:
+                    lines.append(f"# HELP {full} {HISTOGRAMS[name]}")
+                lines.append(f"# TYPE {full} histogram")
+                for key, h in series.items():
+                    cumulative = 0
+                    for bound, n in zip(h.buckets + (float("inf"),), h.counts):
+                        cumulative += n
+                        le = "+Inf" if bound == float("inf") else repr(float(bound))
+                        labels = _format_labels(key, f'le="{le}"')
+                        lines.append(f"{full}_bucket{labels} {cumulative}")
+                    lines.append(f"{full}_count{_format_labels(key)} {h.count}")
+                    lines.append(f"{full}_sum{_format_labels(key)} {h.sum}")
+            for name, series in sorted(self._counters.items()):
+                full = f"{self.prefix}_{name}"
+                if name in COUNTERS:
+                    lines.append(f"# HELP {full} {COUNTERS[name]}")
+                lines.append(f"# TYPE {full} counter")
+                for key, value in series.items():
+                    lines.append(f"{full}_total{_format_labels(key)} {value}")
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+    def clear(self) -> None:
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+
+
+class TimedFeatureExtractor:
+    """Wraps a feature extractor to time calls as the "features" stage."""
+
+    def __init__(self, feature_extractor, metrics: Metrics):
+        self._feature_extractor = feature_extractor
+        self._metrics = metrics
+
+    def __call__(self, *args, **kwargs):
+        with self._metrics.time("stage_seconds", stage="features"):
+            return self._feature_extractor(*args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self._feature_extractor, name)
@@ -0,0 +1,448 @@
+from collections import deque
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+import itertools
+import multiprocessing
+import os
+from pathlib import Path
+import queue
+import threading
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional, Sequence
+import logging
+
+# Get a child logger that inherits from the main logger
+logger = logging.getLogger("BanglaSpeech2Text.pool")
+
+_DONE = object()
+
+
+def _default_factory(model_path: str, **kwargs) -> Any:
+    from banglaspeech2text.speech2text import Speech2Text
+
+    return Speech2Text(model_path, skip_conversion=True, **kwargs)
+
+
+def _run_job(
+    stt: Any, index: int, job: tuple, results: "multiprocessing.Queue"
+) -> None:
+    job_id, audio, kw = job
+    try:
+        for segment in stt.recognize(audio, return_segments=True, **kw):
+            results.put(("segment", job_id, segment))
+        results.put(("done", job_id, index))
+    except Exception as e:
+        results.put(("error", job_id, (index, f"{type(e).__name__}: {e}")))
+
+
+def _worker(
+    index: int,
+    factory: Callable[..., Any],
+    model_path: str,
+    kwargs: dict,
+    cores: Optional[List[int]],
+    tasks: "multiprocessing.Queue",
+    results: "multiprocessing.Queue",
+) -> None:
+    if cores and hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, cores)
+    try:
+        stt = factory(model_path, **kwargs)
+    except Exception as e:
+        results.put(("failed", index, f"{type(e).__name__}: {e}"))
+        return
+    results.put(("ready", index, None))
+
+    replicas = kwargs.get("num_workers", 1)
+    if replicas == 1:
+        while True:
+            job = tasks.get()
+            if job is None:
+                return
+            _run_job(stt, index, job, results)
+
+    # the replicas share one copy of the weights, so run that many jobs at once
+    from concurrent.futures import ThreadPoolExecutor
+
+    with ThreadPoolExecutor(replicas) as executor:
+        while True:
+            job = tasks.get()
+            if job is None:
+                return
+            executor.submit(_run_job, stt, index, job, results)
+
+
+def split_cores(processes: int, cpu_threads: int) -> List[List[int]]:
+    """
+    Split the CPUs this process may use into one block per worker.
+
+    Blocks are contiguous ranges of CPU ids, which on most machines keeps
+    each worker on one NUMA node.
+    """
+    if hasattr(os, "sched_getaffinity"):
+        cpus = sorted(os.sched_getaffinity(0))
+    else:
+        cpus = list(range(os.cpu_count() or 1))
+    return [
+        [cpus[(i * cpu_threads + j) % len(cpus)] for j in range(cpu_threads)]
+        for i in range(processes)
+    ]
+
+
+@dataclass
+class _Job:
+    id: int
+    audio: Any
+    kw: dict
+    future: Future = field(default_factory=Future)
+    sink: Optional[queue.Queue] = None
+    segments: list = field(default_factory=list)
+    started: bool = False
+
+
+@dataclass
+class _Worker:
+    index: int
+    process: Any = None
+    tasks: Any = None
+    jobs: Deque[int] = field(default_factory=deque)
+    restarts: int = 0
+    ready: bool = False
+    dead: bool = False
+
+
+class Speech2TextPool:
+    """
+    Transcribe with several worker processes, each with its own model.
+
+    One CTranslate2 model stops scaling after a handful of cores, so on large
+    machines it is faster to run several models with a few threads each. The
+    model is converted once in this process; every worker then loads the
+    same converted files with `cpu_threads` threads and, when `affinity` is
+    set, is pinned to its own block of CPUs.
+
+    Every process holds its own copy of the weights: CTranslate2 loads
+    them into its own memory, so they cannot be shared between processes
+    through the page cache, and a model loaded before `fork` does not work
+    in the child. Replicas inside one process do share weights, so with
+    `replicas` each worker runs that many jobs at once on one copy; use
+    fewer processes with more replicas when memory is the limit, and
+    `memory()` to measure it.
+
+    Jobs are handed out by this process, at most `prefetch` per replica, so
+    a worker never sits on a backlog while others are idle. Segments are
+    sent back as they are decoded. A worker that crashes is restarted (up
+    to `max_restarts` times); the jobs it was running fail and the jobs
+    queued behind them go to other workers.
+
+    Args:
+        model_size_or_path: Model name, Hugging Face id or converted model path
+        processes: Number of workers, defaults to
+            CPUs // (cpu_threads * replicas)
+        cpu_threads: Threads per replica, defaults to 4
+        replicas: Jobs each worker decodes at once, sharing its weights
+        affinity: Pin each worker to its own CPUs (Linux only), or a list of
+            CPU lists, one per worker
+        compute_type: CTranslate2 compute type
+        skip_conversion: `model_size_or_path` is already a converted model
+        prefetch: Jobs sent ahead to each replica
+        max_restarts: Restarts allowed per worker
+        factory: Callable `factory(model_path, **kwargs)` creating the model in
+            each worker; it must be importable by the worker processes
+        **kwargs: Extra `Speech2Text` arguments
+    """
+
+    def __init__(
+        self,
+        model_size_or_path: str = "large",
+        processes: Optional[int] = None,
+        cpu_threads: Optional[int] = None,
+        replicas: int = 1,
+        affinity: Any = True,
+        compute_type: str = "default",
+        skip_conversion: bool = False,
+        prefetch: int = 2,
+        max_restarts: int = 3,
+        factory: Optional[Callable[..., Any]] = None,
+        **kwargs,
+    ):
+        cpus = os.cpu_count() or 1
+        self.cpu_threads = cpu_threads or min(4, cpus)
+        self.replicas = max(1, replicas)
+        threads = self.cpu_threads * self.replicas
+        self.processes = processes or max(1, cpus // threads)
+        self.prefetch = max(1, prefetch) * self.replicas
+        self.max_restarts = max_restarts
+        self.factory = factory or _default_factory
+
+        if compute_type == "default":
+            from banglaspeech2text.speech2text import default_compute_type
+
+            compute_type = default_compute_type()
+        self.compute_type = compute_type
+        self.model_path = self._resolve_model(model_size_or_path, skip_conversion)
+        self.kwargs = dict(
+            kwargs,
+            compute_type=compute_type,
+            cpu_threads=self.cpu_threads,
+            num_workers=self.replicas,
+        )
+
+        if affinity is True:
+            self.cores: List[Optional[List[int]]] = list(
+                split_cores(self.processes, threads)
+            )
+        elif affinity:
+            self.cores = [list(c) for c in affinity]
+            if len(self.cores) != self.processes:
+                raise ValueError("affinity needs one CPU list per process")
+        else:
+            self.cores = [None] * self.processes
+
+        self._context = multiprocessing.get_context("spawn")
+        self._results = self._context.Queue()
+        self._jobs: Dict[int, _Job] = {}
+        self._pending: Deque[int] = deque()
+        self._ids = itertools.count()
+        self._lock = threading.Lock()
+        self._closed = False
+        self._workers = [_Worker(i) for i in range(self.processes)]
+        for worker in self._workers:
+            self._start(worker)
+
+        self._collector = threading.Thread(
+            target=self._collect, name="bnstt-pool", daemon=True
+        )
+        self._collector.start()
+
+    def _resolve_model(self, model: str, skip_conversion: bool) -> str:
+        if skip_conversion or Path(model).is_dir():
+            return model
+        from banglaspeech2text.utils.converter import get_ct2_model_path
+        from banglaspeech2text.utils.models import ModelMetadata
+
+        metadata = ModelMetadata(model)
+        return get_ct2_model_path(
+            metadata.raw_name, metadata.cache_path, self.compute_type
+        )
+
+    def _start(self, worker: _Worker) -> None:
+        worker.tasks = self._context.Queue()
+        worker.ready = False
+        worker.process = self._context.Process(
+            target=_worker,
+            args=(
+                worker.index,
+                self.factory,
+                self.model_path,
+                self.kwargs,
+                self.cores[worker.index],
+                worker.tasks,
+                self._results,
+            ),
+            name=f"bnstt-worker-{worker.index}",
+            daemon=True,
+        )
+        worker.process.start()
+
+    def submit(self, audio: Any, **kw) -> Future:
+        """
+        Queue one input.
+
+        Args:
+            audio: File path, bytes, numpy array or anything `recognize` accepts
+            **kw: Decoding options
+
+        Returns:
+            Future: Resolves to the list of segments
+        """
+        return self._submit(audio, kw).future
+
+    def _submit(self, audio: Any, kw: dict, sink: Optional[queue.Queue] = None):
+        if isinstance(audio, Path):
+            audio = str(audio)
+        elif not isinstance(audio, str):
+            from banglaspeech2text.utils.audio import load_audio
+
+            audio = load_audio(audio)
+
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("pool is closed")
+            job = _Job(next(self._ids), audio, kw, sink=sink)
+            self._jobs[job.id] = job
+            self._pending.append(job.id)
+            self._dispatch()
+        return job
+
+    def recognize(self, audio: Any, return_segments: bool = False, **kw):
+        """Transcribe one input on a worker and wait for the result."""
+        segments = self.submit(audio, **kw).result()
+        if return_segments:
+            return segments
+        return "".join(segment.text for segment in segments)
+
+    def stream(self, audio: Any, **kw) -> Iterator[Any]:
+        """Yield segments as the worker decodes them."""
+        sink: queue.Queue = queue.Queue()
+        job = self._submit(audio, kw, sink)
+        while True:
+            item = sink.get()
+            if item is _DONE:
+                break
+            yield item
+        job.future.result()  # raise the worker's error, if any
+
+    def map(self, audios: Sequence[Any], return_segments: bool = False, **kw):
+        """Transcribe many inputs in parallel; results are in input order."""
+        futures = [self.submit(audio, **kw) for audio in audios]
+        for future in futures:
+            segments = future.result()
+            if return_segments:
+                yield segments
+            else:
+                yield "".join(segment.text for segment in segments)
+
+    def _dispatch(self) -> None:
+        # called with self._lock held
+        while self._pending:
+            alive = [w for w in self._workers if not w.dead]
+            if not alive:
+                self._fail_pending(RuntimeError("all pool workers failed"))
+                return
+            worker = min(alive, key=lambda w: len(w.jobs))
+            if len(worker.jobs) >= self.prefetch:
+                return
+            job = self._jobs[self._pending.popleft()]
+            if not job.started:
+                if not job.future.set_running_or_notify_cancel():
+                    del self._jobs[job.id]
+                    continue
+                job.started = True
+            worker.jobs.append(job.id)
+            worker.tasks.put((job.id, job.audio, job.kw))
+
+    def _finish(self, job_id: int, error: Optional[str] = None) -> None:
+        job = self._jobs.pop(job_id, None)
+        if job is None:
+            return
+        if job.sink is not None:
+            job.sink.put(_DONE)
+        if error is None:
+            job.future.set_result(job.segments)
+        else:
+            job.future.set_exception(RuntimeError(error))
+
+    def _fail_pending(self, error: Exception) -> None:
+        while self._pending:
+            job = self._jobs.pop(self._pending.popleft())
+            if job.started or job.future.set_running_or_notify_cancel():
+                if job.sink is not None:
+                    job.sink.put(_DONE)
+                job.future.set_exception(error)
+
+    def _collect(self) -> None:
+        while True:
+            try:
+                kind, key, value = self._results.get(timeout=0.5)
+            except queue.Empty:
+                kind = None
+            except (EOFError, OSError):
+                return
+
+            with self._lock:
+                if kind == "segment":
+                    job = self._jobs.get(key)
+                    if job is not None:
+                        job.segments.append(value)
+                        if job.sink is not None:
+                            job.sink.put(value)
+                elif kind in ("done", "error"):
+                    index, error = (value, None) if kind == "done" else value
+                    if key in self._workers[index].jobs:
+                        self._workers[index].jobs.remove(key)
+                    self._finish(key, error)
+                elif kind == "ready":
+                    self._workers[key].ready = True
+                    logger.debug(f"Worker {key} ready")
+                elif kind == "failed":
+                    logger.error(f"Worker {key} could not load the model: {value}")
+                    self._workers[key].dead = True
+                    self._requeue(self._workers[key])
+
+                if self._closed and not self._jobs:
+                    return
+                self._check_workers()
+                self._dispatch()
+
+    def _check_workers(self) -> None:
+        for worker in self._workers:
+            if worker.dead or worker.process.is_alive():
+                continue
+            code = worker.process.exitcode
+            # the oldest unfinished jobs are the ones that were running
+            for _ in range(min(self.replicas, len(worker.jobs))):
+                self._finish(
+                    worker.jobs.popleft(),
+                    f"worker {worker.index} crashed (exit code {code})",
+                )
+            self._requeue(worker)
+            if worker.restarts >= self.max_restarts:
+                logger.error(f"Worker {worker.index} crashed too often, not restarting")
+                worker.dead = True
+                continue
+            worker.restarts += 1
+            logger.warning(f"Worker {worker.index} exited with code {code}, restarting")
+            self._start(worker)
+
+    def _requeue(self, worker: _Worker) -> None:
+        while worker.jobs:
+            job_id = worker.jobs.pop()
+            if job_id in self._jobs:
+                self._jobs[job_id].segments.clear()
+                self._pending.appendleft(job_id)
+
+    def memory(self) -> List[Dict[str, float]]:
+        """
+        Memory of every live worker, see `bench.memory_usage`.
+
+        Returns:
+            list: One dict per worker with its `pid`, `rss`, `pss`, `uss`
+                and `shared` memory in MB
+        """
+        from banglaspeech2text.bench import memory_usage
+
+        usage = []
+        for worker in self._workers:
+            if worker.dead or not worker.process.is_alive():
+                continue
+            try:
+                info = memory_usage(worker.process.pid)
+            except OSError:  # exited meanwhile
+                continue
+            usage.append(dict(info, pid=worker.process.pid))
+        return usage
+
+    @property
+    def ready(self) -> bool:
+        """True once every live worker has loaded its model."""
+        return all(w.ready for w in self._workers if not w.dead)
+
+    def close(self, wait: bool = True) -> None:
+        """Finish queued jobs and stop the workers."""
+        with self._lock:
+            self._closed = True
+        if wait:
+            self._collector.join()
+        for worker in self._workers:
+            if worker.process.is_alive():
+                worker.tasks.put(None)
+        for worker in self._workers:
+            worker.process.join(timeout=10 if wait else 0)
+            if worker.process.is_alive():
+                worker.process.terminate()
+
+    def __enter__(self) -> "Speech2TextPool":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -0,0 +1,191 @@
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+import os
+import threading
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional, Tuple
+import logging
+
+if TYPE_CHECKING:
+    from banglaspeech2text.speech2text import Speech2Text
+
+# Get a child logger that inherits from the main logger
+logger = logging.getLogger("BanglaSpeech2Text.registry")
+
+RegistryKey = Tuple[str, str, str, Tuple[Tuple[str, Any], ...]]
+
+
+def model_size_on_disk(path: Any) -> int:
+    """Size in bytes of a converted model directory (0 if it is not a directory)."""
+    path = Path(str(path))
+    if not path.is_dir():
+        return 0
+    return sum(f.stat().st_size for f in path.rglob("*") if f.is_file())
+
+
+@dataclass
+class _Entry:
+    instance: Any
+    size: int
+    refs: int = 0
+    # construction arguments that cannot be part of the key
+    unhashable: Optional[Dict[str, Any]] = None
+
+
+class ModelRegistry:
+    """
+    Process-wide pool of loaded models.
+
+    One instance is kept per (model, compute_type, device) and construction
+    arguments, and handed out to every caller that asks for it, with a reference count per entry. When the
+    loaded models exceed `max_memory` bytes, the least recently used entries
+    that nobody holds are unloaded.
+
+    Shared instances are created with `num_workers` CTranslate2 workers, so up
+    to that many threads can transcribe with the same instance in parallel.
+    Workers on one device share the model weights.
+    """
+
+    def __init__(
+        self,
+        max_memory: Optional[int] = None,
+        num_workers: Optional[int] = None,
+        factory: Optional[Callable[..., Any]] = None,
+    ):
+        self.max_memory = max_memory
+        self.num_workers = num_workers or min(4, os.cpu_count() or 1)
+        self._factory = factory
+        self._entries: "OrderedDict[RegistryKey, _Entry]" = OrderedDict()
+        self._loading: Dict[RegistryKey, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def _key(
+        self, model: str, compute_type: str, device: str, kwargs: Dict[str, Any]
+    ) -> Tuple[RegistryKey, Dict[str, Any]]:
+        """Registry key and the arguments that could not be put in it."""
+        from banglaspeech2text.speech2text import default_compute_type
+        from banglaspeech2text.utils.models import resolve_model_name
+
+        if compute_type == "default":
+            compute_type = default_compute_type()
+        options = []
+        unhashable = {}
+        for name, value in sorted(kwargs.items()):
+            try:
+                hash(value)
+            except TypeError:
+                unhashable[name] = value
+            else:
+                options.append((name, value))
+        key = (resolve_model_name(model), compute_type, device, tuple(options))
+        return key, unhashable
+
+    def get(
+        self,
+        model: str = "large",
+        compute_type: str = "default",
+        device: str = "auto",
+        **kwargs,
+    ) -> "Speech2Text":
+        """
+        Get the shared instance for a configuration, loading it if needed.
+
+        Every call must be paired with a `release` once the caller is done.
+
+        Args:
+            model: Model name, HuggingFace id or local path
+            compute_type: CTranslate2 compute type
+            device: Device to load the model on
+            **kwargs: Extra `Speech2Text` arguments; callers with other
+                arguments get another instance
+
+        Returns:
+            Speech2Text: The shared instance
+
+        Raises:
+            ValueError: If an unhashable argument differs from the one the
+                shared instance was loaded with
+        """
+        kwargs.setdefault("num_workers", self.num_workers)
+        key, unhashable = self._key(model, compute_type, device, kwargs)
+        with self._lock:
+            load_lock = self._loading.setdefault(key, threading.Lock())
+
+        with load_lock:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None:
+                    if entry.unhashable != unhashable:
+                        raise ValueError(
+                            f"Shared model {key[0]} was loaded with "
+                            f"{entry.unhashable}, not {unhashable}"
+                        )
+                    entry.refs += 1
+                    self._entries.move_to_end(key)
+                    return entry.instance
+
+            logger.info(f"Loading shared model {key}")
+            factory = self._factory
+            if factory is None:
+                from banglaspeech2text.speech2text import Speech2Text
+
+                factory = Speech2Text
+            instance = factory(model, device=device, compute_type=key[1], **kwargs)
+            instance._registry = self
+
+            with self._lock:
+                size = model_size_on_disk(instance.model_path)
+                entry = _Entry(instance, size, 1, unhashable)
+                self._entries[key] = entry
+                self._evict()
+            return instance
+
+    def release(self, instance: Any) -> None:
+        """Drop one reference to a shared instance."""
+        with self._lock:
+            for entry in self._entries.values():
+                if entry.instance is instance:
+                    entry.refs = max(0, entry.refs - 1)
+                    break
+            self._evict()
+
+    def memory(self) -> int:
+        """Estimated bytes used by loaded models."""
+        with self._lock:
+            return sum(entry.size for entry in self._entries.values())
+
+    def clear(self) -> None:
+        """Unload every entry nobody holds."""
+        with self._lock:
+            for key in [k for k, e in self._entries.items() if e.refs == 0]:
+                del self._entries[key]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, instance: Any) -> bool:
+        return any(e.instance is instance for e in self._entries.values())
+
+    def _evict(self) -> None:
+        if self.max_memory is None:
+            return
+
+        total = sum(entry.size for entry in self._entries.values())
+        for key in list(self._entries):
+            if total <= self.max_memory:
+                return
+            entry = self._entries[key]
+            if entry.refs == 0:
+                logger.info(f"Unloading shared model {key}")
+                total -= entry.size
+                del self._entries[key]
+
+        if total > self.max_memory:
+            logger.warning(
+                f"Shared models use {total} bytes, above the {self.max_memory} byte cap, "
+                "but all of them are in use"
+            )
+
+
+# Default registry used by `Speech2Text.get_shared`
+shared_models = ModelRegistry()
@@ -0,0 +1,227 @@
+import json
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional
+import logging
+
+import numpy as np
+
+if TYPE_CHECKING:
+    import pyarrow  # type: ignore
+    from faster_whisper.transcribe import Segment
+
+# Get a child logger that inherits from the main logger
+logger = logging.getLogger("BanglaSpeech2Text.result")
+
+
+def _timestamp(seconds: float, separator: str) -> str:
+    ms = int(round(seconds * 1000))
+    hours, ms = divmod(ms, 3_600_000)
+    minutes, ms = divmod(ms, 60_000)
+    secs, ms = divmod(ms, 1000)
+    return f"{hours:02d}:{minutes:02d}:{secs:02d}{separator}{ms:03d}"
+
+
+class Transcript:
+    """
+    Compact transcription result with segment and word columns.
+
+    Segments and words are stored as NumPy arrays (one per field) instead of
+    one object each, so millions of results stay small and export without
+    touching every object. Times are float64 seconds, probabilities float32.
+    Word columns are empty unless the audio was decoded with
+    `word_timestamps=True`.
+
+    Attributes:
+        starts, ends: Segment start and end times
+        texts: Segment texts
+        avg_logprobs, no_speech_probs: Segment confidence from the decoder
+        word_starts, word_ends: Word start and end times
+        words: Word texts, with their leading space
+        word_probs: Word probabilities
+        word_segments: Index of the segment each word belongs to
+    """
+
+    __slots__ = (
+        "starts",
+        "ends",
+        "texts",
+        "avg_logprobs",
+        "no_speech_probs",
+        "word_starts",
+        "word_ends",
+        "words",
+        "word_probs",
+        "word_segments",
+    )
+
+    def __init__(
+        self,
+        starts: np.ndarray,
+        ends: np.ndarray,
+        texts: List[str],
+        avg_logprobs: np.ndarray,
+        no_speech_probs: np.ndarray,
+        word_starts: Optional[np.ndarray] = None,
+        word_ends: Optional[np.ndarray] = None,
+        words: Optional[List[str]] = None,
+        word_probs: Optional[np.ndarray] = None,
+        word_segments: Optional[np.ndarray] = None,
+    ):
+        self.starts = np.asarray(starts, dtype=np.float64)
+        self.ends = np.asarray(ends, dtype=np.float64)
+        self.texts = list(texts)
+        self.avg_logprobs = np.asarray(avg_logprobs, dtype=np.float32)
+        self.no_speech_probs = np.asarray(no_speech_probs, dtype=np.float32)
+        empty = np.zeros(0)
+        self.word_starts = np.asarray(
+            empty if word_starts is None else word_starts, dtype=np.float64
+        )
+        self.word_ends = np.asarray(
+            empty if word_ends is None else word_ends, dtype=np.float64
+        )
+        self.words = list(words or [])
+        self.word_probs = np.asarray(
+            empty if word_probs is None else word_probs, dtype=np.float32
+        )
+        self.word_segments = np.asarray(
+            empty if word_segments is None else word_segments, dtype=np.int32
+        )
+
+    @classmethod
+    def from_segments(cls, segments: Iterable["Segment"]) -> "Transcript":
+        """
+        Collect segments into columns.
+
+        `segments` is read once, so the generator returned by `recognize`
+        can be passed directly and no list of segments is kept.
+        """
+        starts, ends, texts, logprobs, no_speech = [], [], [], [], []
+        w_starts, w_ends, words, probs, owners = [], [], [], [], []
+        for i, segment in enumerate(segments):
+            starts.append(segment.start)
+            ends.append(segment.end)
+            texts.append(segment.text)
+            logprobs.append(getattr(segment, "avg_logprob", 0.0))
+            no_speech.append(getattr(segment, "no_speech_prob", 0.0))
+            for word in getattr(segment, "words", None) or ():
+                w_starts.append(word.start)
+                w_ends.append(word.end)
+                words.append(word.word)
+                probs.append(word.probability)
+                owners.append(i)
+        return cls(
+            starts,
+            ends,
+            texts,
+            logprobs,
+            no_speech,
+            w_starts,
+            w_ends,
+            words,
+            probs,
+            owners,
+        )
+
+    @property
+    def text(self) -> str:
+        return "".join(self.texts)
+
+    def __len__(self) -> int:
+        return len(self.texts)
+
+    def __repr__(self) -> str:
+        return f"Transcript(segments={len(self)}, words={len(self.words)})"
+
+    def segment_words(self, index: int) -> slice:
+        """Slice of the word columns belonging to segment `index`."""
+        start, end = np.searchsorted(self.word_segments, [index, index + 1])
+        return slice(int(start), int(end))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Columns as plain lists, the layout `to_json` writes."""
+        return {
+            "text": self.text,
+            "segments": {
+                "start": self.starts.tolist(),
+                "end": self.ends.tolist(),
+                "text": self.texts,
+                "avg_logprob": self.avg_logprobs.tolist(),
+                "no_speech_prob": self.no_speech_probs.tolist(),
+            },
+            "words": {
+                "start": self.word_starts.tolist(),
+                "end": self.word_ends.tolist(),
+                "word": self.words,
+                "probability": self.word_probs.tolist(),
+                "segment": self.word_segments.tolist(),
+            },
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Transcript":
+        segments, words = data["segments"], data.get("words") or {}
+        return cls(
+            segments["start"],
+            segments["end"],
+            segments["text"],
+            segments["avg_logprob"],
+            segments["no_speech_prob"],
+            words.get("start"),
+            words.get("end"),
+            words.get("word"),
+            words.get("probability"),
+            words.get("segment"),
+        )
+
+    def to_json(self, **kwargs) -> str:
+        """
+        Serialize to JSON, one list per column.
+
+        Args:
+            **kwargs: Passed to `json.dumps`
+        """
+        kwargs.setdefault("ensure_ascii", False)
+        return json.dumps(self.to_dict(), **kwargs)
+
+    def _cues(self, separator: str) -> Iterable[str]:
+        for i, text in enumerate(self.texts):
+            start = _timestamp(self.starts[i], separator)
+            end = _timestamp(self.ends[i], separator)
+            yield f"{start} --> {end}\n{text.strip()}\n"
+
+    def to_srt(self) -> str:
+        """SubRip subtitles, one cue per segment."""
+        return "\n".join(
+            f"{i}\n{cue}" for i, cue in enumerate(self._cues(","), start=1)
+        )
+
+    def to_vtt(self) -> str:
+        """WebVTT subtitles, one cue per segment."""
+        return "WEBVTT\n\n" + "\n".join(self._cues("."))
+
+    def to_arrow(self, words: bool = False) -> "pyarrow.Table":
+        """
+        Segments (or words) as a pyarrow Table, built from the columns.
+
+        Requires the optional `pyarrow` package.
+        """
+        import pyarrow as pa  # type: ignore
+
+        if words:
+            return pa.table(
+                {
+                    "start": self.word_starts,
+                    "end": self.word_ends,
+                    "word": pa.array(self.words, type=pa.string()),
+                    "probability": self.word_probs,
+                    "segment": self.word_segments,
+                }
+            )
+        return pa.table(
+            {
+                "start": self.starts,
+                "end": self.ends,
+                "text": pa.array(self.texts, type=pa.string()),
+                "avg_logprob": self.avg_logprobs,
+                "no_speech_prob": self.no_speech_probs,
+            }
+        )
@@ -0,0 +1,193 @@
+import asyncio
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+import heapq
+import itertools
+import threading
+import time
+from typing import TYPE_CHECKING, Any, List, Optional, Union
+import logging
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from faster_whisper.transcribe import Segment
+    from banglaspeech2text.speech2text import Speech2Text
+
+# Get a child logger that inherits from the main logger
+logger = logging.getLogger("BanglaSpeech2Text.scheduler")
+
+
+@dataclass(order=True)
+class _Request:
+    deadline: float
+    seq: int
+    audio: Any = field(compare=False)
+    kw: dict = field(compare=False)
+    key: tuple = field(compare=False)
+    future: Future = field(compare=False)
+    submitted: float = field(compare=False)
+
+
+class MicroBatchScheduler:
+    """
+    Collect requests from many threads or coroutines into batched decodes.
+
+    Requests wait at most `max_wait_ms` (or until `max_batch` are queued)
+    and are then decoded together with `Speech2Text.recognize_batch`. While
+    every worker is busy, requests keep queueing and the next batch is
+    picked by deadline: requests submitted with `deadline_ms` go before bulk
+    requests without one. Only requests with the same decoding options
+    share a batch; clips longer than the model window are decoded alone.
+
+    Args:
+        stt: Model to decode with
+        max_wait_ms: Longest time a request waits for others to join it
+        max_batch: Maximum requests per batch
+        workers: Batches decoded at once, defaults to `stt.num_workers`
+    """
+
+    def __init__(
+        self,
+        stt: "Speech2Text",
+        max_wait_ms: float = 10.0,
+        max_batch: int = 8,
+        workers: Optional[int] = None,
+    ):
+        self.stt = stt
+        self.max_wait = max_wait_ms / 1000
+        self.max_batch = max_batch
+        self.workers = max(1, workers or stt.num_workers)
+        self._heap: List[_Request] = []
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._slots = threading.Semaphore(self.workers)
+        self._closed = False
+        self._pool = ThreadPoolExecutor(self.workers, thread_name_prefix="bnstt-batch")
+        self._thread = threading.Thread(
+            target=self._dispatch, name="bnstt-scheduler", daemon=True
+        )
+        self._thread.start()
+
+    def submit(self, audio: Any, deadline_ms: Optional[float] = None, **kw) -> Future:
+        """
+        Queue one input for decoding.
+
+        Args:
+            audio: Anything `recognize` accepts
+            deadline_ms: Latency target; earlier deadlines are decoded first
+                and requests without one go last
+            **kw: Decoding options
+
+        Returns:
+            Future: Resolves to the list of segments
+        """
+        now = time.monotonic()
+        deadline = now + deadline_ms / 1000 if deadline_ms is not None else float("inf")
+        seq = next(self._seq)
+        key = tuple(sorted((k, repr(v)) for k, v in kw.items()))
+        window = self.stt.feature_extractor.n_samples
+        if isinstance(audio, np.ndarray) and audio.shape[0] > window:
+            key = ("long", seq)  # decoded on its own
+
+        request = _Request(deadline, seq, audio, kw, key, Future(), now)
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("scheduler is closed")
+            heapq.heappush(self._heap, request)
+            self._cond.notify()
+        return request.future
+
+    def recognize(
+        self,
+        audio: Any,
+        return_segments: bool = False,
+        deadline_ms: Optional[float] = None,
+        **kw,
+    ) -> Union[List["Segment"], str]:
+        """Blocking version of `submit` that returns text or segments."""
+        segments = self.submit(audio, deadline_ms, **kw).result()
+        if return_segments:
+            return segments
+        return "".join(segment.text for segment in segments)
+
+    async def asubmit(
+        self, audio: Any, deadline_ms: Optional[float] = None, **kw
+    ) -> List["Segment"]:
+        """Async version of `submit`; cancelling drops a queued request."""
+        return await asyncio.wrap_future(self.submit(audio, deadline_ms, **kw))
+
+    def _dispatch(self) -> None:
+        while True:
+            # wait for a free worker first, so requests keep joining the
+            # queue while all workers are busy
+            self._slots.acquire()
+            with self._cond:
+                while not self._heap and not self._closed:
+                    self._cond.wait()
+                if not self._heap:
+                    self._slots.release()
+                    return
+
+                oldest = min(request.submitted for request in self._heap)
+                until = min(oldest + self.max_wait, self._heap[0].deadline)
+                while len(self._heap) < self.max_batch and not self._closed:
+                    remaining = until - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                batch = self._take()
+            self._pool.submit(self._run, batch)
+
+    def _take(self) -> List[_Request]:
+        head = heapq.heappop(self._heap)
+        batch, rest = [head], []
+        while self._heap and len(batch) < self.max_batch:
+            request = heapq.heappop(self._heap)
+            (batch if request.key == head.key else rest).append(request)
+        for request in rest:
+            heapq.heappush(self._heap, request)
+        return batch
+
+    def _run(self, batch: List[_Request]) -> None:
+        try:
+            batch = [r for r in batch if r.future.set_running_or_notify_cancel()]
+            if not batch:
+                return
+            metrics = self.stt.metrics
+            if metrics is not None:
+                now = time.monotonic()
+                for request in batch:
+                    metrics.observe("queue_wait_seconds", now - request.submitted)
+                metrics.observe("batch_size", len(batch))
+
+            try:
+                results = self.stt.recognize_batch(
+                    [request.audio for request in batch],
+                    batch_size=len(batch),
+                    return_segments=True,
+                    **batch[0].kw,
+                )
+            except Exception as e:
+                for request in batch:
+                    request.future.set_exception(e)
+                return
+            for request, segments in zip(batch, results):
+                request.future.set_result(segments)
+        finally:
+            self._slots.release()
+
+    def close(self, wait: bool = True) -> None:
+        """Finish queued requests and stop the scheduler threads."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        if wait:
+            self._thread.join()
+        self._pool.shutdown(wait=wait)
+
+    def __enter__(self) -> "MicroBatchScheduler":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
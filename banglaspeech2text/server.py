@@ -0,0 +1,187 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict
+import time
+from typing import TYPE_CHECKING, Any
+import logging
+
+from banglaspeech2text.metrics import Metrics, TimedFeatureExtractor
+from banglaspeech2text.scheduler import MicroBatchScheduler
+
+if TYPE_CHECKING:
+    from aiohttp import web  # type: ignore
+    from banglaspeech2text.speech2text import Speech2Text
+
+# Get a child logger that inherits from the main logger
+logger = logging.getLogger("BanglaSpeech2Text.server")
+
+OPENMETRICS_CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+
+def _segment_dict(segment: Any) -> dict:
+    return {"start": segment.start, "end": segment.end, "text": segment.text}
+
+
+def create_app(
+    stt: "Speech2Text",
+    batch_window_ms: float = 10.0,
+    max_batch: int = 8,
+) -> "web.Application":
+    """
+    Build the aiohttp application serving one loaded model.
+
+    Routes:
+        POST /transcribe: audio file as the request body or a multipart
+            "file" field; returns the text and segments as JSON. The
+            `language` and `task` query parameters are decoding options, the
+            `deadline_ms` query parameter puts a request ahead of bulk
+            traffic, `vocabulary` names a vocabulary registered with
+            `stt.set_vocabulary`
+        GET /stream: WebSocket taking 16 kHz mono 16-bit PCM as binary
+            messages; sends partial and final segments as JSON, send the
+            text message "end" to finish the utterance
+        GET /health: model name and status
+        GET /metrics: OpenMetrics text
+
+    Args:
+        stt: Model shared by all requests
+        batch_window_ms: Time to wait for more uploads to batch together
+        max_batch: Maximum uploads per batch
+
+    Returns:
+        web.Application: Run it with `aiohttp.web.run_app`
+    """
+    from aiohttp import WSMsgType, web  # type: ignore
+    from faster_whisper.tokenizer import _LANGUAGE_CODES
+
+    if stt.metrics is None:
+        stt.metrics = Metrics()
+        # Speech2Text only times feature extraction when built with metrics
+        stt.feature_extractor = TimedFeatureExtractor(
+            stt.feature_extractor, stt.metrics
+        )
+    executor = ThreadPoolExecutor(max(1, stt.num_workers), thread_name_prefix="bnstt")
+    scheduler = MicroBatchScheduler(stt, batch_window_ms, max_batch)
+    started = time.time()
+
+    def _check_options(kw: dict) -> None:
+        # bad options would otherwise fail inside the model and become a 500
+        if "language" in kw and kw["language"] not in _LANGUAGE_CODES:
+            raise web.HTTPBadRequest(text=f"unknown language {kw['language']!r}")
+        if "task" in kw and kw["task"] not in ("transcribe", "translate"):
+            raise web.HTTPBadRequest(
+                text=f"task must be 'transcribe' or 'translate', not {kw['task']!r}"
+            )
+        if "vocabulary" in kw and kw["vocabulary"] not in stt.vocabularies:
+            raise web.HTTPBadRequest(text=f"unknown vocabulary {kw['vocabulary']!r}")
+
+    async def transcribe(request: "web.Request") -> "web.Response":
+        if request.content_type.startswith("multipart/"):
+            form = await request.post()
+            upload = form.get("file")
+            if upload is None or not hasattr(upload, "file"):
+                raise web.HTTPBadRequest(text="missing multipart field 'file'")
+            data = upload.file.read()
+        else:
+            data = await request.read()
+        if not data:
+            raise web.HTTPBadRequest(text="empty request body")
+
+        kw = {}
+        for key in ("language", "task", "vocabulary"):
+            if key in request.query:
+                kw[key] = request.query[key]
+        _check_options(kw)
+        deadline_ms = None
+        if "deadline_ms" in request.query:
+            try:
+                deadline_ms = float(request.query["deadline_ms"])
+            except ValueError:
+                raise web.HTTPBadRequest(text="deadline_ms must be a number")
+
+        loop = asyncio.get_running_loop()
+        start = time.perf_counter()
+        try:
+            audio = await loop.run_in_executor(None, stt._load_array, data)
+        except Exception as e:
+            raise web.HTTPBadRequest(text=f"could not decode audio: {e}")
+        segments = await scheduler.asubmit(audio, deadline_ms, **kw)
+        stt.metrics.observe("http_request_seconds", time.perf_counter() - start)
+
+        return web.json_response(
+            {
+                "text": "".join(segment.text for segment in segments),
+                "duration": audio.shape[0] / stt.feature_extractor.sampling_rate,
+                "segments": [_segment_dict(segment) for segment in segments],
+            }
+        )
+
+    async def stream(request: "web.Request") -> "web.WebSocketResponse":
+        kw = {
+            key: request.query[key]
+            for key in ("language", "vocabulary")
+            if key in request.query
+        }
+        # before the handshake, so the client gets a 400 and not a dropped socket
+        _check_options(kw)
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        session = stt.stream(**kw)
+        loop = asyncio.get_running_loop()
+
+        async def send(segments):
+            for segment in segments:
+                await ws.send_json(asdict(segment))
+
+        async for msg in ws:
+            if msg.type == WSMsgType.BINARY:
+                await send(await loop.run_in_executor(executor, session.feed, msg.data))
+            elif msg.type == WSMsgType.TEXT and msg.data.strip() == "end":
+                await send(await loop.run_in_executor(executor, session.flush))
+            elif msg.type == WSMsgType.ERROR:
+                break
+        if not ws.closed:
+            await ws.close()
+        return ws
+
+    async def health(request: "web.Request") -> "web.Response":
+        return web.json_response(
+            {
+                "status": "ok",
+                "model": str(stt.model_path),
+                "uptime": time.time() - started,
+            }
+        )
+
+    async def metrics(request: "web.Request") -> "web.Response":
+        response = web.Response(text=stt.metrics.render())
+        response.headers["Content-Type"] = OPENMETRICS_CONTENT_TYPE
+        return response
+
+    async def on_cleanup(app):
+        scheduler.close(wait=False)
+        executor.shutdown(wait=False)
+
+    app = web.Application(client_max_size=1024**3)
+    app.add_routes(
+        [
+            web.post("/transcribe", transcribe),
+            web.get("/stream", stream),
+            web.get("/health", health),
+            web.get("/metrics", metrics),
+        ]
+    )
+    app.on_cleanup.append(on_cleanup)
+    return app
+
+
+def serve(
+    stt: "Speech2Text",
+    host: str = "127.0.0.1",
+    port: int = 8000,
+    **kwargs,
+) -> None:
+    """Serve `stt` until interrupted. See `create_app` for the routes."""
+    from aiohttp import web  # type: ignore
+
+    web.run_app(create_app(stt, **kwargs), host=host, port=port)
@@ -1,21 +1,99 @@
 from io import BytesIO
 from pathlib import Path
-import random
-from typing import Any, BinaryIO, Iterable, Literal, Optional, Union, overload
+import time
+import uuid
+from dataclasses import fields
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterator,
+    BinaryIO,
+    Iterable,
+    List,
+    Literal,
+    Optional,
+    Sequence,
+    Union,
+    overload,
+)
 import logging
-from faster_whisper import WhisperModel
-from faster_whisper.transcribe import Segment
+import ctranslate2
+import numpy as np
+from faster_whisper import BatchedInferencePipeline, WhisperModel
+from faster_whisper.audio import decode_audio, pad_or_trim
+from faster_whisper.tokenizer import Tokenizer
+from faster_whisper.transcribe import (
+    Segment,
+    TranscriptionOptions,
+    Word,
+    get_suppressed_tokens,
+    restore_speech_timestamps,
+)
 from numpy import ndarray
+from banglaspeech2text.features import (
+    AudioFeatures,
+    CachingFeatureExtractor,
+    FeatureCache,
+)
+from banglaspeech2text.metrics import Metrics, TimedFeatureExtractor
+from banglaspeech2text.result import Transcript
+from banglaspeech2text.streaming import StreamingSession
+from banglaspeech2text.utils.audio import load_audio, load_batch
+from banglaspeech2text.utils.cache import TranscriptionCache, audio_hash
 from banglaspeech2text.utils.converter import get_ct2_model_path
 from banglaspeech2text.utils.helpers import get_app_temp_dir
 from banglaspeech2text.utils.models import BanglaASRModels, ModelMetadata
-import torch
+from banglaspeech2text.utils.vad import VadFilter
+from banglaspeech2text.vocabulary import Vocabulary, VocabularyRegistry
+
+if TYPE_CHECKING:
+    from banglaspeech2text.aio import AsyncRecognizer
 
 # Get a child logger that inherits from the main logger
 logger = logging.getLogger("BanglaSpeech2Text.speech2text")
 
+APPEND_PUNCTUATIONS = "\"'.。,，!！?？:：”)]}、।"
+
+# Defaults used for batched decoding, same as `BatchedInferencePipeline.transcribe`
+BATCH_DEFAULTS = dict(
+    beam_size=5,
+    best_of=5,
+    patience=1,
+    length_penalty=1,
+    repetition_penalty=1,
+    no_repeat_ngram_size=0,
+    log_prob_threshold=-1.0,
+    no_speech_threshold=0.6,
+    compression_ratio_threshold=2.4,
+    condition_on_previous_text=False,
+    prompt_reset_on_temperature=0.5,
+    temperatures=[0.0],
+    initial_prompt=None,
+    prefix=None,
+    suppress_blank=True,
+    suppress_tokens=[-1],
+    without_timestamps=True,
+    max_initial_timestamp=0.0,
+    word_timestamps=False,
+    prepend_punctuations="\"'“¿([{-",
+    append_punctuations=APPEND_PUNCTUATIONS,
+    multilingual=False,
+    max_new_tokens=None,
+    clip_timestamps="0",
+    hallucination_silence_threshold=None,
+    hotwords=None,
+)
+
+
+def default_compute_type() -> str:
+    """Compute type used when `compute_type="default"`."""
+    return "float16" if ctranslate2.get_cuda_device_count() > 0 else "int8"
+
 
 class Speech2Text(WhisperModel):
+    _registry = None
+    _aio = None
+
     def __init__(
         self,
         model_size_or_path: str = "large",
@@ -25,24 +103,45 @@ class Speech2Text(WhisperModel):
         cpu_threads=0,
         num_workers=1,
         skip_conversion=False,
+        use_temp_files=False,
+        cache: Union[bool, TranscriptionCache, None] = None,
+        vad: Union[bool, VadFilter, None] = None,
+        metrics: Optional[Metrics] = None,
+        feature_cache: Union[bool, FeatureCache, None] = None,
+        vocabularies: Optional[VocabularyRegistry] = None,
         ct_kwargs: Optional[dict] = None,
         **kwargs,
     ):
+        self.use_temp_files = use_temp_files
+        self.vocabularies = vocabularies or VocabularyRegistry()
+        self.cache = TranscriptionCache() if cache is True else (cache or None)
+        self.feature_cache = (
+            FeatureCache() if feature_cache is True else (feature_cache or None)
+        )
+        self.vad = VadFilter() if vad is True else (vad or None)
+        self.metrics = metrics
         self.model_metadata = ModelMetadata(model_size_or_path)
         logger.info(f"Initializing Speech2Text with model: {model_size_or_path}")
 
         if compute_type == "default":
-            compute_type = "float16" if torch.cuda.is_available() else "int8"
+            compute_type = default_compute_type()
             logger.info(f"Using compute type: {compute_type}")
 
+        self.compute_type = compute_type
+        self.num_workers = num_workers
+
         self.model_path = model_size_or_path
         if not skip_conversion:
+            start = time.perf_counter()
             self.model_path = get_ct2_model_path(
                 self.model_metadata.raw_name,
                 self.model_metadata.cache_path,
                 compute_type,
             )
+            if metrics is not None:
+                metrics.observe("conversion_seconds", time.perf_counter() - start)
 
+        start = time.perf_counter()
         super().__init__(
             self.model_path,
             device,
@@ -53,6 +152,15 @@ class Speech2Text(WhisperModel):
             **kwargs,
             **(ct_kwargs or {}),
         )
+        self._features = CachingFeatureExtractor(
+            self.feature_extractor, self.feature_cache
+        )
+        self.feature_extractor = self._features
+        if metrics is not None:
+            metrics.observe("model_load_seconds", time.perf_counter() - start)
+            self.feature_extractor = TimedFeatureExtractor(
+                self.feature_extractor, metrics
+            )
 
     @overload
     def recognize(
@@ -86,20 +194,532 @@ class Speech2Text(WhisperModel):
 
         if "language" not in kw:
             kw["language"] = "bn"
+        kw = self._apply_vocabulary(kw)
 
-        audio = self._preprocess(audio)
-        segments, _ = self.transcribe(
-            audio, append_punctuations="\"'.。,，!！?？:：”)]}、।", **kw
-        )
+        if isinstance(audio, AudioFeatures):
+            start = time.perf_counter()
+            segments = self._transcribe_features(audio, **kw)
+            if self.metrics is not None:
+                segments = self._observe_segments(segments, start, audio.duration)
+        elif self.metrics is not None:
+            segments = self._recognize_timed(audio, **kw)
+        elif self.cache is not None:
+            segments = self._recognize_cached(audio, **kw)
+        else:
+            audio = self._preprocess(audio)
+            segments = self._transcribe(audio, **kw)
 
         if return_segments:
             return segments
         else:
             return "".join([segment.text for segment in segments])
 
+    def set_vocabulary(
+        self, name: str, terms: Union[Vocabulary, Iterable[str]]
+    ) -> Vocabulary:
+        """
+        Add or replace a named vocabulary, e.g. the domain terms of a tenant.
+
+        The terms are tokenized right away, so requests using it pay nothing
+        extra. Use it with `recognize(audio, vocabulary=name)`.
+
+        Args:
+            name: Vocabulary name
+            terms: Words or phrases, or a `Vocabulary`
+
+        Returns:
+            Vocabulary: The stored vocabulary
+        """
+        vocabulary = self.vocabularies.set(name, terms)
+        vocabulary.tokens(self.hf_tokenizer)
+        return vocabulary
+
+    def _apply_vocabulary(self, kw: dict) -> dict:
+        # `vocabulary` is a registered name, a Vocabulary or a list of terms;
+        # it becomes pre-tokenized hotwords, see get_prompt
+        vocabulary = kw.pop("vocabulary", None)
+        if vocabulary is None:
+            return kw
+        if isinstance(vocabulary, str):
+            try:
+                vocabulary = self.vocabularies.get(vocabulary)
+            except KeyError:
+                raise ValueError(f"Unknown vocabulary: {vocabulary!r}") from None
+        elif not isinstance(vocabulary, Vocabulary):
+            vocabulary = Vocabulary(vocabulary)
+        tokens = vocabulary.tokens(self.hf_tokenizer)
+        if tokens and kw.get("hotwords") is None:
+            kw["hotwords"] = tokens
+        return kw
+
+    def extract_features(
+        self, audio: Any, chunk_length: Optional[int] = None
+    ) -> AudioFeatures:
+        """
+        Compute the log-mel features of audio once, to decode them many times.
+
+        `recognize` and `recognize_result` accept the result and skip
+        decoding the audio, the VAD stage and the spectrogram, e.g. for
+        decoding with several beam sizes, prompts or temperatures.
+
+        Args:
+            audio: Anything `recognize` accepts
+            chunk_length: Window length in seconds, if decoding will use a
+                non-default `chunk_length`
+
+        Returns:
+            AudioFeatures: Waveform, spectrogram and content hash
+        """
+        audio = self._load_array(audio)
+        sampling_rate = self.feature_extractor.sampling_rate
+        n_mels = self.feature_extractor.mel_filters.shape[0]
+        features = AudioFeatures(
+            audio=audio,
+            mel=np.zeros((n_mels, 0), dtype=np.float32),
+            key=audio_hash(audio),
+            duration=audio.shape[0] / sampling_rate,
+            chunk_length=chunk_length,
+        )
+        if self.vad is not None:
+            features.audio, features.chunks = self._apply_vad(audio)
+            if not features.chunks:
+                return features
+        features.mel = self.feature_extractor(features.audio, chunk_length=chunk_length)
+        return features
+
+    def recognize_result(
+        self, audio: Any, word_timestamps: bool = True, **kw
+    ) -> Transcript:
+        """
+        Recognize audio into a `Transcript` with word timings and probabilities.
+
+        Args:
+            audio: Anything `recognize` accepts
+            word_timestamps: Also align every word (slower)
+            **kw: Decoding options
+
+        Returns:
+            Transcript: Segment and word columns; export with `to_json`,
+                `to_srt`, `to_vtt` or `to_arrow`
+        """
+        segments = self.recognize(
+            audio, return_segments=True, word_timestamps=word_timestamps, **kw
+        )
+        return Transcript.from_segments(segments)
+
+    def _recognize_cached(self, audio: Any, **kw) -> List[Segment]:
+        audio = self._load_array(audio)
+        options = dict(kw, vad=repr(self.vad)) if self.vad is not None else kw
+        key = TranscriptionCache.make_key(
+            audio, self.model_metadata.raw_name, self.compute_type, **options
+        )
+        segments = self.cache.get(key)
+        if segments is None:
+            segments = list(self._transcribe(audio, **kw))
+            self.cache.put(key, segments)
+        return segments
+
+    def _recognize_timed(self, audio: Any, **kw) -> Iterable[Segment]:
+        start = time.perf_counter()
+        with self.metrics.time("stage_seconds", stage="preprocess"):
+            audio = self._preprocess(audio)
+        if not isinstance(audio, ndarray):
+            with self.metrics.time("stage_seconds", stage="decode_audio"):
+                audio = decode_audio(
+                    audio, sampling_rate=self.feature_extractor.sampling_rate
+                )
+        duration = audio.shape[0] / self.feature_extractor.sampling_rate
+
+        if self.cache is not None:
+            segments = self._recognize_cached(audio, **kw)
+            self._observe_request(start, duration)
+            return segments
+
+        segments = self._transcribe(audio, **kw)
+        return self._observe_segments(segments, start, duration)
+
+    def _transcribe(
+        self, audio: Union[str, BinaryIO, ndarray], **kw
+    ) -> Iterable[Segment]:
+        if self.vad is None:
+            segments, _ = self.transcribe(
+                audio, append_punctuations=APPEND_PUNCTUATIONS, **kw
+            )
+            return segments
+
+        sampling_rate = self.feature_extractor.sampling_rate
+        if not isinstance(audio, ndarray):
+            audio = decode_audio(audio, sampling_rate=sampling_rate)
+        speech, chunks = self._apply_vad(audio)
+        if not chunks:
+            return []
+        segments, _ = self.transcribe(
+            speech, append_punctuations=APPEND_PUNCTUATIONS, **kw
+        )
+        return restore_speech_timestamps(segments, chunks, sampling_rate)
+
+    def _transcribe_features(self, features: AudioFeatures, **kw) -> Iterable[Segment]:
+        if features.chunks is not None and not features.chunks:
+            return []
+        kw.setdefault("chunk_length", features.chunk_length)
+        # features are computed while transcribe() runs, not while iterating
+        with self._features.use(features):
+            segments, _ = self.transcribe(
+                features.audio, append_punctuations=APPEND_PUNCTUATIONS, **kw
+            )
+        if features.chunks is None:
+            return segments
+        return restore_speech_timestamps(
+            segments, features.chunks, self.feature_extractor.sampling_rate
+        )
+
+    def _apply_vad(self, audio: ndarray):
+        sampling_rate = self.feature_extractor.sampling_rate
+        if self.metrics is None:
+            return self.vad.apply(audio, sampling_rate)
+        with self.metrics.time("stage_seconds", stage="vad"):
+            speech, chunks = self.vad.apply(audio, sampling_rate)
+        self.metrics.observe(
+            "vad_skipped_seconds", (audio.shape[0] - speech.shape[0]) / sampling_rate
+        )
+        return speech, chunks
+
+    def _observe_segments(
+        self, segments: Iterable[Segment], start: float, duration: float
+    ) -> Iterable[Segment]:
+        # decoding happens while the segments are iterated
+        yield from segments
+        self._observe_request(start, duration)
+
+    def _observe_request(self, start: float, duration: float) -> None:
+        elapsed = time.perf_counter() - start
+        self.metrics.observe("request_seconds", elapsed)
+        self.metrics.observe("audio_seconds", duration)
+        if duration:
+            self.metrics.observe("rtf", elapsed / duration)
+        self.metrics.inc("requests")
+
+    def encode(self, features: ndarray) -> ctranslate2.StorageView:
+        if self.metrics is None:
+            return super().encode(features)
+        with self.metrics.time("stage_seconds", stage="encode"):
+            return super().encode(features)
+
+    def get_prompt(
+        self,
+        tokenizer: Tokenizer,
+        previous_tokens: List[int],
+        without_timestamps: bool = False,
+        prefix: Optional[str] = None,
+        hotwords: Union[str, Sequence[int], None] = None,
+    ) -> List[int]:
+        if hotwords is None or isinstance(hotwords, str):
+            return super().get_prompt(
+                tokenizer, previous_tokens, without_timestamps, prefix, hotwords
+            )
+
+        # hotwords already tokenized by a Vocabulary, laid out like faster-whisper
+        # lays out text hotwords: <|startofprev|> hotwords previous_tokens.
+        # Unlike text hotwords they are kept when a prefix is given, because
+        # streaming passes the stable words of a partial as the prefix.
+        prompt = super().get_prompt(
+            tokenizer, previous_tokens, without_timestamps, prefix
+        )
+        if not hotwords:
+            return prompt
+        hotwords = list(hotwords)
+        if len(hotwords) >= self.max_length // 2:
+            hotwords = hotwords[: self.max_length // 2 - 1]
+        if previous_tokens:
+            return prompt[:1] + hotwords + prompt[1:]
+        return [tokenizer.sot_prev] + hotwords + prompt
+
+    def generate_with_fallback(self, encoder_output, prompt, tokenizer, options):
+        if self.metrics is None:
+            return super().generate_with_fallback(
+                encoder_output, prompt, tokenizer, options
+            )
+        with self.metrics.time("stage_seconds", stage="decode"):
+            output = super().generate_with_fallback(
+                encoder_output, prompt, tokenizer, options
+            )
+        self.metrics.inc("tokens", len(output[0].sequences_ids[0]))
+        return output
+
+    @property
+    def aio(self) -> "AsyncRecognizer":
+        """
+        The `AsyncRecognizer` used by `arecognize` and `arecognize_stream`.
+
+        It is created on first use with one slot per CTranslate2 worker.
+        Assign your own `AsyncRecognizer(stt, max_concurrency=...)` to change
+        the limits.
+        """
+        if self._aio is None:
+            from banglaspeech2text.aio import AsyncRecognizer
+
+            self._aio = AsyncRecognizer(self)
+        return self._aio
+
+    @aio.setter
+    def aio(self, value: "AsyncRecognizer") -> None:
+        self._aio = value
+
+    async def arecognize(
+        self, audio: Any, return_segments: bool = False, **kw
+    ) -> Union[List[Segment], str]:
+        """
+        Async version of `recognize` that runs on a worker thread.
+
+        Args:
+            audio: Anything `recognize` accepts
+            return_segments: Return a list of segments instead of text
+            **kw: Decoding options
+
+        Returns:
+            str or list: Text, or segments if `return_segments` is True
+        """
+        return await self.aio.recognize(audio, return_segments, **kw)
+
+    def arecognize_stream(self, audio: Any, **kw) -> AsyncIterator[Segment]:
+        """
+        Transcribe on a worker thread and yield segments as they are decoded.
+
+        Use with `async for`; leaving the loop early or cancelling the task
+        stops decoding.
+        """
+        return self.aio.recognize_stream(audio, **kw)
+
+    def stream(self, **kw) -> StreamingSession:
+        """
+        Start a streaming session for live audio.
+
+        Args:
+            **kw: `StreamingSession` options (step_s, window_s, min_silence_ms,
+                vad_threshold, context_tokens, sampling_rate) and decoding
+                options
+
+        Returns:
+            StreamingSession: Feed it PCM chunks with `feed(chunk)`
+        """
+        return StreamingSession(self, **kw)
+
+    def recognize_long(
+        self,
+        audio: Any,
+        return_segments: bool = False,
+        max_chunk_s: float = 30.0,
+        workers: Optional[int] = None,
+        **kw,
+    ) -> Union[List[Segment], str]:
+        """
+        Recognize a long recording by splitting it at silences.
+
+        The audio is split with Silero VAD into chunks of at most
+        `max_chunk_s` seconds, the chunks are decoded concurrently and the
+        segments are joined with timestamps relative to the whole recording.
+        Create the model with `num_workers=N` (and `cpu_threads` set to
+        cores / N) so N chunks run on separate CTranslate2 replicas.
+
+        Args:
+            audio: Anything `recognize` accepts
+            return_segments: Return segments instead of text
+            max_chunk_s: Maximum chunk length in seconds
+            workers: Chunks decoded at once, defaults to `num_workers`
+            **kw: `transcribe_long` options (overlap_s, vad_threshold,
+                min_silence_ms) and decoding options
+
+        Returns:
+            str or list: Text, or segments if `return_segments` is True
+        """
+        from banglaspeech2text.longform import transcribe_long
+
+        segments = transcribe_long(
+            self, self._load_array(audio), max_chunk_s, workers=workers, **kw
+        )
+        if return_segments:
+            return segments
+        return "".join(segment.text for segment in segments)
+
+    def recognize_batch(
+        self,
+        audios: List[Any],
+        batch_size: int = 8,
+        return_segments: bool = False,
+        **kw,
+    ) -> List[Union[List[Segment], str]]:
+        """
+        Recognize many short clips with batched encoder and decoder calls.
+
+        The clips are decoded up front, sorted by length so clips with similar
+        decode lengths share a batch, and returned in input order. Clips longer
+        than the model window (30 s) are handled one by one by `recognize`.
+
+        Results are looked up in and stored to the transcription `cache`, apart
+        from those of `recognize` (batched decoding uses other defaults). With
+        `metrics`, the batch time and decoded tokens are recorded, but not the
+        per-request latency and real-time factor, since clips decoded together
+        have no time of their own.
+
+        Args:
+            audios: List of audio inputs, anything `recognize` accepts
+            batch_size: Number of clips per CTranslate2 call
+            return_segments: Return a list of segments per clip instead of text
+            **kw: Decoding options (language, task, beam_size, temperature, ...)
+
+        Returns:
+            list: One text (or list of segments) per input clip
+        """
+        if "language" not in kw:
+            kw["language"] = "bn"
+        kw = self._apply_vocabulary(kw)
+
+        if not self.use_temp_files:
+            audios = load_batch(audios)
+        arrays = [self._load_array(audio) for audio in audios]
+        results: List[Any] = [None] * len(arrays)
+
+        window = self.feature_extractor.n_samples
+        short = [i for i, audio in enumerate(arrays) if audio.shape[0] <= window]
+        for i, audio in enumerate(arrays):
+            if audio.shape[0] > window:
+                results[i] = list(self.recognize(audio, return_segments=True, **kw))
+
+        keys = {}
+        if self.cache is not None:
+            options = dict(kw, batched=True)
+            if self.vad is not None:
+                options["vad"] = repr(self.vad)
+            model = self.model_metadata.raw_name
+            for i in short:
+                keys[i] = TranscriptionCache.make_key(
+                    arrays[i], model, self.compute_type, **options
+                )
+                results[i] = self.cache.get(keys[i])
+            short = [i for i in short if results[i] is None]
+
+        chunks = {}
+        if self.vad is not None:
+            for i in short:
+                arrays[i], chunks[i] = self._apply_vad(arrays[i])
+                if not chunks[i]:
+                    results[i] = []
+            short = [i for i in short if chunks[i]]
+
+        tokenizer = Tokenizer(
+            self.hf_tokenizer,
+            self.model.is_multilingual,
+            task=kw.pop("task", "transcribe"),
+            language=kw.pop("language"),
+        )
+        options = self._batch_options(tokenizer, **kw)
+        pipeline = BatchedInferencePipeline(self)
+        sampling_rate = self.feature_extractor.sampling_rate
+
+        order = sorted(short, key=lambda i: arrays[i].shape[0])
+        for start in range(0, len(order), batch_size):
+            idx = order[start : start + batch_size]
+            features = np.stack(
+                [pad_or_trim(self.feature_extractor(arrays[i])[..., :-1]) for i in idx]
+            )
+            metadata = [
+                {"offset": 0.0, "duration": arrays[i].shape[0] / sampling_rate}
+                for i in idx
+            ]
+            pipeline.last_speech_timestamp = 0.0
+            start_time = time.perf_counter()
+            outputs = pipeline.forward(features, tokenizer, metadata, options)
+            if self.metrics is not None:
+                # encoding is recorded separately by `encode`
+                self.metrics.observe(
+                    "stage_seconds", time.perf_counter() - start_time, stage="batch"
+                )
+                self.metrics.inc(
+                    "tokens",
+                    sum(len(s["tokens"]) for output in outputs for s in output),
+                )
+            for i, output in zip(idx, outputs):
+                results[i] = [
+                    Segment(
+                        id=n,
+                        seek=segment["seek"],
+                        start=round(segment["start"], 3),
+                        end=round(segment["end"], 3),
+                        text=segment["text"],
+                        tokens=segment["tokens"],
+                        avg_logprob=segment["avg_logprob"],
+                        compression_ratio=segment["compression_ratio"],
+                        no_speech_prob=segment["no_speech_prob"],
+                        words=(
+                            [Word(**word) for word in segment["words"]]
+                            if options.word_timestamps
+                            else None
+                        ),
+                        temperature=options.temperatures[0],
+                    )
+                    for n, segment in enumerate(output, start=1)
+                ]
+
+        for i in short:
+            if i in chunks:
+                results[i] = list(
+                    restore_speech_timestamps(results[i], chunks[i], sampling_rate)
+                )
+        for i, key in keys.items():
+            if i in chunks or i in short:
+                self.cache.put(key, results[i])
+
+        if return_segments:
+            return results
+        return ["".join(segment.text for segment in segments) for segments in results]
+
+    def _batch_options(self, tokenizer: Tokenizer, **kw) -> TranscriptionOptions:
+        options = dict(BATCH_DEFAULTS)
+        if "temperature" in kw:
+            temperature = kw.pop("temperature")
+            options["temperatures"] = (
+                list(temperature[:1])
+                if isinstance(temperature, (list, tuple))
+                else [temperature]
+            )
+
+        valid = {f.name for f in fields(TranscriptionOptions)}
+        unknown = set(kw) - valid
+        if unknown:
+            raise TypeError(f"Unsupported batch decoding options: {sorted(unknown)}")
+        options.update(kw)
+
+        if options["suppress_tokens"]:
+            options["suppress_tokens"] = get_suppressed_tokens(
+                tokenizer, options["suppress_tokens"]
+            )
+        return TranscriptionOptions(**options)
+
+    def _load_array(self, audio: Any) -> ndarray:
+        audio = self._preprocess(audio)
+        if not isinstance(audio, ndarray):
+            audio = decode_audio(
+                audio, sampling_rate=self.feature_extractor.sampling_rate
+            )
+        return audio
+
     def _preprocess(self, audio: Any) -> Union[str, BinaryIO, ndarray]:
+        if self.use_temp_files:
+            return self._preprocess_to_file(audio)
+
+        if isinstance(audio, Path):
+            audio = str(audio)
+        else:
+            audio = load_audio(audio)
+
+        if not (isinstance(audio, str) or isinstance(audio, ndarray)):
+            raise ValueError("Invalid audio input")
+
+        return audio
+
+    def _preprocess_to_file(self, audio: Any) -> Union[str, BinaryIO, ndarray]:
         class_name = audio.__class__.__name__
-        temp_file = Path(get_app_temp_dir()) / f"{random.randint(0, 100000)}.wav"
+        temp_file = Path(get_app_temp_dir()) / f"{uuid.uuid4().hex}.wav"
         if class_name == "AudioData":  # from speech_recognition
             with temp_file.open("wb") as f:
                 f.write(audio.get_wav_data())
@@ -119,11 +739,7 @@ class Speech2Text(WhisperModel):
         if temp_file.exists():
             audio = str(temp_file)
 
-        if not (
-            isinstance(audio, str)
-            or isinstance(audio, ndarray)
-            or isinstance(audio, ndarray)
-        ):
+        if not (isinstance(audio, str) or isinstance(audio, ndarray)):
             raise ValueError("Invalid audio input")
 
         return audio
@@ -142,6 +758,32 @@ class Speech2Text(WhisperModel):
     def __str__(self):
         return f"Speech2Text(model_path={self.model_path})"
 
+    @classmethod
+    def get_shared(
+        cls,
+        model_size_or_path: str = "large",
+        compute_type: str = "default",
+        device: str = "auto",
+        **kwargs,
+    ) -> "Speech2Text":
+        """
+        Get a process-wide shared instance for this configuration.
+
+        Instances are pooled by (model, compute_type, device) and the other
+        arguments in `banglaspeech2text.registry.shared_models`, so services in one process
+        share a single loaded copy. Call `release()` when done with it.
+        """
+        from banglaspeech2text.registry import shared_models
+
+        return shared_models.get(
+            model_size_or_path, compute_type=compute_type, device=device, **kwargs
+        )
+
+    def release(self) -> None:
+        """Return a shared instance to the registry it came from."""
+        if self._registry is not None:
+            self._registry.release(self)
+
     @staticmethod
     def list_models():
         return BanglaASRModels()
@@ -0,0 +1,212 @@
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, List, Optional, Union
+import logging
+
+import numpy as np
+
+from banglaspeech2text.utils.audio import SAMPLING_RATE, pcm16_to_float32
+from banglaspeech2text.utils.frontend import StreamResampler
+
+if TYPE_CHECKING:
+    from banglaspeech2text.speech2text import Speech2Text
+
+# Get a child logger that inherits from the main logger
+logger = logging.getLogger("BanglaSpeech2Text.streaming")
+
+VAD_FRAME = 512  # samples per Silero VAD frame (32 ms at 16 kHz)
+
+
+@dataclass
+class StreamingSegment:
+    """A partial or final hypothesis emitted by a streaming session."""
+
+    text: str
+    start: float
+    end: float
+    is_final: bool
+
+
+def _common_prefix(a: List[str], b: List[str]) -> List[str]:
+    n = 0
+    for x, y in zip(a, b):
+        if x != y:
+            break
+        n += 1
+    return a[:n]
+
+
+class StreamingSession:
+    """
+    Incremental transcription over a live PCM stream.
+
+    Feed mono audio with `feed`; every call returns the segments that became
+    available. Audio at another `sampling_rate` (8 kHz telephony, 44.1 or
+    48 kHz capture) is resampled to 16 kHz chunk by chunk. Silero VAD decides
+    where an utterance ends: once the speaker has been silent for
+    `min_silence_ms` the buffered utterance is decoded one last time and
+    emitted as final. While speech is ongoing a partial hypothesis is emitted
+    every `step_s` seconds of new audio.
+
+    Decoding work is bounded in two ways. The buffer never holds more than
+    `window_s` seconds; longer utterances are finalised early. Words that two
+    consecutive partials agree on are passed back as the decoder `prefix`, so
+    they are scored in one forward pass instead of being generated again, and
+    the text of finished utterances is passed as the prompt for the next one.
+    """
+
+    def __init__(
+        self,
+        stt: "Speech2Text",
+        step_s: float = 0.5,
+        window_s: float = 15.0,
+        min_silence_ms: int = 500,
+        vad_threshold: float = 0.5,
+        context_tokens: int = 64,
+        sampling_rate: int = SAMPLING_RATE,
+        **kw,
+    ):
+        if not 0 < window_s <= 30:
+            raise ValueError("window_s must be between 0 and 30 seconds")
+
+        self.stt = stt
+        self.step_samples = int(step_s * SAMPLING_RATE)
+        self.window_samples = int(window_s * SAMPLING_RATE)
+        self.min_silence_frames = max(
+            1, int(min_silence_ms * SAMPLING_RATE / 1000) // VAD_FRAME
+        )
+        self.vad_threshold = vad_threshold
+        self.context_tokens = context_tokens
+        self._resampler = (
+            StreamResampler(sampling_rate) if sampling_rate != SAMPLING_RATE else None
+        )
+
+        kw.setdefault("language", "bn")
+        kw.setdefault("beam_size", 1)
+        kw.setdefault("temperature", 0.0)
+        if "vocabulary" in kw:
+            kw = stt._apply_vocabulary(kw)
+        self.kw = kw
+
+        self._buffer = np.zeros(0, dtype=np.float32)
+        self._offset = 0.0  # stream time of the first buffered sample
+        self._scored = 0  # buffered samples already run through the VAD
+        self._has_speech = False
+        self._silent_frames = 0
+        self._since_decode = 0
+        self._last_words: List[str] = []
+        self._stable: List[str] = []
+        self._context: List[int] = []
+
+    def feed(self, chunk: Union[bytes, np.ndarray]) -> List[StreamingSegment]:
+        """
+        Add audio to the stream.
+
+        Args:
+            chunk: 16-bit PCM bytes or a float32 array, mono at the
+                session's `sampling_rate`
+
+        Returns:
+            list: Partial and final segments produced by this chunk
+        """
+        if isinstance(chunk, (bytes, bytearray, memoryview)):
+            chunk = pcm16_to_float32(bytes(chunk))
+        if self._resampler is not None:
+            chunk = self._resampler.feed(chunk)
+        self._buffer = np.concatenate(
+            (self._buffer, chunk.astype(np.float32, copy=False))
+        )
+        self._since_decode += chunk.shape[0]
+        self._update_vad()
+
+        if not self._has_speech:
+            self._drop_silence()
+            return []
+
+        if self._silent_frames >= self.min_silence_frames:
+            return [self._finalize()]
+        if self._buffer.shape[0] >= self.window_samples:
+            return [self._finalize()]
+        if self._since_decode >= self.step_samples:
+            return [self._partial()]
+        return []
+
+    def flush(self) -> List[StreamingSegment]:
+        """Finalize whatever speech is still buffered, e.g. at end of stream."""
+        if self._resampler is not None:
+            self._buffer = np.concatenate((self._buffer, self._resampler.flush()))
+        if not self._has_speech:
+            return []
+        return [self._finalize()]
+
+    def _update_vad(self) -> None:
+        from faster_whisper.vad import get_vad_model
+
+        size = self._buffer.shape[0]
+        end = size - (size - self._scored) % VAD_FRAME
+        if end <= self._scored:
+            return
+
+        # the Silero model zeroes the end of its input in place, so it must not
+        # see a view of the buffer that is decoded later
+        block = np.array(self._buffer[self._scored : end], copy=True)
+        probs = get_vad_model()(block)
+        self._scored = end
+        probs = np.asarray(probs).reshape(-1)
+        for prob in probs:
+            if prob >= self.vad_threshold:
+                self._has_speech = True
+                self._silent_frames = 0
+            else:
+                self._silent_frames += 1
+
+    def _drop_silence(self) -> None:
+        # keep a little leading context so the first word is not clipped
+        keep = self.min_silence_frames * VAD_FRAME
+        drop = self._scored - keep
+        if drop > 0:
+            self._buffer = self._buffer[drop:]
+            self._scored -= drop
+            self._offset += drop / SAMPLING_RATE
+            self._since_decode = 0
+
+    def _decode(self, prefix: Optional[List[str]]) -> str:
+        segments, _ = self.stt.transcribe(
+            self._buffer,
+            initial_prompt=self._context or None,
+            prefix=" ".join(prefix) if prefix else None,
+            condition_on_previous_text=False,
+            without_timestamps=True,
+            vad_filter=False,
+            **self.kw,
+        )
+        text = "".join(segment.text for segment in segments)
+        if prefix:
+            text = " " + " ".join(prefix) + text
+        return text
+
+    def _partial(self) -> StreamingSegment:
+        self._since_decode = 0
+        text = self._decode(self._stable)
+        words = text.split()
+        self._stable = _common_prefix(words, self._last_words)
+        self._last_words = words
+        end = self._offset + self._buffer.shape[0] / SAMPLING_RATE
+        return StreamingSegment(text, self._offset, end, is_final=False)
+
+    def _finalize(self) -> StreamingSegment:
+        text = self._decode(self._stable)
+        end = self._offset + self._buffer.shape[0] / SAMPLING_RATE
+        segment = StreamingSegment(text, self._offset, end, is_final=True)
+
+        tokens = self.stt.hf_tokenizer.encode(text, add_special_tokens=False).ids
+        self._context = (self._context + tokens)[-self.context_tokens :]
+
+        self._buffer = np.zeros(0, dtype=np.float32)
+        self._offset = end
+        self._scored = 0
+        self._has_speech = False
+        self._silent_frames = 0
+        self._since_decode = 0
+        self._last_words = []
+        self._stable = []
+        return segment
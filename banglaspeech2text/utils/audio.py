@@ -0,0 +1,106 @@
+from io import BytesIO
+from typing import Any, List, Sequence
+import logging
+
+import numpy as np
+
+from banglaspeech2text.utils.frontend import (
+    decode_pcm,
+    decode_wav,
+    decode_wav_batch,
+)
+
+# Get a child logger that inherits from the main logger
+logger = logging.getLogger("BanglaSpeech2Text.audio")
+
+SAMPLING_RATE = 16000
+
+
+def pcm16_to_float32(data: bytes) -> np.ndarray:
+    """
+    Convert little-endian 16-bit PCM frames to a float32 waveform.
+
+    The frames are viewed with `np.frombuffer` (no copy); the only allocation
+    is the float32 output array.
+    """
+    pcm = np.frombuffer(data, dtype="<i2")
+    return pcm.astype(np.float32) / 32768.0
+
+
+def _is_wav(data: bytes) -> bool:
+    return data[:4] == b"RIFF" and data[8:12] == b"WAVE"
+
+
+def decode_in_memory(data: bytes, sampling_rate: int = SAMPLING_RATE) -> np.ndarray:
+    """
+    Decode encoded audio bytes to a mono float32 waveform without touching disk.
+
+    PCM and float WAV data at any rate and channel count is parsed, mixed
+    down and resampled by the NumPy front-end. Anything else is decoded and
+    resampled in memory by PyAV.
+    """
+    if _is_wav(data):
+        try:
+            return decode_wav(data, sampling_rate)
+        except ValueError as e:
+            logger.debug(f"Falling back to PyAV for WAV data: {e}")
+
+    from faster_whisper.audio import decode_audio
+
+    return decode_audio(BytesIO(data), sampling_rate=sampling_rate)
+
+
+def load_audio(audio: Any, sampling_rate: int = SAMPLING_RATE) -> Any:
+    """
+    Decode in-memory audio inputs to a 16 kHz float32 waveform.
+
+    Supports `bytes`, `BytesIO`, speech_recognition `AudioData` and pydub
+    `AudioSegment`. Other inputs (paths, numpy arrays) are returned unchanged.
+    """
+    class_name = audio.__class__.__name__
+    if class_name == "AudioData":  # from speech_recognition
+        width = audio.sample_width
+        # 8-bit AudioData is signed, unlike 8-bit WAV
+        data = audio.get_raw_data(convert_width=2 if width == 1 else None)
+        return decode_pcm(data, audio.sample_rate, 1, max(width, 2), sampling_rate)
+    elif class_name == "AudioSegment":  # from pydub
+        if audio.sample_width == 1:
+            audio = audio.set_sample_width(2)
+        return decode_pcm(
+            audio.raw_data,
+            audio.frame_rate,
+            audio.channels,
+            audio.sample_width,
+            sampling_rate,
+        )
+    elif isinstance(audio, bytes):
+        return decode_in_memory(audio, sampling_rate)
+    elif isinstance(audio, BytesIO):
+        return decode_in_memory(audio.read(), sampling_rate)
+
+    return audio
+
+
+def load_batch(audios: Sequence[Any], sampling_rate: int = SAMPLING_RATE) -> List[Any]:
+    """
+    `load_audio` for many inputs at once.
+
+    WAV inputs are decoded together with `decode_wav_batch`, so clips of the
+    same rate and length are resampled in one pass.
+    """
+    results = list(audios)
+    wavs = {}
+    for i, audio in enumerate(results):
+        if isinstance(audio, BytesIO):
+            audio = results[i] = audio.read()
+        if isinstance(audio, bytes) and _is_wav(audio):
+            wavs[i] = audio
+    if len(wavs) > 1:
+        try:
+            for i, audio in zip(
+                wavs, decode_wav_batch(list(wavs.values()), sampling_rate)
+            ):
+                results[i] = audio
+        except ValueError as e:
+            logger.debug(f"Decoding WAV clips one by one: {e}")
+    return [load_audio(audio, sampling_rate) for audio in results]
@@ -0,0 +1,197 @@
+from dataclasses import asdict
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional
+import logging
+
+import numpy as np
+
+from banglaspeech2text.utils.helpers import get_app_dir
+
+# Get a child logger that inherits from the main logger
+logger = logging.getLogger("BanglaSpeech2Text.cache")
+
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+MAX_PENDING_ACCESSES = 1024
+
+
+def audio_hash(audio: np.ndarray) -> str:
+    """Fast content hash of a decoded waveform."""
+    audio = np.ascontiguousarray(audio)
+    h = hashlib.blake2b(digest_size=16)
+    h.update(f"{audio.dtype}{audio.shape}".encode())
+    h.update(memoryview(audio).cast("B"))
+    return h.hexdigest()
+
+
+def segment_to_dict(segment: Any) -> dict:
+    return asdict(segment)
+
+
+def segment_from_dict(data: dict) -> Any:
+    from faster_whisper.transcribe import Segment, Word
+
+    data = dict(data)
+    if data.get("words") is not None:
+        data["words"] = [Word(**word) for word in data["words"]]
+    return Segment(**data)
+
+
+class TranscriptionCache:
+    """
+    On-disk cache of transcription results in a SQLite database.
+
+    Entries are keyed by a hash of the decoded audio, the model and the
+    decoding options, and hold the segments with their timestamps. Entries
+    older than `max_age` seconds are dropped, and when the stored results
+    exceed `max_bytes` the least recently used ones are evicted.
+
+    Lookups do not write to the database: access times are kept in memory
+    and written with the next `put` or on `close`. The size of the stored
+    results is counted when the cache is opened and then kept up to date in
+    memory, so share a database file between processes only if an
+    approximate size limit is good enough.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        max_age: Optional[float] = None,
+    ):
+        self.path = path or os.path.join(get_app_dir(), "transcriptions.sqlite")
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            "key TEXT PRIMARY KEY, value TEXT, size INTEGER, "
+            "created REAL, accessed REAL)"
+        )
+        self._db.commit()
+        self._bytes = (
+            self._db.execute("SELECT SUM(size) FROM results").fetchone()[0] or 0
+        )
+        self._accessed: Dict[str, float] = {}
+
+    @staticmethod
+    def make_key(audio: np.ndarray, model: str, compute_type: str, **kw) -> str:
+        """Cache key for decoding `audio` with a model and decoding options."""
+        options = json.dumps(kw, sort_keys=True, default=str)
+        return f"{audio_hash(audio)}:{model}:{compute_type}:{options}"
+
+    def get(self, key: str) -> Optional[List[Any]]:
+        """Cached segments for `key`, or None on a miss."""
+        now = time.time()
+        with self._lock:
+            row = self._db.execute(
+                "SELECT value, created, size FROM results WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None and self.max_age is not None:
+                if now - row[1] > self.max_age:
+                    self._db.execute("DELETE FROM results WHERE key = ?", (key,))
+                    self._db.commit()
+                    self._bytes -= row[2]
+                    row = None
+            if row is None:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            # a write per hit would put a commit on the read path
+            self._accessed[key] = now
+            if len(self._accessed) >= MAX_PENDING_ACCESSES:
+                self._flush_accessed()
+                self._db.commit()
+        return [segment_from_dict(data) for data in json.loads(row[0])]
+
+    def put(self, key: str, segments: List[Any]) -> None:
+        """Store segments for `key` and evict old entries if needed."""
+        value = json.dumps(
+            [segment_to_dict(segment) for segment in segments],
+            ensure_ascii=False,
+            default=float,
+        )
+        size = len(value.encode())
+        now = time.time()
+        with self._lock:
+            self._flush_accessed()
+            old = self._db.execute(
+                "SELECT size FROM results WHERE key = ?", (key,)
+            ).fetchone()
+            self._db.execute(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?)",
+                (key, value, size, now, now),
+            )
+            self._bytes += size - (old[0] if old else 0)
+            self._evict(now)
+            self._db.commit()
+
+    def _flush_accessed(self) -> None:
+        if self._accessed:
+            self._db.executemany(
+                "UPDATE results SET accessed = ? WHERE key = ?",
+                [(accessed, key) for key, accessed in self._accessed.items()],
+            )
+            self._accessed = {}
+
+    def _evict(self, now: float) -> None:
+        if self.max_age is not None:
+            expired = self._db.execute(
+                "DELETE FROM results WHERE created < ?", (now - self.max_age,)
+            ).rowcount
+            if expired > 0:
+                self._bytes = (
+                    self._db.execute("SELECT SUM(size) FROM results").fetchone()[0] or 0
+                )
+
+        total = self._bytes
+        if total <= self.max_bytes:
+            return
+
+        rows = self._db.execute(
+            "SELECT key, size FROM results ORDER BY accessed ASC"
+        ).fetchall()
+        evicted = []
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            evicted.append((key,))
+            total -= size
+        self._db.executemany("DELETE FROM results WHERE key = ?", evicted)
+        self._bytes = total
+        logger.debug(f"Evicted {len(evicted)} cached transcriptions")
+
+    def stats(self) -> dict:
+        """Hit and miss counters and the current size of the cache."""
+        with self._lock:
+            entries = self._db.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+            size = self._bytes
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": entries,
+            "bytes": size,
+        }
+
+    def clear(self) -> None:
+        """Remove every cached result."""
+        with self._lock:
+            self._db.execute("DELETE FROM results")
+            self._db.commit()
+            self._bytes = 0
+            self._accessed = {}
+
+    def close(self) -> None:
+        """Write pending access times and close the database."""
+        with self._lock:
+            self._flush_accessed()
+            self._db.commit()
+            self._db.close()
@@ -1,13 +1,22 @@
 # !ct2-transformers-converter --model anuragshas/whisper-large-v2-bn --output_dir whisper-large-v2-ct2 --quantization float16
 
+from functools import lru_cache
+import json
+import os
 from pathlib import Path
+import shutil
 import subprocess
+import uuid
 import logging
 
 # Get a child logger that inherits from the main logger
 logger = logging.getLogger("BanglaSpeech2Text.converter")
 
+MANIFEST_NAME = "bnstt_manifest.json"
+REQUIRED_FILES = ("model.bin", "config.json")
 
+
+@lru_cache(maxsize=None)
 def is_ct2_transformers_converter_available() -> bool:
     """Check if ct2-transformers-converter command is available."""
     try:
@@ -21,20 +30,76 @@ def is_ct2_transformers_converter_available() -> bool:
         return False
 
 
-def convert_model(
-    model_name: str, output_dir: str, compute_type: str = "float16"
-) -> bool:
-    """
-    Convert transformers model to CTranslate2 format.
+def write_manifest(model_dir: Path) -> None:
+    """Record the files of a finished conversion and their sizes."""
+    files = {
+        str(f.relative_to(model_dir)): f.stat().st_size
+        for f in model_dir.rglob("*")
+        if f.is_file() and f.name != MANIFEST_NAME
+    }
+    with (model_dir / MANIFEST_NAME).open("w") as f:
+        json.dump({"files": files}, f)
 
-    Args:
-        model_name: The Hugging Face model name or path
-        output_dir: Output directory for the converted model
-        compute_type: Quantization type (float16, int8, int8_float16, etc.)
 
-    Returns:
-        bool: True if conversion succeeded
+def verify_manifest(model_dir: Path) -> bool:
+    """Check that a converted model is complete and matches its manifest."""
+    try:
+        with (model_dir / MANIFEST_NAME).open("r") as f:
+            files = json.load(f)["files"]
+    except (OSError, ValueError, KeyError):
+        return False
+
+    if not all(name in files for name in REQUIRED_FILES):
+        return False
+    for name, size in files.items():
+        path = model_dir / name
+        if not path.is_file() or path.stat().st_size != size:
+            return False
+    return True
+
+
+def adopt_legacy_model(model_dir: Path) -> bool:
+    """
+    Write a manifest for a model converted before manifests existed.
+
+    Such a directory is reused if it has the required files and a readable
+    `config.json`; anything else is treated as an interrupted conversion.
     """
+    if (model_dir / MANIFEST_NAME).exists():
+        return False
+    for name in REQUIRED_FILES:
+        path = model_dir / name
+        if not path.is_file() or path.stat().st_size == 0:
+            return False
+    try:
+        with (model_dir / "config.json").open("r") as f:
+            json.load(f)
+    except (OSError, ValueError):
+        return False
+    write_manifest(model_dir)
+    logger.info(f"Adopted CTranslate2 model converted by an older version: {model_dir}")
+    return True
+
+
+def _convert_in_process(model_name: str, output_dir: str, compute_type: str) -> bool:
+    try:
+        from ctranslate2.converters import TransformersConverter
+    except ImportError:
+        return _convert_with_cli(model_name, output_dir, compute_type)
+
+    try:
+        TransformersConverter(model_name).convert(output_dir, quantization=compute_type)
+        return True
+    except ImportError as e:
+        # transformers or torch is missing in this interpreter
+        logger.debug(f"In-process conversion unavailable: {e}")
+        return _convert_with_cli(model_name, output_dir, compute_type)
+    except Exception as e:
+        logger.error(f"Error converting model: {e}")
+        return False
+
+
+def _convert_with_cli(model_name: str, output_dir: str, compute_type: str) -> bool:
     if not is_ct2_transformers_converter_available():
         logger.error(
             "faster-whisper is not installed correctly. Please install it again with `pip install faster-whisper --force-reinstall`."
@@ -51,32 +116,59 @@ def convert_model(
             "--quantization",
             compute_type,
         ]
-
-        logger.info(f"Converting model {model_name} to CTranslate2 format...")
         logger.info(f"Command: {' '.join(cmd)}")
-
         subprocess.check_call(cmd)
-        logger.info(f"Successfully converted model to {output_dir}")
         return True
     except subprocess.CalledProcessError as e:
         logger.error(f"Error converting model: {e}")
         return False
 
 
+def convert_model(
+    model_name: str, output_dir: str, compute_type: str = "float16"
+) -> bool:
+    """
+    Convert transformers model to CTranslate2 format.
+
+    The conversion runs in-process with `ctranslate2.converters.TransformersConverter`
+    and falls back to the `ct2-transformers-converter` command.
+
+    Args:
+        model_name: The Hugging Face model name or path
+        output_dir: Output directory for the converted model
+        compute_type: Quantization type (float16, int8, int8_float16, etc.)
+
+    Returns:
+        bool: True if conversion succeeded
+    """
+    logger.info(f"Converting model {model_name} to CTranslate2 format...")
+    if _convert_in_process(model_name, output_dir, compute_type):
+        logger.info(f"Successfully converted model to {output_dir}")
+        return True
+    return False
+
+
 def get_ct2_model_path(
     model_name: str, cache_dir: Path, compute_type: str = "float16"
 ) -> str:
     """
     Get path to CTranslate2 model, converting if necessary.
 
+    Conversions are written to a temporary directory, checked against a
+    manifest and then renamed into place, so an interrupted conversion is
+    never reused. A file lock makes sure only one process converts a model;
+    others wait for it and reuse the result.
+
     Args:
         model_name: The Hugging Face model name
         cache_dir: Cache directory for storing converted models
-        quantcompute_typeization: Quantization type (float16, int8, int8_float16)
+        compute_type: Quantization type (float16, int8, int8_float16)
 
     Returns:
         str: Path to the converted model
     """
+    from filelock import FileLock, Timeout
+
     cache_dir.mkdir(parents=True, exist_ok=True)
 
     # Format model name for file system
@@ -85,15 +177,46 @@ def get_ct2_model_path(
     ct2_model_path = cache_dir / ct2_dir_name
 
     # Check if model already exists
-    if ct2_model_path.exists():
+    if verify_manifest(ct2_model_path):
         logger.info(f"Found existing CTranslate2 model at {ct2_model_path}")
         return str(ct2_model_path)
 
-    # Convert model
-    logger.info(f"CTranslate2 model not found at {ct2_model_path}. Converting...")
-    if convert_model(model_name, str(ct2_model_path), compute_type):
+    lock = FileLock(str(cache_dir / f"{ct2_dir_name}.lock"))
+    try:
+        lock.acquire(timeout=0)
+    except Timeout:
+        logger.info(f"Waiting for another process to convert {model_name}...")
+        lock.acquire()
+
+    try:
+        if verify_manifest(ct2_model_path) or (
+            adopt_legacy_model(ct2_model_path) and verify_manifest(ct2_model_path)
+        ):
+            logger.info(f"Found existing CTranslate2 model at {ct2_model_path}")
+            return str(ct2_model_path)
+
+        if ct2_model_path.exists():
+            logger.warning(f"Removing incomplete CTranslate2 model at {ct2_model_path}")
+            shutil.rmtree(ct2_model_path)
+
+        # Convert model
+        logger.info(f"CTranslate2 model not found at {ct2_model_path}. Converting...")
+        tmp_path = cache_dir / f".{ct2_dir_name}.tmp-{os.getpid()}-{uuid.uuid4().hex}"
+        try:
+            if not convert_model(model_name, str(tmp_path), compute_type):
+                raise RuntimeError(
+                    f"Failed to convert model {model_name} to CTranslate2 format"
+                )
+            write_manifest(tmp_path)
+            if not verify_manifest(tmp_path):
+                raise RuntimeError(
+                    f"Converted model {model_name} is incomplete: {tmp_path}"
+                )
+            os.replace(tmp_path, ct2_model_path)
+        finally:
+            if tmp_path.exists():
+                shutil.rmtree(tmp_path, ignore_errors=True)
+
         return str(ct2_model_path)
-    else:
-        raise RuntimeError(
-            f"Failed to convert model {model_name} to CTranslate2 format"
-        )
+    finally:
+        lock.release()
@@ -0,0 +1,339 @@
+from functools import lru_cache
+from math import gcd
+import struct
+from typing import List, Optional, Sequence, Tuple, Union
+import logging
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+# Get a child logger that inherits from the main logger
+logger = logging.getLogger("BanglaSpeech2Text.frontend")
+
+SAMPLING_RATE = 16000
+
+_PCM = 1
+_FLOAT = 3
+_EXTENSIBLE = 0xFFFE
+
+# sample dtype and the factor mapping it to [-1, 1)
+_SCALES = {
+    np.dtype("u1"): 1 / 128,
+    np.dtype("<i2"): 1 / 32768,
+    np.dtype("<i4"): 1 / 2147483648,
+    np.dtype("<f4"): 1.0,
+    np.dtype("<f8"): 1.0,
+}
+
+
+def parse_wav(data: bytes) -> Tuple[np.ndarray, int]:
+    """
+    Read the samples of a PCM or IEEE float WAV file without copying them.
+
+    Args:
+        data: Complete WAV file
+
+    Returns:
+        tuple: `(frames, sample_rate)` where `frames` has shape
+            `(n_frames, n_channels)` and the file's sample dtype (24-bit
+            samples are widened to int32)
+
+    Raises:
+        ValueError: If the data is not a WAV file this parser supports
+    """
+    if data[:4] != b"RIFF" or data[8:12] != b"WAVE":
+        raise ValueError("Not a WAV file")
+
+    fmt = None
+    pos = 12
+    while pos + 8 <= len(data):
+        chunk_id = data[pos : pos + 4]
+        (size,) = struct.unpack_from("<I", data, pos + 4)
+        body = pos + 8
+        if chunk_id == b"fmt ":
+            fmt = struct.unpack_from("<HHIIHH", data, body)
+            if fmt[0] == _EXTENSIBLE and size >= 26:
+                # the real format is the first field of the sub-format GUID
+                (sub_format,) = struct.unpack_from("<H", data, body + 24)
+                fmt = (sub_format,) + fmt[1:]
+        elif chunk_id == b"data":
+            if fmt is None:
+                raise ValueError("WAV data chunk before fmt chunk")
+            # streamed WAVs leave the size at 0 or 0xFFFFFFFF
+            end = len(data) if size in (0, 0xFFFFFFFF) else body + size
+            return _frames(memoryview(data)[body : min(end, len(data))], fmt), fmt[2]
+        pos = body + size + (size & 1)
+    raise ValueError("WAV file has no data chunk")
+
+
+def _frames(payload: memoryview, fmt: tuple) -> np.ndarray:
+    audio_format, channels, _, _, block_align, bits = fmt
+    width = bits // 8
+    if channels < 1 or block_align != channels * width:
+        raise ValueError(f"Unsupported WAV layout: {channels} ch, {bits} bits")
+    n_frames = len(payload) // block_align
+    payload = payload[: n_frames * block_align]
+
+    if audio_format == _PCM and bits == 24:
+        raw = np.frombuffer(payload, dtype=np.uint8).reshape(-1, 3)
+        # put the three bytes in the top of an int32 so the sign is kept
+        samples = np.zeros((raw.shape[0], 4), dtype=np.uint8)
+        samples[:, 1:] = raw
+        return samples.view("<i4").reshape(n_frames, channels)
+
+    if audio_format == _PCM and bits in (8, 16, 32):
+        dtype = {8: "u1", 16: "<i2", 32: "<i4"}[bits]
+    elif audio_format == _FLOAT and bits in (32, 64):
+        dtype = {32: "<f4", 64: "<f8"}[bits]
+    else:
+        raise ValueError(f"Unsupported WAV format {audio_format} with {bits} bits")
+    return np.frombuffer(payload, dtype=dtype).reshape(n_frames, channels)
+
+
+def to_mono(frames: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Convert integer or float samples to a mono float32 waveform in [-1, 1).
+
+    Channels are averaged. The conversion and the mixdown are done in one
+    pass into `out` (allocated when not given), without a float copy of every
+    channel.
+
+    Args:
+        frames: Samples of shape `(n_frames,)` or `(n_frames, n_channels)`
+        out: float32 array of shape `(n_frames,)` to write into
+    """
+    if frames.ndim == 1:
+        frames = frames[:, None]
+    scale = _SCALES.get(frames.dtype)
+    if scale is None:
+        raise ValueError(f"Unsupported sample type {frames.dtype}")
+    if out is None:
+        out = np.empty(frames.shape[0], dtype=np.float32)
+
+    channels = frames.shape[1]
+    if channels == 1:
+        np.multiply(frames[:, 0], np.float32(scale), out=out, casting="unsafe")
+    else:
+        np.sum(frames, axis=1, dtype=np.float32, out=out)
+        out *= np.float32(scale / channels)
+    if frames.dtype == np.uint8:  # unsigned 8-bit is centred on 128
+        out -= np.float32(1.0)
+    return out
+
+
+@lru_cache(maxsize=16)
+def _polyphase_filter(up: int, down: int) -> Tuple[np.ndarray, int]:
+    # Kaiser windowed sinc low-pass at the lower Nyquist rate, the same
+    # design as scipy.signal.resample_poly, split into `up` phases
+    rate = max(up, down)
+    half_len = 10 * rate
+    t = np.arange(-half_len, half_len + 1, dtype=np.float64)
+    h = np.sinc(t / rate) * np.kaiser(2 * half_len + 1, 5.0)
+    h *= up / h.sum()
+
+    taps = -(-h.shape[0] // up)
+    h = np.concatenate((h, np.zeros(taps * up - h.shape[0])))
+    # row r holds h[r], h[r + up], ...; reversed to match a sliding window
+    phases = h.reshape(taps, up).T[:, ::-1]
+    return np.ascontiguousarray(phases, dtype=np.float32), half_len
+
+
+def _polyphase(
+    x: np.ndarray,
+    first: int,
+    n0: int,
+    count: int,
+    up: int,
+    down: int,
+    out: np.ndarray,
+) -> None:
+    # Output n is sum_k h[r + up * k] * x[q - k] with q, r = divmod(n * down
+    # + half_len, up). Outputs `up` apart use the same phase r and inputs
+    # `down` apart, so each phase is one strided window matrix product.
+    # `x[..., 0]` is input sample `first`.
+    phases, half_len = _polyphase_filter(up, down)
+    taps = phases.shape[1]
+    windows = sliding_window_view(x, taps, axis=-1)
+    for j in range(min(up, count)):
+        n = n0 + j
+        q, r = divmod(n * down + half_len, up)
+        cnt = (count - j + up - 1) // up
+        start = q - taps + 1 - first
+        block = windows[..., start : start + (cnt - 1) * down + 1 : down, :]
+        np.matmul(block, phases[r], out=out[..., j::up])
+
+
+def _ratio(orig_sr: int, target_sr: int) -> Tuple[int, int]:
+    g = gcd(int(orig_sr), int(target_sr))
+    return int(target_sr) // g, int(orig_sr) // g
+
+
+def resample(
+    audio: np.ndarray, orig_sr: int, target_sr: int = SAMPLING_RATE
+) -> np.ndarray:
+    """
+    Resample float32 audio with a polyphase FIR filter.
+
+    Only the output samples are computed: the signal is never upsampled
+    explicitly, and each filter phase is applied to all its output samples
+    with one matrix product. A 2-D array is treated as a batch of clips of
+    the same length and resampled in one pass.
+
+    Args:
+        audio: Waveform of shape `(n,)` or `(batch, n)`
+        orig_sr: Sample rate of `audio`
+        target_sr: Sample rate to convert to
+
+    Returns:
+        np.ndarray: float32 audio with `ceil(n * target_sr / orig_sr)` samples
+    """
+    audio = np.asarray(audio, dtype=np.float32)
+    up, down = _ratio(orig_sr, target_sr)
+    if up == down:
+        return audio
+
+    n = audio.shape[-1]
+    count = -(-n * up // down)
+    phases, half_len = _polyphase_filter(up, down)
+    taps = phases.shape[1]
+    last = ((count - 1) * down + half_len) // up if count else 0
+    pad = [(0, 0)] * (audio.ndim - 1) + [(taps - 1, max(0, last + 1 - n))]
+    x = np.pad(audio, pad)
+
+    out = np.empty(audio.shape[:-1] + (count,), dtype=np.float32)
+    if count:
+        _polyphase(x, -(taps - 1), 0, count, up, down, out)
+    return out
+
+
+class StreamResampler:
+    """
+    Resample a stream chunk by chunk.
+
+    Keeps the input the filter still needs between calls, so the
+    concatenated output equals `resample` on the whole stream.
+
+    Args:
+        orig_sr: Sample rate of the fed audio
+        target_sr: Sample rate to convert to
+    """
+
+    def __init__(self, orig_sr: int, target_sr: int = SAMPLING_RATE):
+        self.up, self.down = _ratio(orig_sr, target_sr)
+        self._taps = _polyphase_filter(self.up, self.down)[0].shape[1]
+        self._half_len = _polyphase_filter(self.up, self.down)[1]
+        self._buffer = np.zeros(self._taps - 1, dtype=np.float32)
+        self._first = -(self._taps - 1)  # stream index of _buffer[0]
+        self._received = 0
+        self._emitted = 0
+
+    def feed(self, chunk: np.ndarray) -> np.ndarray:
+        """Resample `chunk` and return the output that is complete."""
+        chunk = np.asarray(chunk, dtype=np.float32)
+        if self.up == self.down:
+            return chunk
+        self._buffer = np.concatenate((self._buffer, chunk))
+        self._received += chunk.shape[0]
+        # output n needs input up to (n * down + half_len) // up
+        ready = (self._received * self.up - 1 - self._half_len) // self.down + 1
+        return self._emit(max(ready, self._emitted))
+
+    def flush(self) -> np.ndarray:
+        """Return the rest of the output, padding the stream with silence."""
+        if self.up == self.down:
+            return np.zeros(0, dtype=np.float32)
+        total = -(-self._received * self.up // self.down)
+        last = ((total - 1) * self.down + self._half_len) // self.up
+        missing = last + 1 - (self._first + self._buffer.shape[0])
+        if missing > 0:
+            self._buffer = np.concatenate(
+                (self._buffer, np.zeros(missing, dtype=np.float32))
+            )
+        return self._emit(max(total, self._emitted))
+
+    def _emit(self, end: int) -> np.ndarray:
+        count = end - self._emitted
+        out = np.empty(count, dtype=np.float32)
+        if count:
+            _polyphase(
+                self._buffer,
+                self._first,
+                self._emitted,
+                count,
+                self.up,
+                self.down,
+                out,
+            )
+            self._emitted = end
+        # drop the input no later output reaches back to
+        keep = (self._emitted * self.down + self._half_len) // self.up
+        drop = keep - self._taps + 1 - self._first
+        if drop > 0:
+            self._buffer = self._buffer[drop:]
+            self._first += drop
+        return out
+
+
+def decode_pcm(
+    data: Union[bytes, memoryview],
+    sample_rate: int,
+    channels: int = 1,
+    sample_width: int = 2,
+    target_sr: int = SAMPLING_RATE,
+) -> np.ndarray:
+    """
+    Convert raw little-endian PCM to a mono float32 waveform at `target_sr`.
+
+    Args:
+        data: Interleaved PCM frames
+        sample_rate: Sample rate of `data`
+        channels: Number of interleaved channels
+        sample_width: Bytes per sample (1, 2, 3 or 4)
+        target_sr: Sample rate to convert to
+    """
+    fmt = (_PCM, channels, sample_rate, 0, channels * sample_width, sample_width * 8)
+    return resample(to_mono(_frames(memoryview(data), fmt)), sample_rate, target_sr)
+
+
+def decode_wav(data: bytes, target_sr: int = SAMPLING_RATE) -> np.ndarray:
+    """
+    Decode a WAV file to a mono float32 waveform at `target_sr`.
+
+    Raises:
+        ValueError: If the data is not a WAV file `parse_wav` supports
+    """
+    frames, sample_rate = parse_wav(data)
+    return resample(to_mono(frames), sample_rate, target_sr)
+
+
+def decode_wav_batch(
+    clips: Sequence[bytes], target_sr: int = SAMPLING_RATE
+) -> List[np.ndarray]:
+    """
+    Decode many WAV files, resampling clips of equal rate and length together.
+
+    Clips that share a sample rate and length, like fixed-size recordings
+    from one source, are mixed down into rows of one preallocated matrix and
+    resampled with a single call, which amortises the per-call overhead that
+    dominates on short clips.
+
+    Raises:
+        ValueError: If a clip is not a WAV file `parse_wav` supports
+    """
+    parsed = [parse_wav(data) for data in clips]
+    groups: dict = {}
+    for i, (frames, sample_rate) in enumerate(parsed):
+        groups.setdefault((sample_rate, frames.shape[0]), []).append(i)
+
+    results: List[np.ndarray] = [None] * len(parsed)  # type: ignore
+    for (sample_rate, n_frames), indices in groups.items():
+        if len(indices) == 1:
+            i = indices[0]
+            results[i] = resample(to_mono(parsed[i][0]), sample_rate, target_sr)
+            continue
+        stack = np.empty((len(indices), n_frames), dtype=np.float32)
+        for row, i in enumerate(indices):
+            to_mono(parsed[i][0], out=stack[row])
+        for row, audio in zip(indices, resample(stack, sample_rate, target_sr)):
+            results[row] = audio
+    return results
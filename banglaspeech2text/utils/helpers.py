@@ -51,6 +51,16 @@ def convert_file_size(size_bytes, decimal_places=1) -> str:
     return f"~{round(size, decimal_places)} {units[unit_index]}"
 
 
+def parse_file_size(size: str) -> int:
+    """Inverse of `convert_file_size`: "~3.1 GB" -> bytes."""
+    units = {"bytes": 1, "kb": 1024, "mb": 1024**2, "gb": 1024**3, "tb": 1024**4}
+    match = re.match(r"~?\s*([\d.]+)\s*([a-zA-Z]*)", size.strip())
+    if not match:
+        raise ValueError(f"Invalid size: {size}")
+    value, unit = match.groups()
+    return int(float(value) * units.get(unit.lower() or "bytes", 1))
+
+
 def safe_json(
     file_path: str, read: bool = True, data: Optional[dict] = None
 ) -> Union[dict, None, bool]:
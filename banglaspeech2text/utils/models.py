@@ -3,9 +3,14 @@ import os
 from pathlib import Path
 from pprint import pformat
 import re
-import requests
-import yaml
-from banglaspeech2text.utils.helpers import convert_file_size, get_wer_value, safe_json
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+from banglaspeech2text.utils.helpers import (
+    convert_file_size,
+    parse_file_size,
+    get_app_dir,
+    get_wer_value,
+    safe_json,
+)
 import threading
 from dataclasses import dataclass
 import logging
@@ -14,23 +19,270 @@ import logging
 logger = logging.getLogger("BanglaSpeech2Text.models")
 
 current_dir = os.path.dirname(os.path.realpath(__file__))
-with open(os.path.join(current_dir, "listed_models.json"), "r") as f:
-    all_models = json.load(f)
+LISTED_MODELS_PATH = os.path.join(current_dir, "listed_models.json")
+_REQUIRED_KEYS = ("name", "type", "wer")
+
+
+def model_id(model: dict) -> str:
+    """HuggingFace id (or local path) of a catalogue entry."""
+    if model.get("path"):
+        return model["path"]
+    return "/".join(model["url"].split("/")[-2:])
+
+
+class ModelCatalog:
+    """Indexed catalogue of known models.
+
+    Models are grouped by type ("tiny", "base", ...) like `listed_models.json`.
+    Lookups by name, HuggingFace id or type and the best model per type are
+    answered from indexes built when models are added. Extra catalogue files
+    (for example your own fine-tuned checkpoints) can be merged with
+    `merge_file`; a model with the same id as an existing one replaces it.
+    """
+
+    def __init__(self, models: Optional[Dict[str, List[dict]]] = None):
+        self.models: Dict[str, List[dict]] = {}
+        self._by_name: Dict[str, dict] = {}
+        self._by_id: Dict[str, dict] = {}
+        self._best: Dict[str, dict] = {}
+        self._text: Optional[str] = None
+        if models:
+            self.merge(models)
+
+    @classmethod
+    def load(cls) -> "ModelCatalog":
+        """Listed models plus the user catalogue, if there is one.
+
+        The user catalogue is read from `$BANGLASPEECH2TEXT_MODELS` or
+        `~/.banglaspeech2text/models.json`.
+        """
+        catalog = cls()
+        catalog.merge_file(LISTED_MODELS_PATH)
+        user_path = os.getenv("BANGLASPEECH2TEXT_MODELS") or os.path.join(
+            os.path.expanduser("~"), ".banglaspeech2text", "models.json"
+        )
+        if os.path.exists(user_path):
+            logger.debug(f"Merging user model catalogue {user_path}")
+            try:
+                catalog.merge_file(user_path)
+            except (OSError, ValueError) as e:
+                # a broken user file must not make the library unusable
+                logger.warning(f"Ignoring user model catalogue {user_path}: {e}")
+        return catalog
+
+    def merge_file(self, path: str) -> None:
+        """Merge a catalogue file, either grouped by type or a list of models."""
+        with open(path, "r", encoding="utf-8") as f:
+            self.merge(json.load(f))
+
+    def merge(self, models: Union[Dict[str, List[dict]], List[dict]]) -> None:
+        """
+        Merge models, either grouped by type or a list of models.
+
+        Every model needs a "name", "type" and "wer", and a "url" or a local
+        "path". Nothing is merged if one of them is invalid.
+
+        Raises:
+            ValueError: If the catalogue is malformed or a model misses a key
+        """
+        if isinstance(models, dict):
+            if not all(isinstance(entries, list) for entries in models.values()):
+                raise ValueError("models grouped by type must be lists")
+            models = [
+                (
+                    dict(model, type=model.get("type", model_type))
+                    if isinstance(model, dict)
+                    else model
+                )
+                for model_type, entries in models.items()
+                for model in entries
+            ]
+        elif not isinstance(models, list):
+            raise ValueError("a model catalogue must be an object or a list")
+
+        for index, model in enumerate(models):
+            if not isinstance(model, dict):
+                raise ValueError(f"model {index} is not an object")
+            missing = [key for key in _REQUIRED_KEYS if key not in model]
+            if "url" not in model and "path" not in model:
+                missing.append("url")
+            if missing:
+                name = model.get("name", "?")
+                raise ValueError(f"model {index} ({name}) is missing {missing}")
+
+        for model in models:
+            existing = self._by_id.get(model_id(model))
+            if existing is not None:
+                self.models[existing["type"]].remove(existing)
+            self.models.setdefault(model["type"], []).append(model)
+        self._reindex()
+
+    def _reindex(self) -> None:
+        self._by_name = {}
+        self._by_id = {}
+        self._best = {}
+        for model_type, entries in self.models.items():
+            for model in entries:
+                self._by_name.setdefault(model["name"], model)
+                self._by_id[model_id(model)] = model
+                best = self._best.get(model_type)
+                if best is None or model["wer"] < best["wer"]:
+                    self._best[model_type] = model
+        self._text = None
+
+    @property
+    def types(self) -> List[str]:
+        return list(self.models)
+
+    def best(self, type: str = "base") -> dict:
+        """Model of `type` with the lowest WER."""
+        if type not in self._best:
+            raise ValueError(
+                f"Model type {type} not found. Please choose from {self.types}"
+            )
+        return self._best[type]
+
+    def get(self, name: str, raise_error: bool = True) -> Optional[dict]:
+        """Look a model up by name, HuggingFace id, or type (best of that type)."""
+        model = self._by_name.get(name) or self._by_id.get(name)
+        if model is not None:
+            return model
+
+        if name in self._best:
+            return self._best[name]
+
+        if raise_error:
+            raise ValueError(
+                f"Model {name} not found. Please choose from:\n{self.to_text()}"
+            )
+        return None
+
+    def filter(
+        self,
+        type: Optional[str] = None,
+        max_size: Union[int, str, None] = None,
+        max_wer: Optional[float] = None,
+        license: Optional[str] = None,
+        author: Optional[str] = None,
+    ) -> List[dict]:
+        """
+        Models matching all the given criteria, best WER first.
+
+        Args:
+            type: Model type ("tiny", "base", ...)
+            max_size: Largest size, in bytes or as text like "1 GB"
+            max_wer: Highest word error rate
+            license: License id, e.g. "apache-2.0"
+            author: Model author
+
+        Returns:
+            list: Matching catalogue entries
+        """
+        if isinstance(max_size, str):
+            max_size = parse_file_size(max_size)
+
+        if type is not None:
+            models = list(self.models.get(type, []))
+        else:
+            models = [model for entries in self.models.values() for model in entries]
+        if max_size is not None:
+            models = [m for m in models if parse_file_size(m["size"]) <= max_size]
+        if max_wer is not None:
+            models = [m for m in models if m["wer"] <= max_wer]
+        if license is not None:
+            models = [m for m in models if m["license"].lower() == license.lower()]
+        if author is not None:
+            models = [m for m in models if m["author"].lower() == author.lower()]
+        return sorted(models, key=lambda m: m["wer"])
+
+    def to_text(self) -> str:
+        """Human readable list of the models, grouped by type."""
+        if self._text is None:
+            lines = ["Available models:"]
+            for model_type, entries in self.models.items():
+                lines.append(f"\t{model_type}:")
+                lines.extend(
+                    f"\t\t{m['name']}\t{m['wer']} WER\t{m['size']}\tby {m['author']} ({m['license']})"
+                    for m in entries
+                )
+                lines.append("")
+            self._text = "\n".join(lines) + "\n"
+        return self._text
+
+    def __iter__(self) -> Iterator[dict]:
+        for entries in self.models.values():
+            yield from entries
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+
+catalog = ModelCatalog.load()
+all_models = catalog.models
+
+
+def is_offline() -> bool:
+    """True when network access is disabled with an environment variable."""
+    return any(
+        os.getenv(var, "").lower() in ("1", "true", "yes")
+        for var in ("BANGLASPEECH2TEXT_OFFLINE", "HF_HUB_OFFLINE")
+    )
+
+
+def get_metadata_index_path() -> str:
+    return os.path.join(get_app_dir(), "model_index.json")
+
+
+class _Detail:
+    """Model detail that is resolved the first time it is read."""
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        if obj._details is None:
+            obj.load_details()
+        return obj._details[self.name]
 
 
 @dataclass
 class ModelMetadata:
-    """Metadata about a model."""
+    """Metadata about a model.
+
+    Only the name is resolved on construction. Details (type, license, WER,
+    ...) are loaded on first access from the listed models, the persistent
+    metadata index or, for unlisted models, the model card on HuggingFace.
+    """
 
     raw_name: str
 
+    type = _Detail()
+    license = _Detail()
+    description = _Detail()
+    url = _Detail()
+    wer = _Detail()
+    size = _Detail()
+    lang = _Detail()
+
+    _MAX_WER_SCORE = 1000
+
     def __post_init__(self):
         self.cache_path = Path(os.path.expanduser("~/.cache/banglaspeech2text"))
         logger.debug(f"Model cache path: {self.cache_path}")
 
-    def __init__(self, name: str, **kw):
+    def __init__(
+        self,
+        name: str,
+        offline: Optional[bool] = None,
+        timeout: float = 5.0,
+        **kw,
+    ):
         self.kw = kw
         self.raw_name = name
+        self.offline = is_offline() if offline is None else offline
+        self.timeout = timeout
         local = False
 
         if os.path.exists(name):
@@ -42,8 +294,7 @@ class ModelMetadata:
             bst = get_model(name)
             self.name = bst["name"]
             self.author = bst["author"]
-            last_part = bst["url"].split("/")[-2:]
-            self.raw_name = "/".join(last_part)
+            self.raw_name = model_id(bst)
 
         if local:
             self.name = name
@@ -55,97 +306,107 @@ class ModelMetadata:
         )
         self.save_name = f"models--{self.raw_name.replace('/', '--')}"
 
-        self.__MAX_WER_SCORE = 1000
-        self.type: str = ""
-        self.license: str = ""
-        self.description: str = ""
-        self.url: str = ""
-        self.wer: float = self.__MAX_WER_SCORE
-        self.size: str = ""
-        self.lang: str = ""
-
-        model_dir = self.cache_path / "hub" / self.save_name
-        self.model_path = model_dir
-        snapshots = model_dir / "snapshots"
-        if snapshots.exists():
-            folders = snapshots.glob("*")
-            if folders:
-                latest_folder = sorted(folders, key=os.path.getmtime)[-1]
-                self.model_path = latest_folder
-
-        threading.Thread(target=self.load_details).start()
+        self._details: Optional[dict] = None
+        self._model_path: Optional[Path] = None
+        self._lock = threading.Lock()
+
+    @property
+    def model_path(self) -> Path:
+        """Latest downloaded snapshot of the model (or its hub folder)."""
+        if self._model_path is None:
+            model_dir = self.cache_path / "hub" / self.save_name
+            self._model_path = model_dir
+            snapshots = model_dir / "snapshots"
+            if snapshots.exists():
+                folders = list(snapshots.glob("*"))
+                if folders:
+                    self._model_path = max(folders, key=os.path.getmtime)
+        return self._model_path
 
     def load_details(self, force_reload=False) -> None:
-        details_path = self.model_path / "details.json"
-        data: dict = safe_json(str(details_path), data=None)  # type: ignore
-        if not data or force_reload:
-            data = {}
-
-            mdl = get_model(self.raw_name, raise_error=False)
-            if mdl is not None:
-                data["type"] = mdl["type"]
-                data["license"] = mdl["license"]
-                data["description"] = mdl["description"]
-                data["url"] = mdl["url"]
-                data["wer"] = mdl["wer"]
-                data["size"] = mdl["size"]
-                data["lang"] = mdl["lang"]
-            else:
-                if "base" in self.name:
-                    data["type"] = "base"
-                elif "large" in self.name:
-                    data["type"] = "large"
-                elif "tiny" in self.name:
-                    data["type"] = "tiny"
-                elif "small" in self.name:
-                    data["type"] = "small"
-                elif "medium" in self.name:
-                    data["type"] = "medium"
-                else:
-                    data["type"] = "unknown"
-
-                data["url"] = f"https://huggingface.co/{self.raw_name}"
-                files = self.model_path.glob("*")
-                model_file = [f for f in files if "_model" in f.name]
-                if model_file:
-                    model_file = model_file[0]
-                    data["size"] = convert_file_size(model_file.stat().st_size)
-                else:
-                    data["size"] = convert_file_size(0)
-
-                try:
-                    url = f"{data['url']}/raw/main/README.md"
-                    res = requests.get(url)
-                    if res.status_code == 200:
-                        text = res.text
-                        pattern = r"---\n(.*?)\n---"
-                        mtc = re.search(pattern, text, re.DOTALL)
-                        data["description"] = text
-                        if mtc:
-                            ydata = mtc.group(1)
-                            pardata = yaml.safe_load(ydata)
-                            data["license"] = pardata.get("license", "unknown")
-                            data["lang"] = pardata.get("language", "bn")
-                        else:
-                            raise Exception("No match found")
-
-                        data["wer"] = get_wer_value(text, max_wer=self.__MAX_WER_SCORE)
-
-                except Exception as e:
-                    data["license"] = "unknown"
-                    data["lang"] = "bn"
-                    data["wer"] = self.__MAX_WER_SCORE
-                    data["description"] = "No description found"
-
-            safe_json(str(details_path), read=False, data=data)
-
-        self.type = data["type"]
-        self.license = data["license"]
-        self.description = data["description"]
-        self.url = data["url"]
-        self.wer = data["wer"]
-        self.size = data["size"]
-        self.lang = data["lang"]
+        with self._lock:
+            if self._details is not None and not force_reload:
+                return
+
+            index_path = get_metadata_index_path()
+            index: dict = safe_json(index_path) or {}  # type: ignore
+            data = None if force_reload else index.get(self.raw_name)
+            if not data:
+                data, fetched = self._resolve_details()
+                if fetched:
+                    index[self.raw_name] = data
+                    safe_json(index_path, read=False, data=index)
+
+            self._details = data
+
+    def _resolve_details(self) -> Tuple[dict, bool]:
+        """Build the details of the model, and whether they came from the network."""
+        data = {}
+        fetched = False
+
+        mdl = get_model(self.raw_name, raise_error=False)
+        if mdl is not None:
+            data["type"] = mdl["type"]
+            data["license"] = mdl["license"]
+            data["description"] = mdl.get("description", "")
+            data["url"] = mdl["url"]
+            data["wer"] = mdl["wer"]
+            data["size"] = mdl["size"]
+            data["lang"] = mdl.get("lang", "bn")
+            return data, fetched
+
+        if "base" in self.name:
+            data["type"] = "base"
+        elif "large" in self.name:
+            data["type"] = "large"
+        elif "tiny" in self.name:
+            data["type"] = "tiny"
+        elif "small" in self.name:
+            data["type"] = "small"
+        elif "medium" in self.name:
+            data["type"] = "medium"
+        else:
+            data["type"] = "unknown"
+
+        data["url"] = f"https://huggingface.co/{self.raw_name}"
+        files = self.model_path.glob("*")
+        model_file = [f for f in files if "_model" in f.name]
+        if model_file:
+            model_file = model_file[0]
+            data["size"] = convert_file_size(model_file.stat().st_size)
+        else:
+            data["size"] = convert_file_size(0)
+
+        data["license"] = "unknown"
+        data["lang"] = "bn"
+        data["wer"] = self._MAX_WER_SCORE
+        data["description"] = "No description found"
+
+        if self.offline:
+            return data, fetched
+
+        try:
+            import requests
+            import yaml
+
+            url = f"{data['url']}/raw/main/README.md"
+            res = requests.get(url, timeout=self.timeout)
+            if res.status_code == 200:
+                text = res.text
+                pattern = r"---\n(.*?)\n---"
+                mtc = re.search(pattern, text, re.DOTALL)
+                if mtc:
+                    ydata = mtc.group(1)
+                    pardata = yaml.safe_load(ydata)
+                    data["description"] = text
+                    data["license"] = pardata.get("license", "unknown")
+                    data["lang"] = pardata.get("language", "bn")
+                    data["wer"] = get_wer_value(text, max_wer=self._MAX_WER_SCORE)
+                    fetched = True
+        except Exception as e:
+            logger.debug(f"Could not fetch details for {self.raw_name}: {e}")
+
+        return data, fetched
 
     def __repr__(self):
         return f"Model(name={self.name}, type={self.type})"
@@ -186,36 +447,22 @@ class BanglaASRModels:
 
 # nice list of models
 def nice_model_list() -> str:
-    txt = "Available models:\n"
-    for model_type in all_models:
-        txt += f"\t{model_type}:\n"
-        for model in all_models[model_type]:
-            txt += f"\t\t{model['name']}\t{model['wer']} WER\t{model['size']}\tby {model['author']} ({model['license']})\n"
-        txt += "\n"
-    return txt
+    return catalog.to_text()
 
 
 def get_best_model(type: str = "base"):
-    if type not in all_models:
-        raise ValueError(
-            f"Model type {type} not found. Please choose from {list(all_models.keys())}"
-        )
-    return sorted(all_models[type], key=lambda x: x["wer"])[0]
+    return catalog.best(type)
 
 
 def get_model(name: str, raise_error: bool = True) -> dict:
-    for model_type in all_models:
-        for model in all_models[model_type]:
-            if model["name"] == name:
-                return model
-
-    # check if it's type return the best model of that type lower WER
-    if name in all_models:
-        return get_best_model(name)
-
-    if raise_error:
-        raise ValueError(
-            f"Model {name} not found. Please choose from:\n{nice_model_list()}"
-        )
+    return catalog.get(name, raise_error=raise_error)  # type: ignore
+
+
+def resolve_model_name(name: str) -> str:
+    """Resolve a listed model name or type to its HuggingFace id.
 
-    return None  # type: ignore
+    Local paths and HuggingFace ids are returned unchanged.
+    """
+    if os.path.exists(name) or "/" in name:
+        return name
+    return model_id(get_model(name))
@@ -0,0 +1,188 @@
+from dataclasses import dataclass, field
+import threading
+from typing import List, Tuple
+import logging
+
+import numpy as np
+
+from banglaspeech2text.utils.audio import SAMPLING_RATE
+
+# Get a child logger that inherits from the main logger
+logger = logging.getLogger("BanglaSpeech2Text.vad")
+
+
+def speech_regions(
+    audio: np.ndarray,
+    sampling_rate: int = SAMPLING_RATE,
+    threshold: float = 0.5,
+    min_silence_ms: int = 300,
+    speech_pad_ms: int = 200,
+    max_speech_s: float = float("inf"),
+) -> List[Tuple[int, int]]:
+    """
+    Find speech in a waveform with Silero VAD.
+
+    Args:
+        audio: Mono float32 waveform
+        sampling_rate: Sampling rate of `audio`
+        threshold: Speech probability above which a frame counts as speech
+        min_silence_ms: Silence needed to end a speech region
+        speech_pad_ms: Padding added to both sides of every region
+        max_speech_s: Regions longer than this are split, at a short pause
+            if there is one
+
+    Returns:
+        list: (start, end) sample offsets of each speech region
+    """
+    from faster_whisper.vad import VadOptions, get_speech_timestamps
+
+    options = VadOptions(
+        threshold=threshold,
+        min_silence_duration_ms=min_silence_ms,
+        speech_pad_ms=speech_pad_ms,
+        max_speech_duration_s=max_speech_s,
+    )
+    timestamps = get_speech_timestamps(audio, options, sampling_rate=sampling_rate)
+    return [(ts["start"], ts["end"]) for ts in timestamps]
+
+
+def energy_regions(
+    audio: np.ndarray,
+    sampling_rate: int = SAMPLING_RATE,
+    threshold_db: float = -40.0,
+    frame_ms: int = 30,
+    min_silence_ms: int = 300,
+    speech_pad_ms: int = 200,
+    min_speech_ms: int = 100,
+) -> List[Tuple[int, int]]:
+    """
+    Find speech in a waveform by frame energy.
+
+    Much cheaper than Silero VAD, but any sound louder than `threshold_db`
+    counts as speech, so it removes silence and not music or noise.
+
+    Args:
+        audio: Mono float32 waveform
+        sampling_rate: Sampling rate of `audio`
+        threshold_db: Frame level in dBFS above which a frame counts as speech
+        frame_ms: Frame length
+        min_silence_ms: Shorter gaps between speech are kept
+        speech_pad_ms: Padding added to both sides of every region
+        min_speech_ms: Shorter regions are dropped
+
+    Returns:
+        list: (start, end) sample offsets of each speech region
+    """
+    frame = int(sampling_rate * frame_ms / 1000)
+    n = audio.shape[0] // frame
+    if n == 0:
+        return []
+    frames = audio[: n * frame].reshape(n, frame)
+    power = np.einsum("ij,ij->i", frames, frames) / frame
+    speech = 10 * np.log10(power + 1e-10) > threshold_db
+
+    edges = np.diff(np.concatenate(([0], speech.astype(np.int8), [0])))
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+
+    min_gap = min_silence_ms / frame_ms
+    merged: List[List[int]] = []
+    for start, end in zip(starts, ends):
+        if merged and start - merged[-1][1] < min_gap:
+            merged[-1][1] = end
+        else:
+            merged.append([start, end])
+
+    pad = int(speech_pad_ms * sampling_rate / 1000)
+    min_frames = min_speech_ms / frame_ms
+    regions: List[Tuple[int, int]] = []
+    for start, end in merged:
+        if end - start < min_frames:
+            continue
+        start = max(0, int(start) * frame - pad)
+        end = min(audio.shape[0], int(end) * frame + pad)
+        if regions and start <= regions[-1][1]:
+            regions[-1] = (regions[-1][0], end)
+        else:
+            regions.append((start, end))
+    return regions
+
+
+@dataclass
+class VadFilter:
+    """
+    Voice activity detection stage that runs before feature extraction.
+
+    Non-speech audio is cut out so the model only sees speech, and the
+    segment timestamps are mapped back to the original recording. The
+    defaults are tuned for conversational Bangla, which has frequent short
+    pauses inside sentences. `total_seconds` and `skipped_seconds` add up
+    over every call.
+
+    Args:
+        method: "silero" (Silero VAD) or "energy" (frame energy, NumPy only)
+        threshold: Speech probability threshold for Silero VAD
+        threshold_db: Level in dBFS above which a frame is speech (energy)
+        min_silence_ms: Silence needed to end a speech region
+        speech_pad_ms: Padding kept around every speech region
+    """
+
+    method: str = "silero"
+    threshold: float = 0.5
+    threshold_db: float = -40.0
+    min_silence_ms: int = 500
+    speech_pad_ms: int = 300
+    total_seconds: float = field(default=0.0, init=False, repr=False, compare=False)
+    skipped_seconds: float = field(default=0.0, init=False, repr=False, compare=False)
+    _lock: threading.Lock = field(
+        default_factory=threading.Lock, init=False, repr=False, compare=False
+    )
+
+    def __post_init__(self):
+        if self.method not in ("silero", "energy"):
+            raise ValueError(f"Unknown VAD method: {self.method}")
+
+    def regions(
+        self, audio: np.ndarray, sampling_rate: int = SAMPLING_RATE
+    ) -> List[Tuple[int, int]]:
+        """(start, end) sample offsets of the speech in `audio`."""
+        if self.method == "energy":
+            return energy_regions(
+                audio,
+                sampling_rate,
+                threshold_db=self.threshold_db,
+                min_silence_ms=self.min_silence_ms,
+                speech_pad_ms=self.speech_pad_ms,
+            )
+        return speech_regions(
+            audio,
+            sampling_rate,
+            threshold=self.threshold,
+            min_silence_ms=self.min_silence_ms,
+            speech_pad_ms=self.speech_pad_ms,
+        )
+
+    def apply(
+        self, audio: np.ndarray, sampling_rate: int = SAMPLING_RATE
+    ) -> Tuple[np.ndarray, List[dict]]:
+        """
+        Cut the non-speech audio out of `audio`.
+
+        Returns:
+            tuple: The speech audio and its chunks as {"start", "end"} sample
+                offsets, as expected by `faster_whisper.vad.SpeechTimestampsMap`
+        """
+        regions = self.regions(audio, sampling_rate)
+        chunks = [{"start": start, "end": end} for start, end in regions]
+        if regions:
+            speech = np.concatenate([audio[start:end] for start, end in regions])
+        else:
+            speech = audio[:0]
+
+        total = audio.shape[0] / sampling_rate
+        skipped = total - speech.shape[0] / sampling_rate
+        with self._lock:
+            self.total_seconds += total
+            self.skipped_seconds += skipped
+        logger.debug(f"VAD skipped {skipped:.1f}s of {total:.1f}s")
+        return speech, chunks
@@ -0,0 +1,107 @@
+from pathlib import Path
+import threading
+from typing import Any, Dict, Iterable, Iterator, List, Tuple, Union
+from weakref import WeakKeyDictionary
+import logging
+
+# Get a child logger that inherits from the main logger
+logger = logging.getLogger("BanglaSpeech2Text.vocabulary")
+
+
+class Vocabulary:
+    """
+    Domain terms (brand names, banking terms, ...) to bias decoding towards.
+
+    The terms are given to the decoder as hotwords: they are put in the
+    prompt of every 30 second window, which makes the model much more likely
+    to spell them the same way. They are tokenized once per tokenizer and
+    the token ids are reused by every request.
+
+    Args:
+        terms: Words or phrases; duplicates and blank entries are dropped
+        separator: Text put between terms in the prompt
+    """
+
+    def __init__(self, terms: Iterable[str], separator: str = ", "):
+        self.terms = tuple(
+            dict.fromkeys(term.strip() for term in terms if term and term.strip())
+        )
+        self.text = separator.join(self.terms)
+        self._tokens: "WeakKeyDictionary[Any, Tuple[int, ...]]" = WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_file(cls, path: Union[str, Path], **kwargs) -> "Vocabulary":
+        """Read one term per line; lines starting with `#` are ignored."""
+        with open(path, encoding="utf-8") as f:
+            lines = [line for line in f if not line.lstrip().startswith("#")]
+        return cls(lines, **kwargs)
+
+    def tokens(self, tokenizer: Any) -> Tuple[int, ...]:
+        """
+        Prompt token ids of the terms, tokenized on first use.
+
+        Args:
+            tokenizer: `tokenizers.Tokenizer` of the model, e.g.
+                `Speech2Text.hf_tokenizer`
+        """
+        with self._lock:
+            tokens = self._tokens.get(tokenizer)
+        if tokens is None:
+            if self.text:
+                # the same leading space faster-whisper adds to hotwords
+                encoding = tokenizer.encode(" " + self.text, add_special_tokens=False)
+                tokens = tuple(encoding.ids)
+            else:
+                tokens = ()
+            with self._lock:
+                self._tokens[tokenizer] = tokens
+        return tokens
+
+    def __len__(self) -> int:
+        return len(self.terms)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.terms)
+
+    def __repr__(self) -> str:
+        return f"Vocabulary({len(self.terms)} terms)"
+
+
+class VocabularyRegistry:
+    """
+    Named vocabularies, e.g. one per tenant.
+
+    A vocabulary can be replaced at any time without reloading the model;
+    requests already running keep the one they started with.
+    """
+
+    def __init__(self):
+        self._vocabularies: Dict[str, Vocabulary] = {}
+        self._lock = threading.Lock()
+
+    def set(self, name: str, terms: Union[Vocabulary, Iterable[str]]) -> Vocabulary:
+        """Add or replace the vocabulary `name`."""
+        vocabulary = terms if isinstance(terms, Vocabulary) else Vocabulary(terms)
+        with self._lock:
+            self._vocabularies[name] = vocabulary
+        logger.debug(f"Vocabulary {name!r} set to {len(vocabulary)} terms")
+        return vocabulary
+
+    def get(self, name: str) -> Vocabulary:
+        """The vocabulary `name`; raises KeyError if there is none."""
+        with self._lock:
+            return self._vocabularies[name]
+
+    def remove(self, name: str) -> None:
+        """Remove the vocabulary `name` if it exists."""
+        with self._lock:
+            self._vocabularies.pop(name, None)
+
+    def names(self) -> List[str]:
+        with self._lock:
+            return sorted(self._vocabularies)
+
+    def __contains__(self, name: str) -> bool:
+        with self._lock:
+            return name in self._vocabularies
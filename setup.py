@@ -7,7 +7,9 @@ with open("README.md", encoding="utf-8") as f:
     long_description = f.read()
 
 with open("requirements.txt", encoding="utf-8") as f:
-    install_requires = f.read().splitlines()
+    install_requires = [
+        line for line in f.read().splitlines() if line and not line.startswith("#")
+    ]
 
 name = "BanglaSpeech2Text"
 author = "shifat (shhossain)"
@@ -67,6 +69,12 @@ setup(
             "SpeechRecognition",
             "pydub",
         ],
+        "server": [
+            "aiohttp",
+        ],
+        "arrow": [
+            "pyarrow",
+        ],
     },
     package_data={
         "banglaspeech2text": ["utils/listed_models.json"],
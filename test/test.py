@@ -90,6 +90,14 @@ class TestBanglaSpeech2Text(unittest.TestCase):
         text = self.speech2text(audio)
         self.assertTrue(string_match_with_percentage(text, TEST_WAV_TEXT, 0))
 
+    def test_batch(self):
+        # test batched recognition keeps input order
+        texts = self.speech2text.recognize_batch([TEST_WAV, TEST_WAV_2, TEST_WAV])
+        self.assertEqual(len(texts), 3)
+        self.assertEqual(texts[0], texts[2])
+        self.assertTrue(string_match_with_percentage(texts[0], TEST_WAV_TEXT, 0))
+        self.assertTrue(string_match_with_percentage(texts[1], TEST_WAV_TEXT_2, 0))
+
     def test_is_long_audio_working(self):
         """Test Bangla Speech2Text"""
 
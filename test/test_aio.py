@@ -0,0 +1,125 @@
+import unittest
+import asyncio
+import os
+import sys
+import threading
+import time
+
+current_dir = os.path.dirname(os.path.realpath(__file__))
+previous_path = os.path.abspath(os.path.dirname(current_dir))
+sys.path.append(previous_path)
+
+from banglaspeech2text.aio import AsyncRecognizer, Overloaded
+
+
+class Segment:
+    def __init__(self, text):
+        self.text = text
+
+
+class FakeSpeech2Text:
+    """Yields one segment per item of `audio`, slowly, like a real decoder."""
+
+    num_workers = 2
+    metrics = None
+
+    def __init__(self, delay=0.02):
+        self.delay = delay
+        self.active = 0
+        self.peak = 0
+        self.decoded = 0
+        self.closed = threading.Event()
+        self._lock = threading.Lock()
+
+    def recognize(self, audio, return_segments=False, **kw):
+        def segments():
+            with self._lock:
+                self.active += 1
+                self.peak = max(self.peak, self.active)
+            try:
+                for item in audio:
+                    time.sleep(self.delay)
+                    if item == "error":
+                        raise ValueError("bad audio")
+                    self.decoded += 1
+                    yield Segment(item)
+            finally:
+                with self._lock:
+                    self.active -= 1
+                self.closed.set()
+
+        return segments()
+
+
+class TestAsyncRecognizer(unittest.IsolatedAsyncioTestCase):
+    """Tests for the asyncio API."""
+
+    async def test_recognize(self):
+        recognizer = AsyncRecognizer(FakeSpeech2Text())
+        self.assertEqual(await recognizer.recognize([" a", " b"]), " a b")
+        segments = await recognizer.recognize([" a"], return_segments=True)
+        self.assertEqual([s.text for s in segments], [" a"])
+        recognizer.close()
+
+    async def test_concurrency_limit(self):
+        stt = FakeSpeech2Text()
+        recognizer = AsyncRecognizer(stt, max_concurrency=2)
+        texts = await asyncio.gather(
+            *[recognizer.recognize([f" {i}"] * 3) for i in range(6)]
+        )
+        self.assertEqual(texts[5], " 5 5 5")
+        self.assertEqual(stt.peak, 2)
+        await asyncio.sleep(0.1)  # worker threads finish after their last segment
+        self.assertEqual(recognizer.active, 0)
+        recognizer.close()
+
+    async def test_stream_and_backpressure(self):
+        stt = FakeSpeech2Text(delay=0.001)
+        recognizer = AsyncRecognizer(stt, max_buffered=2)
+        stream = recognizer.recognize_stream([" x"] * 50)
+        first = await stream.__anext__()
+        await asyncio.sleep(0.3)
+        self.assertEqual(first.text, " x")
+        # the worker waits for the consumer instead of decoding everything
+        self.assertLessEqual(stt.decoded, 4)
+        await stream.aclose()
+        self.assertTrue(
+            await asyncio.get_running_loop().run_in_executor(None, stt.closed.wait, 2)
+        )
+        recognizer.close()
+
+    async def test_cancel(self):
+        stt = FakeSpeech2Text(delay=0.05)
+        recognizer = AsyncRecognizer(stt)
+        task = asyncio.ensure_future(recognizer.recognize([" y"] * 100))
+        await asyncio.sleep(0.2)
+        task.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await task
+        self.assertTrue(
+            await asyncio.get_running_loop().run_in_executor(None, stt.closed.wait, 2)
+        )
+        self.assertLess(stt.decoded, 100)
+        recognizer.close()
+
+    async def test_error(self):
+        recognizer = AsyncRecognizer(FakeSpeech2Text())
+        with self.assertRaises(ValueError):
+            await recognizer.recognize([" a", "error"])
+        recognizer.close()
+
+    async def test_overloaded(self):
+        recognizer = AsyncRecognizer(
+            FakeSpeech2Text(delay=0.05), max_concurrency=1, max_pending=1
+        )
+        running = asyncio.ensure_future(recognizer.recognize([" a"] * 4))
+        waiting = asyncio.ensure_future(recognizer.recognize([" b"]))
+        await asyncio.sleep(0.01)
+        with self.assertRaises(Overloaded):
+            await recognizer.recognize([" c"])
+        await asyncio.gather(running, waiting)
+        recognizer.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
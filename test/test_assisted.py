@@ -0,0 +1,119 @@
+import unittest
+import math
+import os
+import sys
+
+import numpy as np
+
+current_dir = os.path.dirname(os.path.realpath(__file__))
+previous_path = os.path.abspath(os.path.dirname(current_dir))
+sys.path.append(previous_path)
+
+from banglaspeech2text.assisted import AssistedSpeech2Text, check_compatible
+from banglaspeech2text.bench import synthetic_audio
+
+VOCAB_SIZE = 51865
+
+
+class FakeTokenizer:
+    def get_vocab(self):
+        return {f"t{i}": i for i in range(VOCAB_SIZE)}
+
+    def decode(self, tokens, skip_special_tokens=False):
+        return "".join(f" t{t}" for t in tokens if t < 50257)
+
+
+class FakeProcessor:
+    def __init__(self):
+        from transformers import WhisperFeatureExtractor  # type: ignore
+
+        self.feature_extractor = WhisperFeatureExtractor()
+        self.tokenizer = FakeTokenizer()
+
+
+def tiny_whisper(seed, num_mel_bins=80, noise=0.0):
+    import torch  # type: ignore
+    from transformers import WhisperConfig, WhisperForConditionalGeneration  # type: ignore
+
+    torch.manual_seed(seed)
+    config = WhisperConfig(
+        vocab_size=VOCAB_SIZE,
+        d_model=64,
+        encoder_layers=1,
+        decoder_layers=2,
+        encoder_attention_heads=2,
+        decoder_attention_heads=2,
+        encoder_ffn_dim=128,
+        decoder_ffn_dim=128,
+        num_mel_bins=num_mel_bins,
+        decoder_start_token_id=50258,
+        eos_token_id=50257,
+        pad_token_id=50257,
+        bos_token_id=50257,
+        suppress_tokens=[],
+        begin_suppress_tokens=[220, 50257],
+    )
+    model = WhisperForConditionalGeneration(config).eval()
+    generation = model.generation_config
+    generation.lang_to_id = {"<|en|>": 50259, "<|bn|>": 50302}
+    generation.task_to_id = {"translate": 50358, "transcribe": 50359}
+    generation.no_timestamps_token_id = 50363
+    generation.is_multilingual = True
+    with torch.no_grad():
+        for parameter in model.parameters():
+            parameter.add_(noise * torch.randn_like(parameter))
+    return model
+
+
+class TestAssistedSpeech2Text(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        try:
+            import torch  # noqa: F401
+            import transformers  # noqa: F401
+        except ImportError:
+            raise unittest.SkipTest("torch and transformers are not installed")
+        cls.stt = AssistedSpeech2Text(
+            tiny_whisper(0),
+            tiny_whisper(0, noise=0.01),
+            processor=FakeProcessor(),
+            num_assistant_tokens=4,
+        )
+
+    def test_same_output_as_greedy(self):
+        audio = synthetic_audio(5, seed=3)
+        assisted = self.stt.generate(audio, max_new_tokens=24)
+        greedy = self.stt.generate(audio, assisted=False, max_new_tokens=24)
+        self.assertEqual(assisted, greedy)
+
+    def test_long_audio_is_windowed(self):
+        audio = synthetic_audio(45, seed=4)
+        segments = self.stt.recognize(audio, return_segments=True, max_new_tokens=4)
+        self.assertEqual(len(segments), 2)
+        self.assertEqual(segments[0].start, 0.0)
+        self.assertAlmostEqual(segments[1].end, 45.0)
+        self.assertLessEqual(segments[0].end, 30.0)
+
+    def test_segment_confidence(self):
+        from faster_whisper.transcribe import get_compression_ratio
+
+        audio = synthetic_audio(5, seed=5)
+        segment = self.stt.recognize(audio, return_segments=True, max_new_tokens=8)[0]
+        greedy = self.stt.recognize(
+            audio, return_segments=True, assisted=False, max_new_tokens=8
+        )[0]
+        self.assertLess(segment.avg_logprob, 0.0)
+        self.assertAlmostEqual(segment.avg_logprob, greedy.avg_logprob, places=4)
+        self.assertEqual(segment.compression_ratio, get_compression_ratio(segment.text))
+        self.assertTrue(math.isnan(segment.no_speech_prob))
+
+    def test_incompatible_draft(self):
+        tokenizer = FakeTokenizer()
+        with self.assertRaisesRegex(ValueError, "mel bins"):
+            check_compatible(
+                self.stt.model, tiny_whisper(1, num_mel_bins=128), tokenizer, tokenizer
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+import unittest
+import os
+import io
+import sys
+import wave
+
+import numpy as np
+
+current_dir = os.path.dirname(os.path.realpath(__file__))
+TEST_WAV = os.path.join(current_dir, "test.wav")
+TEST_WAV_2 = os.path.join(current_dir, "test2.wav")
+
+previous_path = os.path.abspath(os.path.dirname(current_dir))
+sys.path.append(previous_path)
+
+from banglaspeech2text.utils.audio import load_audio, pcm16_to_float32
+
+
+class TestInMemoryAudio(unittest.TestCase):
+    """Tests for in-memory audio decoding."""
+
+    def setUp(self):
+        with open(TEST_WAV, "rb") as f:
+            self.wav_bytes = f.read()
+        with wave.open(TEST_WAV, "rb") as wf:
+            self.n_frames = wf.getnframes()
+
+    def test_pcm16_to_float32(self):
+        pcm = np.array([0, 16384, -32768], dtype="<i2").tobytes()
+        audio = pcm16_to_float32(pcm)
+        self.assertEqual(audio.dtype, np.float32)
+        np.testing.assert_allclose(audio, [0.0, 0.5, -1.0])
+
+    def test_with_bytes(self):
+        audio = load_audio(self.wav_bytes)
+        self.assertEqual(audio.dtype, np.float32)
+        self.assertEqual(audio.shape, (self.n_frames,))
+
+    def test_with_io(self):
+        audio = load_audio(io.BytesIO(self.wav_bytes))
+        np.testing.assert_array_equal(audio, load_audio(self.wav_bytes))
+
+    def test_resampled_to_16k(self):
+        with open(TEST_WAV_2, "rb") as f:
+            data = f.read()
+        with wave.open(TEST_WAV_2, "rb") as wf:
+            duration = wf.getnframes() / wf.getframerate()
+        audio = load_audio(data)
+        self.assertAlmostEqual(audio.shape[0] / 16000, duration, places=1)
+
+    def test_passthrough(self):
+        self.assertEqual(load_audio(TEST_WAV), TEST_WAV)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+import unittest
+import json
+import os
+import sys
+import tempfile
+from types import SimpleNamespace
+
+current_dir = os.path.dirname(os.path.realpath(__file__))
+TEST_WAV = os.path.join(current_dir, "test.wav")
+TEST_WAV_2 = os.path.join(current_dir, "test2.wav")
+
+previous_path = os.path.abspath(os.path.dirname(current_dir))
+sys.path.append(previous_path)
+
+from banglaspeech2text.batch import (
+    BatchTranscriber,
+    iter_audio_files,
+    read_done,
+    read_manifest,
+)
+
+
+class FakeFeatureExtractor:
+    sampling_rate = 16000
+
+
+class FakeStt:
+    feature_extractor = FakeFeatureExtractor()
+
+    def __init__(self):
+        self.calls = 0
+
+    def recognize(self, audio, return_segments=False, **kw):
+        self.calls += 1
+        return [SimpleNamespace(start=0.0, end=1.0, text="text")]
+
+
+class TestBatchInputs(unittest.TestCase):
+    """Tests for batch input expansion and resume."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, name, text):
+        path = os.path.join(self.tmp.name, name)
+        with open(path, "w") as f:
+            f.write(text)
+        return path
+
+    def test_directory_and_glob(self):
+        files = list(
+            iter_audio_files([current_dir, os.path.join(current_dir, "*.wav")])
+        )
+        self.assertEqual(sorted(files), sorted([TEST_WAV, TEST_WAV_2]))
+
+    def test_manifests(self):
+        csv_path = self.write("m.csv", f"label,path\na,{TEST_WAV}\nb,x.wav\n")
+        self.assertEqual(
+            read_manifest(csv_path), [TEST_WAV, os.path.join(self.tmp.name, "x.wav")]
+        )
+
+        jsonl_path = self.write("m.jsonl", json.dumps({"audio": TEST_WAV_2}) + "\n")
+        self.assertEqual(read_manifest(jsonl_path), [TEST_WAV_2])
+
+        bad = self.write("bad.jsonl", '{"path": "a.wav"}\n{"text": "x"}\n')
+        with self.assertRaisesRegex(ValueError, "bad.jsonl:2"):
+            read_manifest(bad)
+
+    def test_read_done(self):
+        output = self.write(
+            "out.jsonl",
+            json.dumps({"path": "a.wav", "text": ""})
+            + "\n"
+            + json.dumps({"path": "b.wav", "error": "boom"})
+            + "\n"
+            + '{"path": "c.wa'
+            + "\n"
+            + json.dumps({"text": "no path"})
+            + "\n",
+        )
+        self.assertEqual(read_done(output), {"a.wav"})
+
+    def test_resume_after_truncated_line(self):
+        output = self.write(
+            "out.jsonl",
+            json.dumps({"path": TEST_WAV, "text": ""}) + "\n" + '{"path": "x',
+        )
+        stt = FakeStt()
+        stats = BatchTranscriber(stt, workers=1).run([TEST_WAV, TEST_WAV_2], output)
+        self.assertEqual((stats.files, stats.skipped, stt.calls), (1, 1, 1))
+
+        with open(output, encoding="utf-8") as f:
+            records = [json.loads(line) for line in f]
+        self.assertEqual([r["path"] for r in records], [TEST_WAV, TEST_WAV_2])
+        self.assertEqual(read_done(output), {TEST_WAV, TEST_WAV_2})
+
+
+if __name__ == "__main__":
+    unittest.main()
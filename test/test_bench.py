@@ -0,0 +1,63 @@
+import unittest
+import json
+import os
+import sys
+import tempfile
+
+import numpy as np
+
+current_dir = os.path.dirname(os.path.realpath(__file__))
+previous_path = os.path.abspath(os.path.dirname(current_dir))
+sys.path.append(previous_path)
+
+from banglaspeech2text.bench import (
+    BenchConfig,
+    BenchResult,
+    peak_rss_mb,
+    sweep,
+    synthetic_audio,
+    write_results,
+)
+
+
+class TestBench(unittest.TestCase):
+    """Tests for the benchmark helpers that do not need a model."""
+
+    def test_synthetic_audio(self):
+        audio = synthetic_audio(2.5, seed=1)
+        self.assertEqual(audio.shape, (40000,))
+        self.assertEqual(audio.dtype, np.float32)
+        self.assertLessEqual(np.abs(audio).max(), 1.0)
+        np.testing.assert_array_equal(audio, synthetic_audio(2.5, seed=1))
+
+    def test_sweep(self):
+        configs = sweep("base", ["int8", "float32"], [1, 2], [1], [1, 5])
+        self.assertEqual(len(configs), 8)
+        self.assertEqual(configs[0], BenchConfig("base", "int8", 1, 1, 1))
+
+    def test_write_results(self):
+        result = BenchResult(
+            config=BenchConfig("base", "int8"),
+            load_seconds=1.0,
+            first_segment_seconds=0.5,
+            audio_seconds=20.0,
+            wall_seconds=5.0,
+            clips=4,
+            peak_rss_mb=peak_rss_mb(),
+        )
+        self.assertEqual(result.rtf, 0.25)
+        self.assertEqual(result.clips_per_second, 0.8)
+        self.assertGreater(result.peak_rss_mb, 0)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "bench.json")
+            write_results([result], path)
+            with open(path) as f:
+                data = json.load(f)
+        self.assertIn("environment", data)
+        self.assertEqual(data["results"][0]["compute_type"], "int8")
+        self.assertEqual(data["results"][0]["rtf"], 0.25)
+
+
+if __name__ == "__main__":
+    unittest.main()
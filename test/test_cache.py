@@ -0,0 +1,113 @@
+import unittest
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+current_dir = os.path.dirname(os.path.realpath(__file__))
+previous_path = os.path.abspath(os.path.dirname(current_dir))
+sys.path.append(previous_path)
+
+from banglaspeech2text.utils.cache import TranscriptionCache
+
+
+def segment(text, start=0.0, end=1.0):
+    from faster_whisper.transcribe import Segment
+
+    return Segment(
+        id=1,
+        seek=0,
+        start=start,
+        end=end,
+        text=text,
+        tokens=[1, 2],
+        avg_logprob=-0.1,
+        compression_ratio=1.0,
+        no_speech_prob=0.0,
+        words=None,
+        temperature=0.0,
+    )
+
+
+class TestTranscriptionCache(unittest.TestCase):
+    """Tests for the on-disk transcription cache."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "cache.sqlite")
+        self.audio = np.random.RandomState(0).rand(16000).astype(np.float32)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_key(self):
+        key = TranscriptionCache.make_key(self.audio, "m", "int8", beam_size=5)
+        self.assertEqual(
+            key,
+            TranscriptionCache.make_key(self.audio.copy(), "m", "int8", beam_size=5),
+        )
+        self.assertNotEqual(
+            key, TranscriptionCache.make_key(self.audio, "m", "int8", beam_size=1)
+        )
+        self.assertNotEqual(
+            key, TranscriptionCache.make_key(self.audio[1:], "m", "int8", beam_size=5)
+        )
+
+    def test_hit_and_miss(self):
+        cache = TranscriptionCache(self.path)
+        self.assertIsNone(cache.get("k"))
+        cache.put("k", [segment("ব্যাংক", 0.5, 1.5)])
+
+        cached = cache.get("k")
+        self.assertEqual(cached[0].text, "ব্যাংক")
+        self.assertEqual((cached[0].start, cached[0].end), (0.5, 1.5))
+        self.assertEqual(cache.stats()["hits"], 1)
+        self.assertEqual(cache.stats()["misses"], 1)
+
+        # persisted across instances
+        cache.close()
+        self.assertIsNotNone(TranscriptionCache(self.path).get("k"))
+
+    def test_eviction(self):
+        # room for two entries
+        cache = TranscriptionCache(self.path, max_bytes=400)
+        cache.put("a", [segment("a")])
+        time.sleep(0.02)
+        cache.put("b", [segment("b")])
+        time.sleep(0.02)
+        cache.get("a")
+        time.sleep(0.02)
+        cache.put("c", [segment("c")])
+        self.assertIsNone(cache.get("b"))
+        self.assertIsNotNone(cache.get("a"))
+
+        cache = TranscriptionCache(self.path, max_age=0.01)
+        time.sleep(0.02)
+        self.assertIsNone(cache.get("a"))
+
+    def test_lookups_do_not_write(self):
+        cache = TranscriptionCache(self.path)
+        cache.put("a", [segment("a")])
+        cache.put("a", [segment("aa")])
+        cache.put("b", [segment("b")])
+        changes = cache._db.total_changes
+        self.assertIsNotNone(cache.get("a"))
+        self.assertEqual(cache._db.total_changes, changes)
+
+        size = cache._db.execute("SELECT SUM(size) FROM results").fetchone()[0]
+        self.assertEqual(cache.stats()["bytes"], size)
+        cache.close()
+
+        # the access time was written on close, and the size is counted on open
+        reopened = TranscriptionCache(self.path)
+        accessed = reopened._db.execute(
+            "SELECT key FROM results ORDER BY accessed DESC"
+        ).fetchone()[0]
+        self.assertEqual(accessed, "a")
+        self.assertEqual(reopened.stats()["bytes"], size)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,122 @@
+import unittest
+import os
+import sys
+from dataclasses import dataclass, field
+from typing import List
+
+import numpy as np
+
+current_dir = os.path.dirname(os.path.realpath(__file__))
+previous_path = os.path.abspath(os.path.dirname(current_dir))
+sys.path.append(previous_path)
+
+from banglaspeech2text.cascade import CascadeRecognizer, Thresholds
+from banglaspeech2text.metrics import Metrics
+
+SR = 16000
+
+
+@dataclass
+class Segment:
+    id: int
+    start: float
+    end: float
+    text: str
+    avg_logprob: float = -0.1
+    no_speech_prob: float = 0.0
+    compression_ratio: float = 1.0
+    words: list = None
+
+
+@dataclass
+class FakeModel:
+    """Returns one segment per second; `bad` seconds get a low avg_logprob."""
+
+    name: str
+    bad: set = field(default_factory=set)
+    calls: List[float] = field(default_factory=list)
+
+    @property
+    def model_path(self):
+        return self.name
+
+    def _load_array(self, audio):
+        return np.asarray(audio, dtype=np.float32)
+
+    def recognize(self, audio, return_segments=False, **kw):
+        seconds = audio.shape[0] / SR
+        self.calls.append(seconds)
+        segments = []
+        for i in range(int(round(seconds))):
+            segments.append(
+                Segment(
+                    id=i + 1,
+                    start=float(i),
+                    end=float(i + 1),
+                    text=f" {self.name}{i}",
+                    avg_logprob=-2.0 if i in self.bad else -0.1,
+                )
+            )
+        return segments
+
+
+class TestCascade(unittest.TestCase):
+    def test_confident_input_is_not_escalated(self):
+        large = FakeModel("large")
+        cascade = CascadeRecognizer([FakeModel("tiny"), large])
+        self.assertEqual(cascade.recognize(np.zeros(3 * SR)), " tiny0 tiny1 tiny2")
+        self.assertEqual(large.calls, [])
+        self.assertEqual(cascade.stats.escalation_rate, 0.0)
+
+    def test_failing_segment_is_escalated(self):
+        large = FakeModel("large")
+        metrics = Metrics()
+        cascade = CascadeRecognizer(
+            [FakeModel("tiny", bad={1}), large], padding_s=0.0, metrics=metrics
+        )
+        segments = cascade.recognize(np.zeros(3 * SR), return_segments=True)
+        self.assertEqual([s.text for s in segments], [" tiny0", " large0", " tiny2"])
+        self.assertEqual([s.start for s in segments], [0.0, 1.0, 2.0])
+        self.assertEqual([s.id for s in segments], [1, 2, 3])
+        self.assertEqual(large.calls, [1.0])
+        stats = cascade.stats.to_dict()
+        self.assertEqual(stats["escalated_segments"], 1)
+        self.assertEqual(stats["escalation_rate"], 1.0)
+        self.assertEqual(stats["audio_seconds"], {"tiny": 3.0, "large": 1.0})
+        self.assertIn("cascade_escalations_total", metrics.render())
+
+    def test_whole_clip_escalation(self):
+        large = FakeModel("large")
+        cascade = CascadeRecognizer(
+            [FakeModel("tiny", bad={0}), large], per_segment=False
+        )
+        self.assertEqual(cascade.recognize(np.zeros(2 * SR)), " large0 large1")
+        self.assertEqual(large.calls, [2.0])
+
+    def test_no_speech_is_escalated(self):
+        large = FakeModel("large")
+        cascade = CascadeRecognizer([FakeModel("tiny"), large])
+        cascade.recognize(np.zeros(SR // 4))
+        self.assertEqual(len(large.calls), 1)
+        self.assertEqual(cascade.stats.escalated_requests, 1)
+
+    def test_models_load_lazily(self):
+        created = []
+
+        def factory(name, **kw):
+            created.append(name)
+            return FakeModel(name)
+
+        cascade = CascadeRecognizer(["/models/a", "/models/b"], factory=factory)
+        cascade.recognize(np.zeros(SR))
+        self.assertEqual(created, ["/models/a"])
+
+    def test_thresholds(self):
+        thresholds = Thresholds()
+        self.assertTrue(thresholds.passes(Segment(1, 0, 1, "")))
+        self.assertFalse(thresholds.passes(Segment(1, 0, 1, "", no_speech_prob=0.9)))
+        self.assertFalse(thresholds.passes(Segment(1, 0, 1, "", compression_ratio=3.0)))
+
+
+if __name__ == "__main__":
+    unittest.main()
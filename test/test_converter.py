@@ -0,0 +1,79 @@
+import unittest
+import os
+import sys
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+current_dir = os.path.dirname(os.path.realpath(__file__))
+previous_path = os.path.abspath(os.path.dirname(current_dir))
+sys.path.append(previous_path)
+
+from banglaspeech2text.utils import converter
+
+
+def fake_convert(model_name, output_dir, compute_type):
+    os.makedirs(output_dir)
+    for name in ("model.bin", "config.json", "vocabulary.json"):
+        with open(os.path.join(output_dir, name), "w") as f:
+            f.write(name)
+    return True
+
+
+class TestConversionCache(unittest.TestCase):
+    """Tests for atomic conversion and cache verification."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache_dir = Path(self.tmp.name)
+        self.model_dir = self.cache_dir / "org--model-ct2-int8"
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_convert_once(self):
+        with mock.patch.object(
+            converter, "convert_model", side_effect=fake_convert
+        ) as convert:
+            path = converter.get_ct2_model_path("org/model", self.cache_dir, "int8")
+            converter.get_ct2_model_path("org/model", self.cache_dir, "int8")
+
+        self.assertEqual(convert.call_count, 1)
+        self.assertEqual(path, str(self.model_dir))
+        self.assertTrue(converter.verify_manifest(self.model_dir))
+        leftovers = [p for p in os.listdir(self.cache_dir) if ".tmp-" in p]
+        self.assertEqual(leftovers, [])
+
+    def test_incomplete_model_is_reconverted(self):
+        # a conversion killed halfway: no manifest
+        self.model_dir.mkdir()
+        (self.model_dir / "config.json").write_text("{}")
+        self.assertFalse(converter.verify_manifest(self.model_dir))
+
+        with mock.patch.object(converter, "convert_model", side_effect=fake_convert):
+            converter.get_ct2_model_path("org/model", self.cache_dir, "int8")
+        self.assertTrue((self.model_dir / "model.bin").exists())
+
+        # truncated file after the manifest was written
+        (self.model_dir / "model.bin").write_text("x")
+        self.assertFalse(converter.verify_manifest(self.model_dir))
+
+    def test_legacy_model_is_adopted(self):
+        # converted by a version that wrote no manifest
+        fake_convert("org/model", str(self.model_dir), "int8")
+        (self.model_dir / "config.json").write_text("{}")
+        with mock.patch.object(converter, "convert_model") as convert:
+            path = converter.get_ct2_model_path("org/model", self.cache_dir, "int8")
+        convert.assert_not_called()
+        self.assertEqual(path, str(self.model_dir))
+        self.assertTrue(converter.verify_manifest(self.model_dir))
+
+    def test_failed_conversion_leaves_nothing(self):
+        with mock.patch.object(converter, "convert_model", return_value=False):
+            with self.assertRaises(RuntimeError):
+                converter.get_ct2_model_path("org/model", self.cache_dir, "int8")
+        self.assertFalse(self.model_dir.exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+import unittest
+import os
+import sys
+
+import numpy as np
+
+current_dir = os.path.dirname(os.path.realpath(__file__))
+previous_path = os.path.abspath(os.path.dirname(current_dir))
+sys.path.append(previous_path)
+
+from banglaspeech2text.bench import synthetic_audio
+from banglaspeech2text.features import (
+    AudioFeatures,
+    CachingFeatureExtractor,
+    FeatureCache,
+)
+
+
+class CountingExtractor:
+    def __init__(self):
+        from faster_whisper.feature_extractor import FeatureExtractor
+
+        self.extractor = FeatureExtractor()
+        self.calls = 0
+
+    def __call__(self, waveform, padding=160, chunk_length=None):
+        self.calls += 1
+        return self.extractor(waveform, padding=padding, chunk_length=chunk_length)
+
+    def __getattr__(self, name):
+        return getattr(self.extractor, name)
+
+
+class TestFeatureCache(unittest.TestCase):
+    def test_lru_eviction(self):
+        cache = FeatureCache(max_bytes=2 * 400)
+        for key in "abc":
+            cache.put(key, np.zeros(100, dtype=np.float32))
+            cache.get("a")
+        self.assertIsNotNone(cache.get("a"))
+        self.assertIsNone(cache.get("b"))
+        stats = cache.stats()
+        self.assertEqual((stats["entries"], stats["bytes"]), (2, 800))
+
+    def test_entries_are_read_only(self):
+        cache = FeatureCache()
+        cache.put("a", np.zeros(4, dtype=np.float32))
+        with self.assertRaises(ValueError):
+            cache.get("a")[0] = 1.0
+
+
+class TestCachingFeatureExtractor(unittest.TestCase):
+    def setUp(self):
+        self.inner = CountingExtractor()
+        self.audio = synthetic_audio(3, seed=1)
+
+    def test_precomputed_features(self):
+        extractor = CachingFeatureExtractor(self.inner)
+        mel = extractor(self.audio)
+        features = AudioFeatures(self.audio, mel, "key", 3.0)
+        with extractor.use(features):
+            self.assertIs(extractor(self.audio), mel)
+            # only the very same array is answered from the features
+            extractor(self.audio.copy())
+        extractor(self.audio)
+        self.assertEqual(self.inner.calls, 3)
+
+    def test_cache_by_content(self):
+        extractor = CachingFeatureExtractor(self.inner, FeatureCache())
+        mel = extractor(self.audio)
+        np.testing.assert_array_equal(extractor(self.audio.copy()), mel)
+        extractor(self.audio, chunk_length=10)
+        self.assertEqual(self.inner.calls, 2)
+        self.assertEqual(extractor.cache.stats()["hits"], 1)
+
+    def test_chunk_length_is_applied_on_hit(self):
+        extractor = CachingFeatureExtractor(self.inner, FeatureCache())
+        extractor(self.audio, chunk_length=10)
+        extractor(synthetic_audio(3, seed=2), chunk_length=20)
+        extractor(self.audio, chunk_length=10)
+        self.assertEqual(self.inner.calls, 2)
+        self.assertEqual(extractor.nb_max_frames, 1000)
+
+
+if __name__ == "__main__":
+    unittest.main()
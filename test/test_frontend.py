@@ -0,0 +1,116 @@
+import unittest
+import io
+import os
+import sys
+import struct
+import wave
+
+import numpy as np
+
+current_dir = os.path.dirname(os.path.realpath(__file__))
+TEST_WAV_2 = os.path.join(current_dir, "test2.wav")
+
+previous_path = os.path.abspath(os.path.dirname(current_dir))
+sys.path.append(previous_path)
+
+from banglaspeech2text.utils.audio import load_batch
+from banglaspeech2text.utils.frontend import (
+    StreamResampler,
+    decode_pcm,
+    decode_wav,
+    decode_wav_batch,
+    parse_wav,
+    resample,
+    to_mono,
+)
+
+
+def make_wav(pcm: np.ndarray, rate: int, width: int = 2) -> bytes:
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wf:
+        wf.setnchannels(pcm.shape[1] if pcm.ndim == 2 else 1)
+        wf.setsampwidth(width)
+        wf.setframerate(rate)
+        wf.writeframes(pcm.tobytes())
+    return buffer.getvalue()
+
+
+def float_wav(samples: np.ndarray, rate: int) -> bytes:
+    data = samples.astype("<f4").tobytes()
+    fmt = struct.pack("<HHIIHH", 3, 1, rate, rate * 4, 4, 32)
+    body = b"WAVE" + b"fmt " + struct.pack("<I", 16) + fmt
+    body += b"data" + struct.pack("<I", len(data)) + data
+    return b"RIFF" + struct.pack("<I", len(body)) + body
+
+
+def sine(rate: int, seconds: float = 1.0, freq: float = 440.0) -> np.ndarray:
+    t = np.arange(int(rate * seconds)) / rate
+    return np.sin(2 * np.pi * freq * t).astype(np.float32)
+
+
+class TestParse(unittest.TestCase):
+    def test_stereo_mixdown(self):
+        pcm = np.array([[16384, 0], [-32768, -32768]], dtype="<i2")
+        frames, rate = parse_wav(make_wav(pcm, 8000))
+        self.assertEqual((frames.shape, rate), ((2, 2), 8000))
+        np.testing.assert_allclose(to_mono(frames), [0.25, -1.0])
+
+    def test_sample_formats(self):
+        pcm24 = b"".join(v.to_bytes(3, "little", signed=True) for v in (0, -4194304))
+        frames, _ = parse_wav(make_wav(np.frombuffer(pcm24, np.uint8), 16000, 3))
+        np.testing.assert_allclose(to_mono(frames), [0.0, -0.5])
+        frames, _ = parse_wav(make_wav(np.array([128, 192], np.uint8), 16000, 1))
+        np.testing.assert_allclose(to_mono(frames), [0.0, 0.5])
+        frames, _ = parse_wav(float_wav(np.array([0.25, -0.5]), 16000))
+        np.testing.assert_allclose(to_mono(frames), [0.25, -0.5])
+
+    def test_not_wav(self):
+        with self.assertRaises(ValueError):
+            parse_wav(b"ID3" + b"\0" * 40)
+
+    def test_raw_pcm(self):
+        pcm = (sine(8000) * 32767).astype("<i2")
+        audio = decode_pcm(pcm.tobytes(), 8000)
+        self.assertEqual(audio.shape, (16000,))
+
+
+class TestResample(unittest.TestCase):
+    def test_sine(self):
+        for rate in (8000, 22050, 44100, 48000):
+            audio = resample(sine(rate), rate)
+            self.assertEqual(audio.dtype, np.float32)
+            self.assertEqual(audio.shape, (16000,))
+            error = np.abs(audio - sine(16000))[100:-100].max()
+            self.assertLess(error, 5e-3, rate)
+
+    def test_same_rate(self):
+        audio = sine(16000)
+        self.assertIs(resample(audio, 16000), audio)
+
+    def test_stream_matches_offline(self):
+        audio = sine(44100, 0.5)
+        resampler = StreamResampler(44100)
+        parts = [resampler.feed(chunk) for chunk in np.array_split(audio, 9)]
+        parts.append(resampler.flush())
+        np.testing.assert_allclose(
+            np.concatenate(parts), resample(audio, 44100), atol=1e-6
+        )
+
+    def test_batch(self):
+        clips = [make_wav((sine(48000) * 20000).astype("<i2"), 48000)] * 2
+        clips.append(make_wav((sine(8000, 0.3) * 20000).astype("<i2"), 8000))
+        batch = decode_wav_batch(clips)
+        for clip, audio in zip(clips, batch):
+            np.testing.assert_allclose(audio, decode_wav(clip), atol=1e-6)
+
+    def test_load_batch(self):
+        with open(TEST_WAV_2, "rb") as f:
+            data = f.read()
+        audios = load_batch([data, io.BytesIO(data), "audio.mp3"])
+        self.assertEqual(audios[2], "audio.mp3")
+        np.testing.assert_array_equal(audios[0], audios[1])
+        np.testing.assert_allclose(audios[0], decode_wav(data), atol=1e-6)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,32 @@
+import unittest
+import os
+import subprocess
+import sys
+
+current_dir = os.path.dirname(os.path.realpath(__file__))
+previous_path = os.path.abspath(os.path.dirname(current_dir))
+
+HEAVY_MODULES = ["torch", "faster_whisper", "ctranslate2", "requests", "yaml"]
+
+IMPORT_SCRIPT = f"""
+import sys
+sys.path.insert(0, {previous_path!r})
+import banglaspeech2text
+from banglaspeech2text.utils.models import nice_model_list
+nice_model_list()
+loaded = [m for m in {HEAVY_MODULES!r} if m in sys.modules]
+print(",".join(loaded))
+"""
+
+
+class TestImportTime(unittest.TestCase):
+    """The package and model listing stay lightweight to import."""
+
+    def test_no_heavy_imports(self):
+        output = subprocess.check_output([sys.executable, "-c", IMPORT_SCRIPT])
+        loaded = output.decode().strip()
+        self.assertEqual(loaded, "", f"heavy modules imported eagerly: {loaded}")
+
+
+if __name__ == "__main__":
+    unittest.main()
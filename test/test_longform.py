@@ -0,0 +1,89 @@
+import unittest
+import os
+import sys
+
+import numpy as np
+
+current_dir = os.path.dirname(os.path.realpath(__file__))
+previous_path = os.path.abspath(os.path.dirname(current_dir))
+sys.path.append(previous_path)
+
+from banglaspeech2text.longform import plan_chunks, stitch_segments
+from banglaspeech2text.utils.vad import speech_regions
+
+
+def segment(text, start, end):
+    from faster_whisper.transcribe import Segment
+
+    return Segment(
+        id=1,
+        seek=0,
+        start=start,
+        end=end,
+        text=text,
+        tokens=[],
+        avg_logprob=-0.1,
+        compression_ratio=1.0,
+        no_speech_prob=0.0,
+        words=None,
+        temperature=0.0,
+    )
+
+
+class TestPlanChunks(unittest.TestCase):
+    """Tests for grouping speech regions into bounded chunks."""
+
+    def setUp(self):
+        self.audio = np.random.RandomState(0).rand(100).astype(np.float32)
+
+    def test_merge_regions(self):
+        regions = [(0, 10), (15, 25), (40, 50), (55, 80)]
+        self.assertEqual(
+            plan_chunks(self.audio, regions, 30), [(0, 25), (40, 50), (55, 80)]
+        )
+
+    def test_split_long_region(self):
+        audio = np.ones(16000 * 70, dtype=np.float32)
+        audio[16000 * 20 : 16000 * 20 + 160] = 0.0  # a pause at 20 s
+        chunks = plan_chunks(audio, [(0, audio.shape[0])], 16000 * 30, 16000)
+
+        self.assertEqual(chunks[0], (0, 16000 * 20 + 80 + 8000))
+        self.assertEqual(chunks[1][0], 16000 * 20 + 80 - 8000)
+        self.assertEqual(chunks[-1][1], audio.shape[0])
+        for start, end in chunks:
+            self.assertLessEqual(end - start, 16000 * 30)
+
+    def test_invalid_overlap(self):
+        with self.assertRaises(ValueError):
+            plan_chunks(self.audio, [], 30, 20)
+
+    def test_silence_has_no_speech(self):
+        self.assertEqual(speech_regions(np.zeros(16000 * 3, dtype=np.float32)), [])
+
+
+class TestStitchSegments(unittest.TestCase):
+    """Tests for joining per-chunk segments."""
+
+    def test_offsets(self):
+        chunks = [(0, 16000), (32000, 48000)]
+        results = [[segment(" ek", 0.0, 1.0)], [segment(" dui", 0.2, 0.9)]]
+        stitched = stitch_segments(chunks, results, 16000)
+
+        self.assertEqual([s.id for s in stitched], [1, 2])
+        self.assertEqual((stitched[1].start, stitched[1].end), (2.2, 2.9))
+
+    def test_overlap(self):
+        # chunks overlap between 9 s and 11 s, boundary at 10 s
+        chunks = [(0, 16000 * 11), (16000 * 9, 16000 * 20)]
+        results = [
+            [segment(" a b c", 0.0, 9.5), segment(" d e", 10.2, 11.0)],
+            [segment(" b c f g", 0.1, 4.0)],
+        ]
+        stitched = stitch_segments(chunks, results, 16000)
+
+        self.assertEqual([s.text for s in stitched], [" a b c", " f g"])
+        self.assertEqual(stitched[1].start, 9.1)
+
+
+if __name__ == "__main__":
+    unittest.main()
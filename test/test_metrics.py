@@ -0,0 +1,72 @@
+import unittest
+import os
+import sys
+
+current_dir = os.path.dirname(os.path.realpath(__file__))
+previous_path = os.path.abspath(os.path.dirname(current_dir))
+sys.path.append(previous_path)
+
+from banglaspeech2text.metrics import Histogram, Metrics, TimedFeatureExtractor
+
+
+class TestMetrics(unittest.TestCase):
+    """Tests for the metrics registry and OpenMetrics output."""
+
+    def test_histogram_quantile(self):
+        h = Histogram([1.0, 2.0, 4.0])
+        for value in [0.5, 1.5, 1.5, 3.0]:
+            h.observe(value)
+        self.assertEqual(h.counts, [1, 2, 1, 0])
+        self.assertEqual(h.quantile(0.5), 1.5)
+        self.assertEqual(h.quantile(1.0), 4.0)
+        self.assertEqual(Histogram().quantile(0.99), 0.0)
+
+    def test_observe_and_callbacks(self):
+        seen = []
+        metrics = Metrics(callbacks=[lambda *args: seen.append(args)])
+        metrics.observe("stage_seconds", 0.2, stage="encode")
+        metrics.inc("tokens", 12)
+        metrics.inc("tokens", 3)
+        with metrics.time("stage_seconds", stage="decode"):
+            pass
+
+        self.assertEqual(metrics.histogram("stage_seconds", stage="encode").count, 1)
+        self.assertEqual(metrics.counter("tokens"), 15)
+        self.assertEqual(seen[0], ("stage_seconds", 0.2, {"stage": "encode"}))
+        self.assertEqual(len(seen), 4)
+
+    def test_failing_callback(self):
+        metrics = Metrics(callbacks=[lambda *args: 1 / 0])
+        metrics.inc("requests")
+        self.assertEqual(metrics.counter("requests"), 1)
+
+    def test_render(self):
+        metrics = Metrics(buckets=[0.1, 1.0])
+        metrics.observe("stage_seconds", 0.5, stage="encode")
+        metrics.inc("tokens", 7)
+        text = metrics.render()
+
+        self.assertIn("# TYPE bnstt_stage_seconds histogram", text)
+        self.assertIn('bnstt_stage_seconds_bucket{stage="encode",le="0.1"} 0', text)
+        self.assertIn('bnstt_stage_seconds_bucket{stage="encode",le="1.0"} 1', text)
+        self.assertIn('bnstt_stage_seconds_bucket{stage="encode",le="+Inf"} 1', text)
+        self.assertIn('bnstt_stage_seconds_count{stage="encode"} 1', text)
+        self.assertIn("bnstt_tokens_total 7.0", text)
+        self.assertTrue(text.endswith("# EOF\n"))
+
+    def test_timed_feature_extractor(self):
+        class FeatureExtractor:
+            sampling_rate = 16000
+
+            def __call__(self, audio):
+                return audio * 2
+
+        metrics = Metrics()
+        extractor = TimedFeatureExtractor(FeatureExtractor(), metrics)
+        self.assertEqual(extractor(2), 4)
+        self.assertEqual(extractor.sampling_rate, 16000)
+        self.assertEqual(metrics.histogram("stage_seconds", stage="features").count, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,105 @@
+import unittest
+from unittest import mock
+import json
+import os
+import sys
+import tempfile
+import threading
+
+current_dir = os.path.dirname(os.path.realpath(__file__))
+previous_path = os.path.abspath(os.path.dirname(current_dir))
+sys.path.append(previous_path)
+
+from banglaspeech2text.utils.models import ModelCatalog, ModelMetadata, catalog
+
+
+class TestModelMetadata(unittest.TestCase):
+    """Tests for lazy model metadata."""
+
+    def test_listed_model(self):
+        threads = threading.active_count()
+        model = ModelMetadata("large")
+        self.assertEqual(threading.active_count(), threads)
+        self.assertIsNone(model._details)
+
+        self.assertEqual(model.raw_name, "anuragshas/whisper-large-v2-bn")
+        self.assertEqual(model.type, "large")
+        self.assertEqual(model.wer, 11)
+
+    def test_offline_unlisted_model(self):
+        model = ModelMetadata("someone/whisper-small-xx", offline=True)
+        self.assertEqual(model.type, "small")
+        self.assertEqual(model.license, "unknown")
+        self.assertEqual(model.url, "https://huggingface.co/someone/whisper-small-xx")
+
+
+class TestModelCatalog(unittest.TestCase):
+    """Tests for the indexed model catalogue."""
+
+    def test_lookup(self):
+        self.assertEqual(catalog.get("whisper-base-bn")["type"], "base")
+        self.assertEqual(catalog.get("anuragshas/whisper-small-bn")["type"], "small")
+        self.assertEqual(catalog.get("tiny"), catalog.best("tiny"))
+        self.assertEqual(catalog.best("tiny")["wer"], 74)
+        self.assertIsNone(catalog.get("missing", raise_error=False))
+        with self.assertRaises(ValueError):
+            catalog.best("missing")
+
+    def test_merge_and_filter(self):
+        local = ModelCatalog(catalog.models)
+        local.merge(
+            [
+                {
+                    "path": "/models/whisper-tiny-bank",
+                    "name": "whisper-tiny-bank",
+                    "type": "tiny",
+                    "license": "proprietary",
+                    "author": "us",
+                    "wer": 30,
+                    "size": "~151 MB",
+                }
+            ]
+        )
+        self.assertEqual(local.best("tiny")["name"], "whisper-tiny-bank")
+        self.assertEqual(catalog.best("tiny")["wer"], 74)
+        self.assertEqual(len(local), len(catalog) + 1)
+
+        small = local.filter(max_size="500 MB", license="apache-2.0")
+        self.assertEqual([m["name"] for m in small][0], "whisper-base-bn")
+        self.assertEqual(local.filter(author="us", max_wer=40)[0]["wer"], 30)
+
+    def test_invalid_models(self):
+        local = ModelCatalog(catalog.models)
+        with self.assertRaisesRegex(ValueError, r"model 1 \(x\) is missing"):
+            local.merge(
+                [{"name": "a", "type": "tiny", "wer": 1, "url": "u/a"}, {"name": "x"}]
+            )
+        self.assertIsNone(local.get("a", raise_error=False))
+        with self.assertRaises(ValueError):
+            local.merge({"tiny": {"name": "x"}})
+
+    def test_malformed_user_file(self):
+        for content in ("{bad", '[{"name": "x"}]'):
+            with tempfile.TemporaryDirectory() as tmp:
+                path = os.path.join(tmp, "models.json")
+                with open(path, "w", encoding="utf-8") as f:
+                    f.write(content)
+                with mock.patch.dict(os.environ, {"BANGLASPEECH2TEXT_MODELS": path}):
+                    with self.assertLogs("BanglaSpeech2Text.models", "WARNING") as logs:
+                        loaded = ModelCatalog.load()
+                self.assertIn(path, logs.output[0])
+                self.assertEqual(len(loaded), len(catalog))
+
+    def test_user_file(self):
+        model = {"path": "/m/x", "name": "x", "type": "tiny", "wer": 1}
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "models.json")
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump([model], f)
+            with mock.patch.dict(os.environ, {"BANGLASPEECH2TEXT_MODELS": path}):
+                loaded = ModelCatalog.load()
+        self.assertEqual(loaded.best("tiny")["name"], "x")
+
+
+if __name__ == "__main__":
+    unittest.main()
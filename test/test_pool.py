@@ -0,0 +1,133 @@
+import unittest
+import os
+import sys
+import time
+
+current_dir = os.path.dirname(os.path.realpath(__file__))
+previous_path = os.path.abspath(os.path.dirname(current_dir))
+sys.path.append(previous_path)
+
+from banglaspeech2text.pool import Speech2TextPool, split_cores
+
+
+class Segment:
+    def __init__(self, text):
+        self.text = text
+
+
+class FakeSpeech2Text:
+    """Returns each word of a string input as a segment, tagged with its pid."""
+
+    def __init__(self, model_path, **kwargs):
+        self.kwargs = kwargs
+
+    def recognize(self, audio, return_segments=False, **kw):
+        if audio == "crash":
+            os._exit(3)
+        if audio == "error":
+            raise ValueError("bad audio")
+        if audio == "pid":
+            return [Segment(str(os.getpid()))]
+        if audio == "slow":
+            time.sleep(0.5)
+            return [Segment("slow")]
+        if audio == "threads":
+            return [Segment(str(self.kwargs["cpu_threads"]))]
+        return [Segment(word + " ") for word in audio.split()]
+
+
+def fake_factory(model_path, **kwargs):
+    return FakeSpeech2Text(model_path, **kwargs)
+
+
+def broken_factory(model_path, **kwargs):
+    raise OSError("no model")
+
+
+class TestSpeech2TextPool(unittest.TestCase):
+    def make_pool(self, **kwargs):
+        kwargs.setdefault("processes", 2)
+        kwargs.setdefault("cpu_threads", 1)
+        kwargs.setdefault("affinity", False)
+        pool = Speech2TextPool(
+            "/nonexistent", skip_conversion=True, factory=fake_factory, **kwargs
+        )
+        self.addCleanup(pool.close)
+        return pool
+
+    def test_recognize(self):
+        pool = self.make_pool()
+        self.assertEqual(pool.recognize("ami banglay gan gai"), "ami banglay gan gai ")
+        self.assertEqual(pool.recognize("threads"), "1")
+
+    def test_map_keeps_order_and_uses_all_workers(self):
+        pool = self.make_pool()
+        texts = [f"clip {i}" for i in range(20)]
+        self.assertEqual(list(pool.map(texts)), [t + " " for t in texts])
+        pids = {pool.recognize("pid") for _ in range(20)}
+        self.assertLessEqual(len(pids), 2)
+
+    def test_stream(self):
+        pool = self.make_pool()
+        texts = [segment.text for segment in pool.stream("one two three")]
+        self.assertEqual(texts, ["one ", "two ", "three "])
+
+    def test_error_is_raised(self):
+        pool = self.make_pool()
+        with self.assertRaisesRegex(RuntimeError, "bad audio"):
+            pool.recognize("error")
+        self.assertEqual(pool.recognize("still works"), "still works ")
+
+    def test_crashed_worker_is_restarted(self):
+        pool = self.make_pool(processes=1)
+        with self.assertRaisesRegex(RuntimeError, "crashed"):
+            pool.recognize("crash")
+        self.assertEqual(pool.recognize("after crash"), "after crash ")
+        self.assertEqual(pool._workers[0].restarts, 1)
+
+    def test_replicas_run_jobs_concurrently(self):
+        pool = self.make_pool(processes=1, replicas=2)
+        pool.recognize("warm up")
+        start = time.perf_counter()
+        self.assertEqual(list(pool.map(["slow", "slow"])), ["slow", "slow"])
+        self.assertLess(time.perf_counter() - start, 0.9)
+
+    def test_memory(self):
+        pool = self.make_pool()
+        pool.recognize("warm up")
+        usage = pool.memory()
+        self.assertEqual(len(usage), 2)
+        for info in usage:
+            self.assertGreater(info["rss"], 0)
+            self.assertLessEqual(info["uss"], info["rss"])
+
+    def test_worker_load_failure(self):
+        pool = Speech2TextPool(
+            "/nonexistent",
+            processes=1,
+            affinity=False,
+            skip_conversion=True,
+            factory=broken_factory,
+        )
+        self.addCleanup(pool.close)
+        with self.assertRaisesRegex(RuntimeError, "all pool workers failed"):
+            pool.recognize("hello")
+
+    def test_closed_pool_rejects_jobs(self):
+        pool = self.make_pool()
+        future = pool.submit("last one")
+        pool.close()
+        self.assertEqual(len(future.result()), 2)
+        with self.assertRaises(RuntimeError):
+            pool.submit("too late")
+
+
+class TestSplitCores(unittest.TestCase):
+    def test_blocks(self):
+        blocks = split_cores(2, 1)
+        self.assertEqual(len(blocks), 2)
+        self.assertTrue(all(len(block) == 1 for block in blocks))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,121 @@
+import unittest
+import os
+import sys
+import tempfile
+from types import SimpleNamespace
+from unittest import mock
+
+import numpy as np
+
+current_dir = os.path.dirname(os.path.realpath(__file__))
+previous_path = os.path.abspath(os.path.dirname(current_dir))
+sys.path.append(previous_path)
+
+from banglaspeech2text import speech2text
+from banglaspeech2text.speech2text import Speech2Text
+from banglaspeech2text.utils.cache import TranscriptionCache
+from banglaspeech2text.vocabulary import VocabularyRegistry
+
+SR = 16000
+
+
+class FakeFeatureExtractor:
+    """Puts the clip length into the features so the fake decoder can read it."""
+
+    sampling_rate = SR
+    n_samples = 30 * SR
+
+    def __call__(self, audio, padding=160, chunk_length=None):
+        return np.full((80, 3001), audio.shape[0], dtype=np.float32)
+
+
+class FakePipeline:
+    batches = []
+
+    def __init__(self, model):
+        pass
+
+    def forward(self, features, tokenizer, metadata, options):
+        FakePipeline.batches.append(features.shape[0])
+        return [
+            [
+                {
+                    "seek": 0,
+                    "start": 0.0,
+                    "end": meta["duration"],
+                    "text": f" {int(feature[0, 0])}",
+                    "tokens": [],
+                    "avg_logprob": 0.0,
+                    "compression_ratio": 1.0,
+                    "no_speech_prob": 0.0,
+                }
+            ]
+            for feature, meta in zip(features, metadata)
+        ]
+
+
+def fake_stt():
+    # only what recognize_batch uses; decoding is done by FakePipeline
+    stt = Speech2Text.__new__(Speech2Text)
+    stt.use_temp_files = False
+    stt.vad = None
+    stt.cache = None
+    stt.metrics = None
+    stt.vocabularies = VocabularyRegistry()
+    stt.feature_extractor = FakeFeatureExtractor()
+    stt.hf_tokenizer = None
+    stt.model = SimpleNamespace(is_multilingual=True)
+    stt.model_metadata = SimpleNamespace(raw_name="fake")
+    stt.compute_type = "int8"
+    stt._batch_options = lambda tokenizer, **kw: SimpleNamespace(
+        word_timestamps=False, temperatures=[0.0]
+    )
+    stt.long_calls = []
+
+    def recognize(audio, return_segments=False, **kw):
+        stt.long_calls.append(audio.shape[0])
+        return [SimpleNamespace(text=" long")]
+
+    stt.recognize = recognize
+    return stt
+
+
+class TestRecognizeBatch(unittest.TestCase):
+    def setUp(self):
+        FakePipeline.batches = []
+        for name, fake in (
+            ("BatchedInferencePipeline", FakePipeline),
+            ("Tokenizer", mock.Mock()),
+        ):
+            patcher = mock.patch.object(speech2text, name, fake)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.stt = fake_stt()
+
+    def test_input_order_and_buckets(self):
+        lengths = [5000, 1000, 9000, 3000, 7000]
+        audios = [np.zeros(n, dtype=np.float32) for n in lengths]
+        texts = self.stt.recognize_batch(audios, batch_size=2)
+        self.assertEqual(texts, [f" {n}" for n in lengths])
+        self.assertEqual(FakePipeline.batches, [2, 2, 1])
+
+    def test_long_clips_use_recognize(self):
+        audios = [np.zeros(31 * SR, dtype=np.float32), np.zeros(SR, np.float32)]
+        texts = self.stt.recognize_batch(audios)
+        self.assertEqual(texts, [" long", f" {SR}"])
+        self.assertEqual(self.stt.long_calls, [31 * SR])
+        self.assertEqual(FakePipeline.batches, [1])
+
+    def test_cache(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            self.stt.cache = TranscriptionCache(os.path.join(tmp, "cache.sqlite"))
+            audios = [np.zeros(n, dtype=np.float32) for n in (1000, 2000)]
+            first = self.stt.recognize_batch(audios)
+            second = self.stt.recognize_batch(audios[::-1])
+            self.stt.cache.close()
+        self.assertEqual(second, first[::-1])
+        self.assertEqual(FakePipeline.batches, [2])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+import unittest
+import os
+import sys
+import tempfile
+import threading
+
+current_dir = os.path.dirname(os.path.realpath(__file__))
+previous_path = os.path.abspath(os.path.dirname(current_dir))
+sys.path.append(previous_path)
+
+from banglaspeech2text.registry import ModelRegistry
+
+
+class FakeModel:
+    loads = 0
+
+    def __init__(self, model_path, device="auto", compute_type="int8", **kw):
+        FakeModel.loads += 1
+        self.model_path = model_path
+        self.kw = kw
+
+
+class TestModelRegistry(unittest.TestCase):
+    """Tests for the shared model registry."""
+
+    def setUp(self):
+        FakeModel.loads = 0
+        self.tmp = tempfile.TemporaryDirectory()
+        self.paths = []
+        for name in ("a", "b"):
+            path = os.path.join(self.tmp.name, name)
+            os.makedirs(path)
+            with open(os.path.join(path, "model.bin"), "wb") as f:
+                f.write(b"\0" * 100)
+            self.paths.append(path)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_one_instance_per_config(self):
+        registry = ModelRegistry(factory=FakeModel, num_workers=3)
+        results = []
+        threads = [
+            threading.Thread(
+                target=lambda: results.append(
+                    registry.get(self.paths[0], compute_type="int8")
+                )
+            )
+            for _ in range(8)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(FakeModel.loads, 1)
+        self.assertTrue(all(r is results[0] for r in results))
+        self.assertEqual(results[0].kw["num_workers"], 3)
+        self.assertEqual(registry.memory(), 100)
+
+        other = registry.get(self.paths[0], compute_type="float32")
+        self.assertIsNot(other, results[0])
+        self.assertEqual(FakeModel.loads, 2)
+
+    def test_other_arguments_get_another_instance(self):
+        registry = ModelRegistry(factory=FakeModel)
+        plain = registry.get(self.paths[0], compute_type="int8")
+        vad = registry.get(self.paths[0], compute_type="int8", vad=True)
+        self.assertIsNot(vad, plain)
+        self.assertTrue(vad.kw["vad"])
+        self.assertIs(registry.get(self.paths[0], compute_type="int8"), plain)
+        self.assertEqual(FakeModel.loads, 2)
+
+        words = registry.get(self.paths[1], compute_type="int8", hotwords=["a"])
+        self.assertIs(
+            registry.get(self.paths[1], compute_type="int8", hotwords=["a"]), words
+        )
+        with self.assertRaises(ValueError):
+            registry.get(self.paths[1], compute_type="int8", hotwords=["b"])
+
+    def test_lru_eviction(self):
+        registry = ModelRegistry(max_memory=150, factory=FakeModel)
+        a = registry.get(self.paths[0], compute_type="int8")
+        b = registry.get(self.paths[1], compute_type="int8")
+        # both are held, so nothing can be evicted
+        self.assertEqual(len(registry), 2)
+
+        registry.release(a)
+        self.assertNotIn(a, registry)
+        self.assertIn(b, registry)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+import unittest
+import json
+import os
+import sys
+from collections import namedtuple
+
+current_dir = os.path.dirname(os.path.realpath(__file__))
+previous_path = os.path.abspath(os.path.dirname(current_dir))
+sys.path.append(previous_path)
+
+from banglaspeech2text.result import Transcript
+
+Segment = namedtuple("Segment", "start end text avg_logprob no_speech_prob words")
+Word = namedtuple("Word", "start end word probability")
+
+
+def segments():
+    yield Segment(
+        0.0,
+        1.5,
+        " আমি বাংলায়",
+        -0.2,
+        0.01,
+        [Word(0.0, 0.6, " আমি", 0.9), Word(0.6, 1.5, " বাংলায়", 0.7)],
+    )
+    yield Segment(3661.25, 3663.0, " গান গাই", -0.4, 0.02, None)
+    yield Segment(
+        3663.0, 3664.0, " আমি", -0.1, 0.0, [Word(3663.0, 3664.0, " আমি", 0.95)]
+    )
+
+
+class TestTranscript(unittest.TestCase):
+    def setUp(self):
+        self.result = Transcript.from_segments(segments())
+
+    def test_columns(self):
+        result = self.result
+        self.assertEqual(len(result), 3)
+        self.assertEqual(result.text, " আমি বাংলায় গান গাই আমি")
+        self.assertEqual(result.words, [" আমি", " বাংলায়", " আমি"])
+        self.assertEqual(result.word_segments.tolist(), [0, 0, 2])
+        self.assertEqual(result.word_probs.dtype.name, "float32")
+        self.assertEqual(result.segment_words(0), slice(0, 2))
+        self.assertEqual(result.segment_words(1), slice(2, 2))
+        self.assertEqual(result.words[result.segment_words(2)], [" আমি"])
+
+    def test_json_round_trip(self):
+        data = json.loads(self.result.to_json())
+        self.assertEqual(data["segments"]["start"][1], 3661.25)
+        restored = Transcript.from_dict(data)
+        self.assertEqual(restored.texts, self.result.texts)
+        self.assertEqual(restored.word_ends.tolist(), self.result.word_ends.tolist())
+
+    def test_subtitles(self):
+        srt = self.result.to_srt()
+        self.assertTrue(
+            srt.startswith("1\n00:00:00,000 --> 00:00:01,500\nআমি বাংলায়\n")
+        )
+        self.assertIn("2\n01:01:01,250 --> 01:01:03,000\nগান গাই\n", srt)
+        vtt = self.result.to_vtt()
+        self.assertTrue(vtt.startswith("WEBVTT\n\n00:00:00.000 --> 00:00:01.500\n"))
+
+    def test_empty(self):
+        result = Transcript.from_segments([])
+        self.assertEqual(result.text, "")
+        self.assertEqual(result.to_srt(), "")
+        self.assertEqual(result.segment_words(0), slice(0, 0))
+
+    def test_arrow(self):
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            self.skipTest("pyarrow is not installed")
+        table = self.result.to_arrow(words=True)
+        self.assertEqual(table.num_rows, 3)
+        self.assertEqual(table.column("word").to_pylist()[1], " বাংলায়")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,128 @@
+import unittest
+import asyncio
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+current_dir = os.path.dirname(os.path.realpath(__file__))
+previous_path = os.path.abspath(os.path.dirname(current_dir))
+sys.path.append(previous_path)
+
+from banglaspeech2text.scheduler import MicroBatchScheduler
+
+
+class Segment:
+    def __init__(self, text):
+        self.text = text
+
+
+class FakeSpeech2Text:
+    """Returns each input as its text and records the batches it was given."""
+
+    num_workers = 1
+    metrics = None
+
+    class feature_extractor:
+        n_samples = 100
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.batches = []
+        self.started = threading.Event()
+
+    def recognize_batch(self, audios, batch_size=8, return_segments=False, **kw):
+        self.started.set()
+        names = [self._name(a) for a in audios]
+        self.batches.append((names, kw))
+        time.sleep(self.delay)
+        if "error" in names:
+            raise ValueError("bad audio")
+        return [[Segment(name)] for name in names]
+
+    @staticmethod
+    def _name(audio):
+        return f"array{audio.shape[0]}" if isinstance(audio, np.ndarray) else audio
+
+
+class TestMicroBatchScheduler(unittest.TestCase):
+    """Tests for the micro-batching scheduler."""
+
+    def test_concurrent_callers_share_a_batch(self):
+        stt = FakeSpeech2Text()
+        with MicroBatchScheduler(stt, max_wait_ms=200, max_batch=4) as scheduler:
+            with ThreadPoolExecutor(4) as pool:
+                texts = list(pool.map(scheduler.recognize, ["a", "b", "c", "d"]))
+        self.assertEqual(texts, ["a", "b", "c", "d"])
+        self.assertEqual(len(stt.batches), 1)
+        self.assertEqual(sorted(stt.batches[0][0]), ["a", "b", "c", "d"])
+
+    def test_max_batch(self):
+        stt = FakeSpeech2Text()
+        with MicroBatchScheduler(stt, max_wait_ms=100, max_batch=2) as scheduler:
+            futures = [scheduler.submit(x) for x in "abcde"]
+            self.assertEqual([f.result()[0].text for f in futures], list("abcde"))
+        self.assertEqual([len(b[0]) for b in stt.batches], [2, 2, 1])
+
+    def test_deadline_goes_first(self):
+        stt = FakeSpeech2Text(delay=0.1)
+        with MicroBatchScheduler(stt, max_wait_ms=0, max_batch=1) as scheduler:
+            first = scheduler.submit("busy")
+            stt.started.wait(1)
+            bulk = [scheduler.submit(f"bulk{i}") for i in range(3)]
+            urgent = scheduler.submit("urgent", deadline_ms=50)
+            for future in [first, urgent] + bulk:
+                future.result()
+        order = [b[0][0] for b in stt.batches]
+        self.assertEqual(order, ["busy", "urgent", "bulk0", "bulk1", "bulk2"])
+
+    def test_options_and_long_clips_are_not_mixed(self):
+        stt = FakeSpeech2Text()
+        with MicroBatchScheduler(stt, max_wait_ms=100, max_batch=8) as scheduler:
+            futures = [
+                scheduler.submit("a", beam_size=1),
+                scheduler.submit("b", beam_size=5),
+                scheduler.submit("c", beam_size=1),
+                scheduler.submit(np.zeros(1000, np.float32), beam_size=1),
+            ]
+            for future in futures:
+                future.result()
+        batches = sorted((sorted(b[0]), b[1]["beam_size"]) for b in stt.batches)
+        self.assertEqual(batches, [(["a", "c"], 1), (["array1000"], 1), (["b"], 5)])
+
+    def test_errors_and_cancellation(self):
+        stt = FakeSpeech2Text(delay=0.1)
+        with MicroBatchScheduler(stt, max_wait_ms=0, max_batch=1) as scheduler:
+            failing = scheduler.submit("error")
+            stt.started.wait(1)
+            dropped = scheduler.submit("dropped")
+            self.assertTrue(dropped.cancel())
+            with self.assertRaises(ValueError):
+                failing.result()
+        self.assertNotIn("dropped", [b[0][0] for b in stt.batches])
+
+    def test_asubmit(self):
+        stt = FakeSpeech2Text()
+
+        async def main(scheduler):
+            return await asyncio.gather(
+                *[scheduler.asubmit(x) for x in ("a", "b", "c")]
+            )
+
+        with MicroBatchScheduler(stt, max_wait_ms=100) as scheduler:
+            results = asyncio.run(main(scheduler))
+        self.assertEqual([r[0].text for r in results], ["a", "b", "c"])
+        self.assertEqual(len(stt.batches), 1)
+
+    def test_closed(self):
+        scheduler = MicroBatchScheduler(FakeSpeech2Text())
+        scheduler.close()
+        with self.assertRaises(RuntimeError):
+            scheduler.submit("a")
+
+
+if __name__ == "__main__":
+    unittest.main()
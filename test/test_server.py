@@ -0,0 +1,160 @@
+import unittest
+import os
+import sys
+import threading
+
+import numpy as np
+
+current_dir = os.path.dirname(os.path.realpath(__file__))
+previous_path = os.path.abspath(os.path.dirname(current_dir))
+sys.path.append(previous_path)
+
+try:
+    from aiohttp.test_utils import AioHTTPTestCase  # type: ignore
+except ImportError:  # aiohttp is optional
+    AioHTTPTestCase = unittest.IsolatedAsyncioTestCase
+
+from banglaspeech2text.server import create_app
+from banglaspeech2text.metrics import TimedFeatureExtractor
+from banglaspeech2text.streaming import StreamingSegment
+from banglaspeech2text.vocabulary import VocabularyRegistry
+from banglaspeech2text.utils.audio import pcm16_to_float32
+
+
+class Segment:
+    def __init__(self, text, start=0.0, end=1.0):
+        self.text, self.start, self.end = text, start, end
+
+
+class FakeSession:
+    def __init__(self):
+        self.samples = 0
+
+    def feed(self, chunk):
+        self.samples += len(chunk) // 2
+        return [StreamingSegment(" partial", 0.0, self.samples / 16000, False)]
+
+    def flush(self):
+        return [StreamingSegment(" final", 0.0, self.samples / 16000, True)]
+
+
+class FakeSpeech2Text:
+    """Echoes the number of samples of each clip as its text."""
+
+    num_workers = 1
+    metrics = None
+    model_path = "fake"
+
+    class feature_extractor:
+        sampling_rate = 16000
+        n_samples = 480000
+
+    def __init__(self):
+        self.batches = []
+        self.vocabularies = VocabularyRegistry()
+        self.vocabularies.set("bank", ["ব্যাংক"])
+        self._lock = threading.Lock()
+
+    def _load_array(self, data):
+        return pcm16_to_float32(data)
+
+    def recognize_batch(self, audios, batch_size=8, return_segments=False, **kw):
+        with self._lock:
+            self.batches.append(len(audios))
+        return [[Segment(f" {audio.shape[0]}")] for audio in audios]
+
+    def stream(self, **kw):
+        return FakeSession()
+
+
+@unittest.skipIf(
+    AioHTTPTestCase is unittest.IsolatedAsyncioTestCase, "aiohttp not installed"
+)
+class TestServer(AioHTTPTestCase):
+    """Tests for the HTTP and WebSocket routes."""
+
+    async def get_application(self):
+        self.stt = FakeSpeech2Text()
+        return create_app(self.stt, batch_window_ms=100, max_batch=8)
+
+    async def test_transcribe_batches(self):
+        import asyncio
+
+        pcm = np.zeros(1600, dtype="<i2").tobytes()
+        responses = await asyncio.gather(
+            *[self.client.post("/transcribe", data=pcm) for _ in range(4)]
+        )
+        for response in responses:
+            self.assertEqual(response.status, 200)
+            data = await response.json()
+            self.assertEqual(data["text"], " 1600")
+            self.assertEqual(data["duration"], 0.1)
+        self.assertEqual(self.stt.batches, [4])
+
+    async def test_multipart_upload(self):
+        from aiohttp import FormData  # type: ignore
+
+        form = FormData()
+        form.add_field("file", np.zeros(800, dtype="<i2").tobytes(), filename="a.raw")
+        response = await self.client.post("/transcribe", data=form)
+        self.assertEqual((await response.json())["text"], " 800")
+
+    async def test_empty_body(self):
+        response = await self.client.post("/transcribe", data=b"")
+        self.assertEqual(response.status, 400)
+
+    async def test_stream(self):
+        ws = await self.client.ws_connect("/stream")
+        await ws.send_bytes(np.zeros(8000, dtype="<i2").tobytes())
+        partial = await ws.receive_json()
+        await ws.send_str("end")
+        final = await ws.receive_json()
+        await ws.close()
+
+        self.assertEqual(partial["text"], " partial")
+        self.assertFalse(partial["is_final"])
+        self.assertTrue(final["is_final"])
+        self.assertEqual(final["end"], 0.5)
+
+    async def test_unknown_vocabulary(self):
+        from aiohttp import WSServerHandshakeError  # type: ignore
+
+        pcm = np.zeros(160, dtype="<i2").tobytes()
+        response = await self.client.post("/transcribe?vocabulary=other", data=pcm)
+        self.assertEqual(response.status, 400)
+        with self.assertRaises(WSServerHandshakeError) as cm:
+            await self.client.ws_connect("/stream?vocabulary=other")
+        self.assertEqual(cm.exception.status, 400)
+        ws = await self.client.ws_connect("/stream?vocabulary=bank")
+        await ws.close()
+
+    async def test_bad_options(self):
+        from aiohttp import WSServerHandshakeError  # type: ignore
+
+        pcm = np.zeros(160, dtype="<i2").tobytes()
+        for query in ("language=xx", "task=summarize"):
+            response = await self.client.post(f"/transcribe?{query}", data=pcm)
+            self.assertEqual(response.status, 400)
+        with self.assertRaises(WSServerHandshakeError) as cm:
+            await self.client.ws_connect("/stream?language=xx")
+        self.assertEqual(cm.exception.status, 400)
+        response = await self.client.post(
+            "/transcribe?language=en&task=translate", data=pcm
+        )
+        self.assertEqual(response.status, 200)
+
+    async def test_health_and_metrics(self):
+        response = await self.client.get("/health")
+        self.assertEqual((await response.json())["status"], "ok")
+
+        await self.client.post("/transcribe", data=np.zeros(160, "<i2").tobytes())
+        response = await self.client.get("/metrics")
+        text = await response.text()
+        self.assertIn("application/openmetrics-text", response.headers["Content-Type"])
+        self.assertIn("bnstt_batch_size_count 1", text)
+        self.assertIsInstance(self.stt.feature_extractor, TimedFeatureExtractor)
+        self.assertTrue(text.endswith("# EOF\n"))
+
+
+if __name__ == "__main__":
+    unittest.main()
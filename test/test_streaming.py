@@ -0,0 +1,110 @@
+import unittest
+import os
+import sys
+from types import SimpleNamespace
+from unittest import mock
+
+import numpy as np
+
+current_dir = os.path.dirname(os.path.realpath(__file__))
+previous_path = os.path.abspath(os.path.dirname(current_dir))
+sys.path.append(previous_path)
+
+from banglaspeech2text.streaming import VAD_FRAME, StreamingSession
+
+SR = 16000
+
+
+class FakeVad:
+    """Speech wherever a frame is loud; zeroes its input like Silero does."""
+
+    def __call__(self, audio):
+        frames = audio.reshape(-1, VAD_FRAME)
+        probs = (np.abs(frames).max(axis=1) > 0.1).astype(np.float32)
+        audio[-64:] = 0
+        return probs
+
+
+class FakeTokenizer:
+    def encode(self, text, add_special_tokens=True):
+        return SimpleNamespace(ids=[len(word) for word in text.split()])
+
+
+class FakeStt:
+    """Transcribes every second of buffered audio as one word."""
+
+    def __init__(self):
+        self.hf_tokenizer = FakeTokenizer()
+        self.calls = []
+
+    def transcribe(self, audio, prefix=None, **kw):
+        self.calls.append(dict(kw, prefix=prefix, audio=audio.copy()))
+        words = [f"w{i}" for i in range(int(np.ceil(audio.shape[0] / SR)))]
+        skip = len(prefix.split()) if prefix else 0
+        text = "".join(f" {word}" for word in words[skip:])
+        return [SimpleNamespace(text=text)], None
+
+
+def speech(seconds):
+    t = np.arange(int(seconds * SR)) / SR
+    return (0.5 * np.sin(2 * np.pi * 220 * t)).astype(np.float32)
+
+
+def silence(seconds):
+    return np.zeros(int(seconds * SR), dtype=np.float32)
+
+
+def feed_all(session, audio, chunk=1024):
+    out = []
+    for start in range(0, audio.shape[0], chunk):
+        out += session.feed(audio[start : start + chunk])
+    return out
+
+
+class TestStreamingSession(unittest.TestCase):
+    def setUp(self):
+        patcher = mock.patch("faster_whisper.vad.get_vad_model", return_value=FakeVad())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.stt = FakeStt()
+
+    def test_partials_then_final(self):
+        session = StreamingSession(self.stt, step_s=0.5)
+        out = feed_all(session, speech(2.0))
+        self.assertTrue(out)
+        self.assertFalse(any(s.is_final for s in out))
+        final = session.flush()
+        self.assertEqual(len(final), 1)
+        self.assertTrue(final[0].is_final)
+        self.assertEqual(final[0].text, " w0 w1")
+        self.assertAlmostEqual(final[0].end, 2.0)
+        # stable words of consecutive partials are decoded as the prefix
+        self.assertTrue(any(call["prefix"] for call in self.stt.calls))
+
+    def test_silence_ends_utterance(self):
+        session = StreamingSession(self.stt, step_s=10, min_silence_ms=300)
+        out = feed_all(session, np.concatenate((speech(1.0), silence(0.5))))
+        finals = [s for s in out if s.is_final]
+        self.assertEqual(len(finals), 1)
+        self.assertEqual(session.flush(), [])
+        # leading silence alone never produces output
+        self.assertEqual(feed_all(session, silence(1.0)), [])
+
+    def test_full_window_is_finalized(self):
+        session = StreamingSession(self.stt, step_s=10, window_s=1.0)
+        out = feed_all(session, speech(2.5))
+        finals = [s for s in out if s.is_final]
+        self.assertEqual(len(finals), 2)
+        self.assertAlmostEqual(finals[1].start, finals[0].end)
+        self.assertLessEqual(finals[0].end - finals[0].start, 1.1)
+
+    def test_fed_audio_is_not_changed(self):
+        session = StreamingSession(self.stt, step_s=10)
+        audio = speech(0.5)
+        feed_all(session, audio, chunk=VAD_FRAME * 2)
+        session.flush()
+        np.testing.assert_array_equal(self.stt.calls[-1]["audio"], audio)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+import unittest
+import os
+import sys
+
+import numpy as np
+
+current_dir = os.path.dirname(os.path.realpath(__file__))
+previous_path = os.path.abspath(os.path.dirname(current_dir))
+sys.path.append(previous_path)
+
+from banglaspeech2text.utils.vad import VadFilter, energy_regions
+
+
+def tone(seconds, amplitude=0.3):
+    t = np.arange(int(seconds * 16000)) / 16000
+    return (amplitude * np.sin(2 * np.pi * 220 * t)).astype(np.float32)
+
+
+def silence(seconds):
+    return np.zeros(int(seconds * 16000), dtype=np.float32)
+
+
+class TestEnergyVad(unittest.TestCase):
+    """Tests for the NumPy energy VAD."""
+
+    def test_regions(self):
+        audio = np.concatenate([silence(2), tone(1), silence(2), tone(0.5)])
+        regions = energy_regions(audio, speech_pad_ms=0)
+        # frame (30 ms) resolution
+        self.assertEqual(regions, [(31680, 48000), (79680, 87840)])
+        self.assertIsInstance(regions[0][0], int)
+
+    def test_short_gaps_and_blips(self):
+        audio = np.concatenate(
+            [tone(1), silence(0.1), tone(1), silence(1), tone(0.03), silence(1)]
+        )
+        regions = energy_regions(audio, min_silence_ms=300, speech_pad_ms=100)
+        self.assertEqual(len(regions), 1)
+        self.assertEqual(regions[0][0], 0)
+
+    def test_silence(self):
+        self.assertEqual(energy_regions(silence(3)), [])
+        self.assertEqual(energy_regions(silence(0.01)), [])
+
+
+class TestVadFilter(unittest.TestCase):
+    """Tests for the VAD stage used by Speech2Text."""
+
+    def test_apply(self):
+        vad = VadFilter("energy", speech_pad_ms=0)
+        audio = np.concatenate([silence(3), tone(1), silence(3), tone(1)])
+        speech, chunks = vad.apply(audio)
+
+        self.assertEqual(len(chunks), 2)
+        self.assertEqual(speech.shape[0], sum(c["end"] - c["start"] for c in chunks))
+        self.assertAlmostEqual(vad.total_seconds, 8.0)
+        self.assertAlmostEqual(vad.skipped_seconds, 6.0, places=1)
+
+    def test_timestamps_map_back(self):
+        from faster_whisper.vad import SpeechTimestampsMap
+
+        vad = VadFilter("energy", speech_pad_ms=0)
+        audio = np.concatenate([silence(3), tone(1), silence(3), tone(1)])
+        _, chunks = vad.apply(audio)
+        ts_map = SpeechTimestampsMap(chunks, 16000)
+        # 1.5 s into the speech-only audio is 0.5 s into the second tone
+        self.assertAlmostEqual(ts_map.get_original_time(1.5), 7.5, places=1)
+
+    def test_repr_excludes_stats(self):
+        vad = VadFilter()
+        vad.apply(silence(1))
+        self.assertEqual(repr(vad), repr(VadFilter()))
+
+    def test_unknown_method(self):
+        with self.assertRaises(ValueError):
+            VadFilter("webrtc")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,141 @@
+import unittest
+import os
+import sys
+import tempfile
+from types import SimpleNamespace
+from unittest import mock
+
+import numpy as np
+
+current_dir = os.path.dirname(os.path.realpath(__file__))
+previous_path = os.path.abspath(os.path.dirname(current_dir))
+sys.path.append(previous_path)
+
+from banglaspeech2text.speech2text import Speech2Text
+from banglaspeech2text.streaming import VAD_FRAME, StreamingSession
+from banglaspeech2text.vocabulary import Vocabulary, VocabularyRegistry
+
+SOT_PREV, SOT = 50361, 50258
+
+
+class FakeHFTokenizer:
+    """Encodes every character as its code point."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def encode(self, text, add_special_tokens=True):
+        self.calls += 1
+        return SimpleNamespace(ids=[ord(c) for c in text])
+
+
+class FakeTokenizer:
+    sot_prev = SOT_PREV
+    sot_sequence = (SOT,)
+    no_timestamps = 50363
+
+    def encode(self, text):
+        return [ord(c) for c in text]
+
+
+def fake_stt():
+    # only what get_prompt and the vocabulary helpers use
+    stt = Speech2Text.__new__(Speech2Text)
+    stt.max_length = 448
+    stt.hf_tokenizer = FakeHFTokenizer()
+    stt.vocabularies = VocabularyRegistry()
+    return stt
+
+
+class TestVocabulary(unittest.TestCase):
+    def test_terms(self):
+        vocabulary = Vocabulary(["ব্যাংক", " বিকাশ ", "", "ব্যাংক"])
+        self.assertEqual(vocabulary.terms, ("ব্যাংক", "বিকাশ"))
+        self.assertEqual(vocabulary.text, "ব্যাংক, বিকাশ")
+
+    def test_tokenized_once(self):
+        tokenizer = FakeHFTokenizer()
+        vocabulary = Vocabulary(["ab"])
+        self.assertEqual(vocabulary.tokens(tokenizer), (32, 97, 98))
+        vocabulary.tokens(tokenizer)
+        self.assertEqual(tokenizer.calls, 1)
+        self.assertEqual(Vocabulary([]).tokens(tokenizer), ())
+
+    def test_from_file(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False) as f:
+            f.write("# banking\nব্যাংক\n\nনগদ\n")
+        try:
+            self.assertEqual(Vocabulary.from_file(f.name).terms, ("ব্যাংক", "নগদ"))
+        finally:
+            os.remove(f.name)
+
+    def test_registry_swap(self):
+        registry = VocabularyRegistry()
+        first = registry.set("tenant", ["a"])
+        registry.set("tenant", ["b"])
+        self.assertIsNot(registry.get("tenant"), first)
+        self.assertEqual(registry.get("tenant").terms, ("b",))
+        registry.remove("tenant")
+        self.assertNotIn("tenant", registry)
+
+
+class TestVocabularyPrompt(unittest.TestCase):
+    def setUp(self):
+        self.stt = fake_stt()
+        self.tokenizer = FakeTokenizer()
+
+    def test_same_prompt_as_text_hotwords(self):
+        for previous in ([], [1, 2]):
+            text = self.stt.get_prompt(self.tokenizer, previous, hotwords="ab")
+            tokens = self.stt.get_prompt(
+                self.tokenizer, previous, hotwords=(32, 97, 98)
+            )
+            self.assertEqual(tokens, text)
+        self.assertEqual(text, [SOT_PREV, 32, 97, 98, 1, 2, SOT])
+
+    def test_prefix_keeps_hotwords(self):
+        prompt = self.stt.get_prompt(
+            self.tokenizer, [], without_timestamps=True, prefix="x", hotwords=(1,)
+        )
+        self.assertEqual(prompt[:3], [SOT_PREV, 1, SOT])
+        self.assertEqual(prompt[-1], ord("x"))
+
+    def test_streaming_prompt(self):
+        calls = []
+
+        def transcribe(audio, **kw):
+            calls.append(kw)
+            return [SimpleNamespace(text=" a b")], None
+
+        self.stt.transcribe = transcribe
+        self.stt.set_vocabulary("bank", ["ab"])
+        session = StreamingSession(self.stt, step_s=0.1, vocabulary="bank")
+        loud = np.full(VAD_FRAME, 0.5, dtype=np.float32)
+        with mock.patch("faster_whisper.vad.get_vad_model", return_value=lambda a: [1]):
+            for _ in range(20):
+                session.feed(loud)
+            session.flush()
+
+        self.assertTrue(any(kw["prefix"] for kw in calls))
+        for kw in calls:
+            prompt = self.stt.get_prompt(
+                self.tokenizer,
+                list(kw["initial_prompt"] or []),
+                kw["without_timestamps"],
+                kw["prefix"],
+                kw["hotwords"],
+            )
+            self.assertEqual(prompt[:4], [SOT_PREV, 32, 97, 98])
+
+    def test_apply_vocabulary(self):
+        self.stt.set_vocabulary("bank", ["ab"])
+        calls = self.stt.hf_tokenizer.calls
+        kw = self.stt._apply_vocabulary({"vocabulary": "bank", "language": "bn"})
+        self.assertEqual(kw, {"hotwords": (32, 97, 98), "language": "bn"})
+        self.assertEqual(self.stt.hf_tokenizer.calls, calls)
+        with self.assertRaisesRegex(ValueError, "Unknown vocabulary"):
+            self.stt._apply_vocabulary({"vocabulary": "other"})
+
+
+if __name__ == "__main__":
+    unittest.main()